@@ -15,34 +15,15 @@ ConstOrCallable = t.Union[ReturnType, t.Callable[[ReturnType], ReturnType]]
 class ExprMixin(t.Generic[ReturnType], object):
     # __add__ ##########################################################################################################
     @t.overload
-    def __add__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __add__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __add__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __add__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __add__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __add__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __add__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __add__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
+    def __add__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __sub__ ##########################################################################################################
     @t.overload
-    def __sub__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __sub__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __sub__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __sub__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __sub__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __sub__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __sub__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __sub__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -50,17 +31,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __mul__ ##########################################################################################################
     @t.overload
-    def __mul__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __mul__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __mul__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __mul__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __mul__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __mul__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __mul__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __mul__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -68,17 +39,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __floordiv__ #####################################################################################################
     @t.overload
-    def __floordiv__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __floordiv__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __floordiv__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __floordiv__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __floordiv__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __floordiv__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __floordiv__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __floordiv__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -86,17 +47,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __truediv__ ######################################################################################################
     @t.overload
-    def __truediv__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __truediv__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
-    @t.overload
-    def __truediv__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __truediv__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
-    @t.overload
-    def __truediv__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __truediv__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __truediv__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[float]: ...
     @t.overload
     def __truediv__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -107,17 +58,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __mod__ ##########################################################################################################
     @t.overload
-    def __mod__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __mod__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __mod__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __mod__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __mod__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __mod__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __mod__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __mod__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -125,17 +66,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __pow__ ##########################################################################################################
     @t.overload
-    def __pow__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __pow__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __pow__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __pow__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __pow__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __pow__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __pow__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __pow__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -143,71 +74,37 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __xor__ ##########################################################################################################
     @t.overload
-    def __xor__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __xor__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __xor__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
+    def __xor__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __xor__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __rshift__ #######################################################################################################
     @t.overload
-    def __rshift__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rshift__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rshift__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rshift__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
+    def __rshift__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rshift__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __lshift__ #######################################################################################################
     @t.overload
-    def __lshift__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __lshift__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __lshift__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __lshift__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
+    def __lshift__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __lshift__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __and__ ##########################################################################################################
     @t.overload
-    def __and__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __and__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __and__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
+    def __and__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __and__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __or__ ###########################################################################################################
     @t.overload
-    def __or__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __or__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __or__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
+    def __or__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __or__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __radd__ #########################################################################################################
     @t.overload
-    def __radd__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __radd__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __radd__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __radd__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __radd__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __radd__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __radd__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __radd__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -215,17 +112,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __rsub__ #########################################################################################################
     @t.overload
-    def __rsub__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rsub__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rsub__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rsub__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rsub__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rsub__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __rsub__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rsub__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -233,17 +120,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __rmul__ #########################################################################################################
     @t.overload
-    def __rmul__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmul__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmul__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmul__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmul__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rmul__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __rmul__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rmul__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -251,17 +128,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __rfloordiv__ ####################################################################################################
     @t.overload
-    def __rfloordiv__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rfloordiv__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rfloordiv__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rfloordiv__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rfloordiv__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rfloordiv__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __rfloordiv__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rfloordiv__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -269,17 +136,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __rtruediv__ #####################################################################################################
     @t.overload
-    def __rtruediv__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rtruediv__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
-    @t.overload
-    def __rtruediv__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rtruediv__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
-    @t.overload
-    def __rtruediv__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rtruediv__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __rtruediv__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[float]: ...
     @t.overload
     def __rtruediv__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -290,17 +147,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __rmod__ #########################################################################################################
     @t.overload
-    def __rmod__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmod__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmod__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmod__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rmod__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rmod__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __rmod__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rmod__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -308,17 +155,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __rpow__ #########################################################################################################
     @t.overload
-    def __rpow__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rpow__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rpow__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rpow__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rpow__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[float]: ...
-    @t.overload
-    def __rpow__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[float]: ...
+    def __rpow__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rpow__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[float]: ...
     @t.overload
@@ -326,55 +163,31 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __rxor__ #########################################################################################################
     @t.overload
-    def __rxor__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rxor__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rxor__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
+    def __rxor__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rxor__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __rrshift__ ######################################################################################################
     @t.overload
-    def __rrshift__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rrshift__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rrshift__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rrshift__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
+    def __rrshift__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rrshift__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __rlshift__ ######################################################################################################
     @t.overload
-    def __rlshift__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rlshift__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rlshift__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rlshift__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
+    def __rlshift__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rlshift__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __rand__ #########################################################################################################
     @t.overload
-    def __rand__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __rand__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __rand__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
+    def __rand__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __rand__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __ror__ ##########################################################################################################
     @t.overload
-    def __ror__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __ror__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[int]: ...
-    @t.overload
-    def __ror__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[int]: ...
+    def __ror__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[int]: ...
     @t.overload
     def __ror__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
@@ -383,17 +196,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __gt__ ###########################################################################################################
     @t.overload
-    def __gt__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __gt__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __gt__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __gt__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __gt__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __gt__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
+    def __gt__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
     @t.overload
     def __gt__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[bool]: ...
     @t.overload
@@ -401,17 +204,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __ge__ ###########################################################################################################
     @t.overload
-    def __ge__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ge__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ge__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ge__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ge__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ge__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
+    def __ge__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
     @t.overload
     def __ge__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[bool]: ...
     @t.overload
@@ -419,17 +212,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __lt__ ###########################################################################################################
     @t.overload
-    def __lt__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __lt__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __lt__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __lt__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __lt__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __lt__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
+    def __lt__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
     @t.overload
     def __lt__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[bool]: ...
     @t.overload
@@ -437,63 +220,31 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __le__ ###########################################################################################################
     @t.overload
-    def __le__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __le__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __le__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __le__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __le__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __le__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
+    def __le__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
     @t.overload
     def __le__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[bool]: ...
     @t.overload
     def __le__(self, other: t.Any) -> BinExpr[t.Any]: ...
 
     # __eq__ ###########################################################################################################
-    @t.overload
-    def __eq__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __eq__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __eq__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __eq__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __eq__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __eq__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
+    @t.overload  # type: ignore[override]
+    def __eq__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
     @t.overload
     def __eq__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[bool]: ...
     @t.overload
-    def __eq__(self, other: ConstOrCallable[t.Any]) -> BinExpr[t.Any]: ...  # type: ignore
+    def __eq__(self, other: t.Any) -> BinExpr[t.Any]: ...  # pyright: ignore[reportIncompatibleMethodOverride]
 
     # __ne__ ###########################################################################################################
-    @t.overload
-    def __ne__(self: ExprMixin[int], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ne__(self: ExprMixin[int], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ne__(self: ExprMixin[bool], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ne__(self: ExprMixin[bool], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ne__(self: ExprMixin[float], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
-    @t.overload
-    def __ne__(self: ExprMixin[float], other: ConstOrCallable[bool]) -> BinExpr[bool]: ...
+    @t.overload  # type: ignore[override]
+    def __ne__(self: t.Union[ExprMixin[int], ExprMixin[bool]], other: ConstOrCallable[int]) -> BinExpr[bool]: ...
     @t.overload
     def __ne__(self: ExprMixin[float], other: ConstOrCallable[float]) -> BinExpr[bool]: ...
     @t.overload
-    def __ne__(self, other: t.Any) -> BinExpr[t.Any]: ...  # type: ignore
+    def __ne__(self, other: t.Any) -> BinExpr[t.Any]: ...  # pyright: ignore[reportIncompatibleMethodOverride]
 
     # __neg__ ##########################################################################################################
     @t.overload
-    def __neg__(self: ExprMixin[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __neg__(self: ExprMixin[bool]) -> BinExpr[int]: ...
+    def __neg__(self: t.Union[ExprMixin[int], ExprMixin[bool]]) -> BinExpr[int]: ...
     @t.overload
     def __neg__(self: ExprMixin[float]) -> BinExpr[float]: ...
     @t.overload
@@ -501,9 +252,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __pos__ ##########################################################################################################
     @t.overload
-    def __pos__(self: ExprMixin[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __pos__(self: ExprMixin[bool]) -> BinExpr[int]: ...
+    def __pos__(self: t.Union[ExprMixin[int], ExprMixin[bool]]) -> BinExpr[int]: ...
     @t.overload
     def __pos__(self: ExprMixin[float]) -> BinExpr[float]: ...
     @t.overload
@@ -511,9 +260,7 @@ class ExprMixin(t.Generic[ReturnType], object):
 
     # __invert__ #######################################################################################################
     @t.overload
-    def __invert__(self: ExprMixin[int]) -> BinExpr[int]: ...
-    @t.overload
-    def __invert__(self: ExprMixin[bool]) -> BinExpr[int]: ...
+    def __invert__(self: t.Union[ExprMixin[int], ExprMixin[bool]]) -> BinExpr[int]: ...
     @t.overload
     def __invert__(self) -> BinExpr[t.Any]: ...
 
@@ -521,10 +268,15 @@ class ExprMixin(t.Generic[ReturnType], object):
     def __inv__(self) -> UniExpr[t.Any]: ...
 
 class UniExpr(ExprMixin[ReturnType]):
+    op: UniOperator
+    operand: t.Any
     def __init__(self, op: UniOperator, operand: t.Any) -> None: ...
     def __call__(self, obj: t.Union[Context, dict[str, t.Any], t.Any], *args: t.Any) -> ReturnType: ...
 
 class BinExpr(ExprMixin[ReturnType]):
+    op: BinOperator
+    lhs: t.Any
+    rhs: t.Any
     def __init__(self, op: BinOperator, lhs: t.Any, rhs: t.Any) -> None: ...
     def __call__(self, obj: t.Union[Context, dict[str, t.Any], t.Any], *args: t.Any) -> ReturnType: ...
 
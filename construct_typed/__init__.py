@@ -1,47 +1,149 @@
-from .dataclass_struct import (
-    DataclassBitStruct,
-    DataclassMixin,
-    DataclassStruct,
-    TBitStruct,
-    TContainerBase,
-    TContainerMixin,
-    TStruct,
-    TStructField,
-    csfield,
-    sfield,
-)
-from .generic_wrapper import (
-    Adapter,
-    ConstantOrContextLambda,
-    Construct,
-    Context,
-    ListContainer,
-    PathType,
-    Array
-)
-from .tenum import EnumBase, EnumValue, FlagsEnumBase, TEnum, TFlagsEnum
-
-__all__ = [
-    "DataclassBitStruct",
-    "DataclassMixin",
-    "DataclassStruct",
-    "TBitStruct",
-    "TContainerBase",
-    "TContainerMixin",
-    "TStruct",
-    "TStructField",
-    "csfield",
-    "sfield",
-    "EnumBase",
-    "EnumValue",
-    "FlagsEnumBase",
-    "TEnum",
-    "TFlagsEnum",
-    "Adapter",
-    "ConstantOrContextLambda",
-    "Construct",
-    "Context",
-    "ListContainer",
-    "PathType",
-    "Array"
-]
+# The public names are imported lazily on first access (PEP 562), so that "import construct_typed" is cheap and
+# programs only pay the import time of the submodules they actually use.
+import importlib
+
+TYPE_CHECKING = False  # same as typing.TYPE_CHECKING, without importing typing
+if TYPE_CHECKING:
+    from .bitfields import (
+        BitFieldLayout as BitFieldLayout,
+        BitFieldStruct as BitFieldStruct,
+        bit_layout as bit_layout,
+        unpack_bit_records as unpack_bit_records,
+    )
+    from .checksum import FieldChecksum as FieldChecksum
+    from .compile_cache import compile_cached as compile_cached, schema_fingerprint as schema_fingerprint
+    from .compression import CompressedRecords as CompressedRecords, StreamingCompressed as StreamingCompressed
+    from .converters import from_dict as from_dict, to_dict as to_dict
+    from .dataclass_struct import (
+        DataclassBitStruct as DataclassBitStruct,
+        DataclassMixin as DataclassMixin,
+        DataclassStruct as DataclassStruct,
+        TBitStruct as TBitStruct,
+        TContainerBase as TContainerBase,
+        TContainerMixin as TContainerMixin,
+        TStruct as TStruct,
+        TStructField as TStructField,
+        clear_schema_cache as clear_schema_cache,
+        csfield as csfield,
+        sfield as sfield,
+    )
+    from .dataclass_select import DataclassSelect as DataclassSelect
+    from .dataclass_switch import DataclassSwitch as DataclassSwitch, UnknownCase as UnknownCase
+    from .expressions import compile_expression as compile_expression
+    from .generic_wrapper import (
+        Adapter as Adapter,
+        ConstantOrContextLambda as ConstantOrContextLambda,
+        Construct as Construct,
+        Context as Context,
+        ListContainer as ListContainer,
+        PathType as PathType,
+        Array as Array,
+        GreedyRange as GreedyRange,
+    )
+    from .layout import FieldLayout as FieldLayout, patch_field as patch_field, static_layout as static_layout
+    from .numeric_array import NumericArray as NumericArray
+    from .metrics import (
+        count_slow_paths as count_slow_paths,
+        reset_slow_path_counts as reset_slow_path_counts,
+        slow_path_counts as slow_path_counts,
+    )
+    from .profiling import (
+        AllocationReport as AllocationReport,
+        AllocationStats as AllocationStats,
+        allocation_report as allocation_report,
+    )
+    from .tracing import (
+        TraceEvent as TraceEvent,
+        add_trace_hook as add_trace_hook,
+        remove_trace_hook as remove_trace_hook,
+    )
+    from .tenum import (
+        EnumBase as EnumBase,
+        EnumValue as EnumValue,
+        FlagsEnumBase as FlagsEnumBase,
+        TEnum as TEnum,
+        TFlagsEnum as TFlagsEnum,
+    )
+    from .zerocopy import (
+        BufferStream as BufferStream,
+        ZeroCopyBytes as ZeroCopyBytes,
+        ZeroCopyGreedyBytes as ZeroCopyGreedyBytes,
+        detach as detach,
+    )
+
+
+_lazy_names = {
+    "BitFieldLayout": "bitfields",
+    "BitFieldStruct": "bitfields",
+    "bit_layout": "bitfields",
+    "unpack_bit_records": "bitfields",
+    "FieldChecksum": "checksum",
+    "DataclassBitStruct": "dataclass_struct",
+    "DataclassMixin": "dataclass_struct",
+    "DataclassStruct": "dataclass_struct",
+    "TBitStruct": "dataclass_struct",
+    "TContainerBase": "dataclass_struct",
+    "TContainerMixin": "dataclass_struct",
+    "TStruct": "dataclass_struct",
+    "TStructField": "dataclass_struct",
+    "csfield": "dataclass_struct",
+    "sfield": "dataclass_struct",
+    "clear_schema_cache": "dataclass_struct",
+    "DataclassSelect": "dataclass_select",
+    "DataclassSwitch": "dataclass_switch",
+    "UnknownCase": "dataclass_switch",
+    "compile_expression": "expressions",
+    "compile_cached": "compile_cache",
+    "schema_fingerprint": "compile_cache",
+    "CompressedRecords": "compression",
+    "StreamingCompressed": "compression",
+    "from_dict": "converters",
+    "to_dict": "converters",
+    "FieldLayout": "layout",
+    "patch_field": "layout",
+    "static_layout": "layout",
+    "NumericArray": "numeric_array",
+    "BufferStream": "zerocopy",
+    "ZeroCopyBytes": "zerocopy",
+    "ZeroCopyGreedyBytes": "zerocopy",
+    "detach": "zerocopy",
+    "count_slow_paths": "metrics",
+    "reset_slow_path_counts": "metrics",
+    "slow_path_counts": "metrics",
+    "AllocationReport": "profiling",
+    "AllocationStats": "profiling",
+    "allocation_report": "profiling",
+    "TraceEvent": "tracing",
+    "add_trace_hook": "tracing",
+    "remove_trace_hook": "tracing",
+    "EnumBase": "tenum",
+    "EnumValue": "tenum",
+    "FlagsEnumBase": "tenum",
+    "TEnum": "tenum",
+    "TFlagsEnum": "tenum",
+    "Adapter": "generic_wrapper",
+    "ConstantOrContextLambda": "generic_wrapper",
+    "Construct": "generic_wrapper",
+    "Context": "generic_wrapper",
+    "ListContainer": "generic_wrapper",
+    "PathType": "generic_wrapper",
+    "Array": "generic_wrapper",
+    "GreedyRange": "generic_wrapper",
+}
+
+# The public names are the lazy names. Type checkers get them from the "X as X" imports above, which have to match
+# them (see "test_lazy_import").
+__all__ = list(_lazy_names)  # pyright: ignore[reportUnsupportedDunderAll]
+
+
+def __getattr__(name: str) -> object:
+    module_name = _lazy_names.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # __getattr__ is not called again for this name
+    return value
+
+
+def __dir__() -> "list[str]":
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,308 @@
+import dataclasses
+import typing as t
+
+import construct as cs
+
+from .dataclass_struct import _uses_context
+from .generic_wrapper import Construct, Context, PathType
+from .zerocopy import ReadableBuffer
+
+if t.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from .dataclass_struct import DataclassMixin, DataclassStruct
+
+BitFieldKind = t.Literal["int", "flag", "padding"]
+BitStructType = t.TypeVar("BitStructType", bound="DataclassMixin")
+
+
+@dataclasses.dataclass(frozen=True)
+class BitFieldLayout:
+    """
+    Static position of a field inside of a serialized DataclassBitStruct record.
+
+    The offset is counted in bits from the most significant bit of the first byte, like "construct.Bitwise" does.
+    """
+
+    name: str
+    offset: int
+    width: int
+    kind: BitFieldKind
+    signed: bool
+    subcon: Construct[t.Any, t.Any]
+    adapters: t.Tuple["cs.Adapter[t.Any, t.Any, t.Any, t.Any]", ...] = ()
+    fill: bool = False  # padding bits are set
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.width) - 1
+
+
+def _bit_field(
+    name: str, offset: int, sc: Construct[t.Any, t.Any]
+) -> t.Optional[BitFieldLayout]:
+    subcon = sc
+    adapters: t.List["cs.Adapter[t.Any, t.Any, t.Any, t.Any]"] = []
+    while True:
+        if isinstance(sc, cs.Renamed):
+            if sc.parsed is not None:
+                return None  # the hook has to be called with the parsed value
+            sc = sc.subcon
+        elif isinstance(sc, cs.Adapter):
+            # the adapters are called without the context of the struct, so they must not need it (eg. TEnum, which
+            # converts the integer, but not an ExprAdapter with a lambda)
+            adapter_type = type(sc)
+            if adapter_type._parse is not cs.Adapter._parse or adapter_type._build is not cs.Adapter._build:
+                return None
+            if _uses_context(sc, set()):
+                return None
+            adapters.append(sc)
+            sc = sc.subcon
+        else:
+            break
+
+    if type(sc) is cs.BitsInteger:
+        if not isinstance(sc.length, int) or sc.length <= 0 or sc.swapped:
+            return None
+        return BitFieldLayout(name, offset, sc.length, "int", sc.signed, subcon, tuple(adapters))
+    if sc is cs.Flag:
+        return BitFieldLayout(name, offset, 1, "flag", False, subcon, tuple(adapters))
+    if type(sc) is cs.Padded and sc.subcon is cs.Pass and not adapters:
+        if not isinstance(sc.length, int) or sc.pattern not in (b"\x00", b"\x01"):
+            return None
+        return BitFieldLayout(
+            name, offset, sc.length, "padding", False, subcon, fill=sc.pattern == b"\x01"
+        )
+    return None
+
+
+def bit_layout(format: "DataclassStruct[t.Any]") -> t.Optional[t.Tuple[BitFieldLayout, ...]]:
+    """
+    Get the static bit layout of a DataclassStruct, which is used by "DataclassBitStruct", or None if it has none.
+
+    A dataclass has a static bit layout, if all fields are "BitsInteger" (with a fixed length and not swapped),
+    "Flag" or "Padding" (eg. "Bit", "Nibble" or "Octet"), optionally wrapped in adapters like "TEnum", and if the
+    record has a whole number of bytes. Adapters, which may need the context (eg. "ExprAdapter" with a lambda) or
+    override "_parse"/"_build", have no static bit layout. The layout is computed once and then cached.
+
+    :param format: DataclassStruct instance
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import BitsInteger, Flag, Nibble, Padding
+        >>> from construct_typed import DataclassMixin, DataclassStruct, bit_layout, csfield
+        >>> @dataclasses.dataclass
+        ... class Header(DataclassMixin):
+        ...     a: bool = csfield(Flag)
+        ...     b: int = csfield(Nibble)
+        ...     c: None = csfield(Padding(3))
+        >>> [(f.name, f.offset, f.width) for f in bit_layout(DataclassStruct(Header))]
+        [('a', 0, 1), ('b', 1, 4), ('c', 5, 3)]
+    """
+
+    def factory() -> t.Optional[t.Tuple[BitFieldLayout, ...]]:
+        layout: t.List[BitFieldLayout] = []
+        offset = 0
+        for sc in format.subcon.subcons:
+            field = None if sc.name is None else _bit_field(sc.name, offset, sc)
+            if field is None:
+                return None
+            layout.append(field)
+            offset += field.width
+        if offset == 0 or offset % 8:
+            return None
+        return tuple(layout)
+
+    return format._plan("bit_layout", factory)
+
+
+class BitFieldStruct(Construct[BitStructType, BitStructType]):
+    """
+    Same as "Bitwise(DataclassStruct(...))" for a dataclass with a static bit layout (see "bit_layout"), but without
+    restreaming every byte into 8 bytes of bits.
+
+    The record is read once and converted to an integer, from which every field is extracted with a precomputed
+    shift and mask. Building does the reverse. Used by "DataclassBitStruct", when possible.
+
+    :raises StreamError: the stream has not enough bytes for the record
+    :raises IntegerError: an integer does not fit into its field
+    """
+
+    def __init__(self, struct: "DataclassStruct[BitStructType]", layout: t.Tuple[BitFieldLayout, ...]) -> None:
+        super().__init__()  # type: ignore
+        self.struct = struct
+        self.layout = layout
+        bits = sum(field.width for field in layout)
+        self._size = bits // 8
+        self._fields = [
+            (field, bits - field.offset - field.width, field.mask) for field in layout
+        ]
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        data = cs.stream_read(stream, self._size, path)
+        record = int.from_bytes(data, "big")
+        obj: t.Dict[str, t.Any] = {}
+        for field, shift, mask in self._fields:
+            value: t.Any = (record >> shift) & mask
+            if field.kind == "int":
+                if field.signed and value >> (field.width - 1):
+                    value -= 1 << field.width
+            elif field.kind == "flag":
+                value = value != 0
+            else:
+                value = None
+            for adapter in reversed(field.adapters):
+                value = adapter._decode(value, context, path)  # type: ignore
+            obj[field.name] = value
+        return self.struct._decode(obj, context, path)  # type: ignore
+
+    def _build(self, obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        values = self.struct._encode(obj, context, path)  # type: ignore
+        record = 0
+        for field, shift, mask in self._fields:
+            if field.kind == "padding":
+                value = mask if field.fill else 0
+            else:
+                value = values[field.name]
+                for adapter in field.adapters:
+                    value = adapter._encode(value, context, path)  # type: ignore
+                if field.kind == "flag":
+                    value = 1 if value else 0
+                else:
+                    value = self._check_int(field, value, path) & mask
+            record |= value << shift
+        cs.stream_write(stream, record.to_bytes(self._size, "big"), self._size, path)
+        return obj
+
+    @staticmethod
+    def _check_int(field: BitFieldLayout, value: t.Any, path: PathType) -> int:
+        # same checks as "construct.BitsInteger"
+        if not isinstance(value, int):
+            raise cs.IntegerError(f"value {value} is not an integer", path=path)
+        if value < 0 and not field.signed:
+            raise cs.IntegerError(f"value {value} is negative but signed is false", path=path)
+        low = -(1 << (field.width - 1)) if field.signed else 0
+        if not low <= value < low + (1 << field.width):
+            raise cs.IntegerError(
+                f"value {value} does not fit into {field.width} bits of field '{field.name}'", path=path
+            )
+        return value
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        return self._size
+
+
+def _column_dtype(width: int, signed: bool) -> str:
+    for bits in (8, 16, 32, 64):
+        if width <= bits:
+            return f"{'i' if signed else 'u'}{bits // 8}"
+    raise ValueError(f"fields with more than 64 bits are not supported, found {width}")
+
+
+@t.overload
+def unpack_bit_records(
+    format: "DataclassStruct[t.Any]",
+    data: ReadableBuffer,
+    count: t.Optional[int] = None,
+    output: t.Literal["columns"] = "columns",
+) -> t.Dict[str, "npt.NDArray[t.Any]"]:
+    ...
+
+
+@t.overload
+def unpack_bit_records(
+    format: "DataclassStruct[t.Any]",
+    data: ReadableBuffer,
+    count: t.Optional[int] = None,
+    *,
+    output: t.Literal["structured"],
+) -> "npt.NDArray[np.void]":
+    ...
+
+
+def unpack_bit_records(
+    format: "DataclassStruct[t.Any]",
+    data: ReadableBuffer,
+    count: t.Optional[int] = None,
+    output: t.Literal["columns", "structured"] = "columns",
+) -> t.Any:
+    r"""
+    Decode an array of fixed-size bit-packed records with NumPy, instead of parsing every record with "DataclassBitStruct".
+
+    The records are loaded as an unsigned byte matrix (without a copy) and every field of the static bit layout
+    (see "bit_layout") is extracted for all records at once with vectorized shifts and masks. The result contains
+    the raw values of the fields: integers (with the smallest fitting dtype, sign extended if signed) and flags
+    (as bool). Adapters like "TEnum" are not applied, and padding fields are skipped.
+
+    :param format: DataclassStruct instance of the records, which must have a static bit layout
+    :param data: buffer with the records, eg. bytes or mmap
+    :param count: number of records, default is all records of the buffer
+    :param output: "columns" for a dict of field names to 1-d arrays, "structured" for a structured array
+
+    :raises ValueError: the dataclass has no static bit layout, a field spans more than 8 bytes, or the buffer has no whole number of records
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import BitsInteger, Flag, Nibble
+        >>> from construct_typed import DataclassMixin, DataclassStruct, csfield, unpack_bit_records
+        >>> @dataclasses.dataclass
+        ... class Header(DataclassMixin):
+        ...     a: bool = csfield(Flag)
+        ...     b: int = csfield(BitsInteger(3))
+        ...     c: int = csfield(Nibble)
+        >>> columns = unpack_bit_records(DataclassStruct(Header), b"\x9f\x01")
+        >>> columns["a"].tolist(), columns["b"].tolist(), columns["c"].tolist()
+        ([True, False], [1, 0], [15, 1])
+    """
+    import numpy as np  # optional dependency
+
+    layout = bit_layout(format)
+    if layout is None:
+        raise ValueError(f"'{repr(format.dc_type)}' has no static bit layout")
+    size = sum(field.width for field in layout) // 8
+    view = memoryview(data).cast("B")
+    if count is None:
+        count, rest = divmod(len(view), size)
+        if rest:
+            raise ValueError(f"buffer of length {len(view)} has no whole number of records of {size} bytes")
+    records = np.frombuffer(view, dtype=np.uint8, count=count * size).reshape(count, size)
+
+    byte_columns: t.Dict[int, "npt.NDArray[np.uint64]"] = {}
+    columns: t.Dict[str, "npt.NDArray[t.Any]"] = {}
+    for field in layout:
+        if field.kind == "padding":
+            continue
+        first = field.offset // 8
+        last = (field.offset + field.width - 1) // 8
+        if last - first >= 8:
+            raise ValueError(f"field '{field.name}' spans more than 8 bytes")
+        # combine the bytes of the field into a big endian integer per record
+        value = np.zeros(count, dtype=np.uint64)
+        for index in range(first, last + 1):
+            column = byte_columns.get(index)
+            if column is None:
+                column = byte_columns[index] = records[:, index].astype(np.uint64)
+            value = (value << np.uint64(8)) | column
+        shift = (last + 1) * 8 - field.offset - field.width
+        value = (value >> np.uint64(shift)) & np.uint64(field.mask)
+        if field.kind == "flag":
+            columns[field.name] = value != 0
+        elif field.signed:
+            signed = value.astype(np.int64)  # 64 bit fields are already sign extended by the cast
+            if field.width < 64:
+                signed[signed >> (field.width - 1) != 0] -= 1 << field.width
+            columns[field.name] = signed.astype(_column_dtype(field.width, True))
+        else:
+            columns[field.name] = value.astype(_column_dtype(field.width, False))
+
+    if output == "columns":
+        return columns
+    if output == "structured":
+        array = np.empty(count, dtype=[(name, column.dtype) for name, column in columns.items()])
+        for name, column in columns.items():
+            array[name] = column
+        return array
+    raise ValueError(f"invalid output {output!r}")
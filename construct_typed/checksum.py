@@ -0,0 +1,168 @@
+import io
+import typing as t
+
+import construct as cs
+
+from .generic_wrapper import Construct, Context, PathType
+from .metrics import count_slow_path
+
+ChecksumType = t.TypeVar("ChecksumType", int, bytes)
+
+# size of the chunks, which are read again from streams without a buffer
+_CHUNK_SIZE = 64 * 1024
+
+
+def _field_offsets(context: Context) -> t.Dict[str, t.Tuple[int, int]]:
+    """
+    Offsets (start, end) of the fields in the stream, which are stored in the context of the DataclassStruct by
+    the fields of the ranges of "FieldChecksum".
+    """
+    offsets: t.Optional[t.Dict[str, t.Tuple[int, int]]] = context.get("_offsets")
+    if offsets is None:
+        offsets = context["_offsets"] = {}
+    return offsets
+
+
+class RangeOffsets(Construct[None, None]):
+    """
+    Stores the offsets (start, end) of a field of the range of a "FieldChecksum" in the context of the
+    DataclassStruct (see "_field_offsets"), while the field is parsed or built.
+
+    The fields of the ranges call it around their subcon. Their compiled code links it instead of the field
+    itself, because the compiled code (also the code loaded by "compile_cached") links the subcon of a "Renamed".
+    """
+
+    def __init__(self, field: str) -> None:
+        super().__init__()  # type: ignore
+        self.field = field
+
+    def record(self, stream: t.Any, context: Context, path: PathType, func: t.Callable[[], t.Any]) -> t.Any:
+        start = cs.stream_tell(stream, path)
+        obj = func()
+        _field_offsets(context)[self.field] = (start, cs.stream_tell(stream, path))
+        return obj
+
+
+def _stream_ranges(stream: t.Any, start: int, end: int, path: PathType) -> t.Iterator[t.Any]:
+    # the bytes, which were already read or written, are taken from the buffer of the stream without a copy
+    getbuffer = getattr(stream, "getbuffer", None)
+    if getbuffer is not None:
+        buffer = getbuffer()
+        try:
+            with buffer[start:end] as part:
+                yield part
+        finally:
+            if isinstance(stream, io.BytesIO):
+                buffer.release()  # otherwise the BytesIO can not be resized, eg. by writing the checksum
+        return
+    # other streams (eg. files) are read again in chunks
+    count_slow_path("checksum_reread")
+    position = cs.stream_tell(stream, path)
+    cs.stream_seek(stream, start, 0, path)
+    remaining = end - start
+    while remaining > 0:
+        chunk: bytes = cs.stream_read(stream, min(remaining, _CHUNK_SIZE), path)
+        yield chunk
+        remaining -= len(chunk)
+    cs.stream_seek(stream, position, 0, path)
+
+
+class FieldChecksum(Construct[ChecksumType, None]):
+    r"""
+    Checksum over the bytes of a range of csfields of a DataclassStruct (from the field "start" to the field "end",
+    both included), which are parsed or built before the checksum field.
+
+    In comparison to "construct.Checksum" over a "RawCopy", the data is neither kept as a copy nor parsed twice:
+    the checksum is updated incrementally over a memoryview of the bytes of the range, which were already read or
+    written to the stream (eg. the buffer of "io.BytesIO" or of "BufferStream"). Only streams without a buffer
+    (eg. files) are read again in chunks (counted as "checksum_reread" in "slow_path_counts").
+
+    While parsing, the checksum is compared with the parsed value. While building, the checksum is calculated and
+    written, so the value of the dataclass field is ignored.
+
+    :param subcon: construct of the checksum value, eg. Int32ub for "zlib.crc32" or Bytes(32) for "hashlib.sha256"
+    :param hashfunc: constructor of a "hashlib" hash object (the digest is the checksum), or an incremental function like "zlib.crc32" or "zlib.adler32", which is called as hashfunc(data, value)
+    :param start: name of the first csfield of the range
+    :param end: name of the last csfield of the range (default: same as "start")
+
+    :raises ValueError: the fields of the range are not defined before the checksum field of the DataclassStruct
+    :raises ChecksumError: parsed checksum does not match the data
+    :raises ConstructError: the checksum is not a csfield of a DataclassStruct
+
+    Example::
+
+        >>> import dataclasses, zlib
+        >>> from construct import Bytes, Int8ub, Int32ub
+        >>> from construct_typed import DataclassMixin, DataclassStruct, FieldChecksum, csfield
+        >>> @dataclasses.dataclass
+        ... class Frame(DataclassMixin):
+        ...     length: int = csfield(Int8ub)
+        ...     payload: bytes = csfield(Bytes(3))
+        ...     crc: int = csfield(FieldChecksum(Int32ub, zlib.crc32, "length", "payload"))
+        >>> data = DataclassStruct(Frame).build(Frame(length=3, payload=b"abc"))
+        >>> data[4:] == zlib.crc32(b"\x03abc").to_bytes(4, "big")
+        True
+        >>> DataclassStruct(Frame).parse(data)
+        Frame(length=3, payload=b'abc', crc=4187285538)
+    """
+
+    def __init__(
+        self,
+        subcon: Construct[ChecksumType, t.Any],
+        hashfunc: t.Callable[..., t.Any],
+        start: str,
+        end: t.Optional[str] = None,
+    ) -> None:
+        super().__init__()  # type: ignore
+        self.subcon: Construct[ChecksumType, t.Any] = subcon
+        self.hashfunc = hashfunc
+        self.start = start
+        self.end = start if end is None else end
+        try:
+            hashfunc()
+            self._initial: t.Optional[int] = None
+        except TypeError:
+            self._initial = hashfunc(b"")  # incremental function, which needs the data
+        self.flagbuildnone = True
+
+    def _checksum(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        offsets = context.get("_offsets")
+        if offsets is None or self.start not in offsets or self.end not in offsets:
+            raise cs.ConstructError(
+                f"offsets of the fields {self.start!r} and {self.end!r} are missing, the checksum has to be a csfield "
+                f"of a DataclassStruct",
+                path=path,
+            )
+        start, end = offsets[self.start][0], offsets[self.end][1]
+        return self.compute(_stream_ranges(stream, start, end, path))
+
+    def compute(self, parts: t.Iterable[t.Any]) -> t.Any:
+        """
+        Calculate the checksum of the bytes of a range, which are given in parts (eg. bytes or memoryview).
+        """
+        if self._initial is not None:
+            value = self._initial
+            for part in parts:
+                value = self.hashfunc(part, value)
+            return value
+        hasher = self.hashfunc()
+        for part in parts:
+            hasher.update(part)
+        return hasher.digest()
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> ChecksumType:
+        expected = self._checksum(stream, context, path)
+        value: ChecksumType = self.subcon._parsereport(stream, context, path)  # type: ignore
+        if value != expected:
+            raise cs.ChecksumError(
+                f"wrong checksum, read {value!r}, computed {expected!r}", path=path
+            )
+        return value
+
+    def _build(self, obj: None, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        value = self._checksum(stream, context, path)
+        self.subcon._build(value, stream, context, path)  # type: ignore
+        return value
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        return self.subcon._sizeof(context, path)  # type: ignore
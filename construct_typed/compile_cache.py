@@ -0,0 +1,261 @@
+import dataclasses
+import enum
+import hashlib
+import importlib.util
+import marshal
+import os
+import re
+import threading
+import types
+import typing as t
+
+import construct as cs
+from construct.expr import ExprMixin
+from construct.version import version_string as construct_version_string
+
+from .dataclass_struct import DataclassStruct
+from .generic_wrapper import BuildTypes, Construct, ParsedType
+from .metrics import count_compile_fallbacks
+from .version import version_string
+
+
+class _Unfingerprintable(Exception):
+    pass
+
+
+class _SchemaWalker:
+    """
+    Creates a stable description of a construct tree, which does not depend on memory addresses.
+
+    All constructs are numbered in the order they are visited, so that they can be found again in a later
+    process, in which the same schema is walked.
+    """
+
+    def __init__(self) -> None:
+        self.objects: t.List[Construct[t.Any, t.Any]] = []
+        self._indices: t.Dict[int, int] = {}
+
+    def describe(self, value: t.Any) -> str:
+        if value is None or isinstance(value, (bool, float, str, bytes)):
+            return repr(value)
+        if isinstance(value, enum.Enum):
+            return f"{self._describe_type(type(value))}.{value.name}={value.value!r}"
+        if isinstance(value, int):
+            return repr(value)
+        if isinstance(value, cs.Construct):
+            return self._describe_construct(value)
+        if isinstance(value, type):
+            return self._describe_type(value)
+        if isinstance(value, ExprMixin):
+            return self._checked(f"expr:{value!r}")
+        if isinstance(value, types.FunctionType):
+            return self._describe_function(value)
+        if isinstance(value, types.MethodType):
+            return f"method:{self.describe(value.__self__)}.{value.__func__.__name__}"
+        if isinstance(value, types.BuiltinFunctionType):
+            return f"builtin:{value.__module__}.{value.__qualname__}"
+        if isinstance(value, (list, tuple)):
+            items = t.cast(t.Sequence[t.Any], value)
+            return "[" + ", ".join(self.describe(v) for v in items) + "]"
+        if isinstance(value, (set, frozenset)):
+            members = t.cast(t.AbstractSet[t.Any], value)
+            return "{" + ", ".join(sorted(self.describe(v) for v in members)) + "}"
+        if isinstance(value, dict):
+            entries: t.Dict[t.Any, t.Any] = value
+            described = sorted((self.describe(k), v) for k, v in entries.items())
+            return "{" + ", ".join(f"{k}: {self.describe(v)}" for k, v in described) + "}"
+        return self._checked(f"{self._describe_type(type(value))}:{value!r}")
+
+    def _checked(self, description: str) -> str:
+        # memory addresses would change the fingerprint in every process
+        if " at 0x" in description:
+            raise _Unfingerprintable(description)
+        return description
+
+    def _describe_construct(self, sc: "cs.Construct[t.Any, t.Any]") -> str:
+        index = self._indices.get(id(sc))
+        if index is not None:
+            return f"#{index}"
+        self._indices[id(sc)] = len(self.objects)
+        self.objects.append(sc)
+        # the plans are derived from the schema by DataclassStruct, eg. compiled code
+        attrs = ", ".join(f"{k}={self.describe(v)}" for k, v in sorted(vars(sc).items()) if k != "_plans")
+        return f"{self._describe_type(type(sc))}({attrs})"
+
+    def _describe_type(self, tp: t.Type[t.Any]) -> str:
+        name = f"{tp.__module__}.{tp.__qualname__}"
+        if issubclass(tp, enum.Enum):
+            members = t.cast(t.Iterable[enum.Enum], tp)
+            return f"{name}<" + ", ".join(f"{m.name}={m.value!r}" for m in members) + ">"
+        if dataclasses.is_dataclass(tp):
+            fields = ", ".join(
+                f"{f.name}(init={f.init})={self.describe(f.metadata.get('subcon'))}"
+                for f in dataclasses.fields(tp)
+            )
+            return f"{name}<{fields}>"
+        return name
+
+    def _describe_function(self, func: types.FunctionType) -> str:
+        closure = [cell.cell_contents for cell in func.__closure__ or ()]
+        return (
+            f"function:{func.__module__}.{func.__qualname__}"
+            f"<{self._describe_code(func.__code__)}, {self.describe(func.__defaults__)},"
+            f" {self.describe(closure)}>"
+        )
+
+    def _describe_code(self, code: types.CodeType) -> str:
+        consts = ", ".join(
+            self._describe_code(c) if isinstance(c, types.CodeType) else self.describe(c)
+            for c in code.co_consts
+        )
+        return f"code:{code.co_code.hex()}[{consts}]{code.co_names}"
+
+
+def _fingerprint(
+    format: Construct[t.Any, t.Any]
+) -> t.Tuple[str, t.List[Construct[t.Any, t.Any]]]:
+    walker = _SchemaWalker()
+    description = "\n".join(
+        [
+            importlib.util.MAGIC_NUMBER.hex(),
+            construct_version_string,
+            version_string,
+            walker.describe(format),
+        ]
+    )
+    return hashlib.sha256(description.encode()).hexdigest(), walker.objects
+
+
+def schema_fingerprint(format: Construct[t.Any, t.Any]) -> t.Optional[str]:
+    """
+    Get a stable fingerprint of a construct tree (eg. a DataclassStruct), which is used as key by "compile_cached".
+
+    The fingerprint covers the types and attributes of all constructs, the fields of the dataclasses, the code
+    of functions (eg. lambdas) and the versions of Python, construct and construct_typed. It is None, if the
+    tree contains objects without a stable representation.
+    """
+    try:
+        return _fingerprint(format)[0]
+    except (_Unfingerprintable, RecursionError):
+        return None
+
+
+def _default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "construct_typed")
+
+
+def _extractfield(sc: Construct[t.Any, t.Any]) -> t.Any:
+    # same as construct does for the linked instances
+    while isinstance(sc, cs.Renamed):
+        sc = sc.subcon
+    return sc
+
+
+def _load(
+    format: Construct[t.Any, t.Any],
+    fingerprint: str,
+    source: str,
+    code: types.CodeType,
+    linked: t.List[int],
+    objects: t.List[Construct[t.Any, t.Any]],
+) -> t.Any:
+    module = types.ModuleType(f"construct_typed_compiled_{fingerprint}")
+    exec(code, module.__dict__)
+    fields = {index: _extractfield(objects[index]) for index in linked}
+    module.linkedinstances = fields  # type: ignore
+    module.linkedparsers = {index: f._parse for index, f in fields.items()}  # type: ignore
+    module.linkedbuilders = {index: f._build for index, f in fields.items()}  # type: ignore
+    compiled = module.compiled  # type: ignore
+    compiled.source = source
+    compiled.module = module
+    compiled.modulename = module.__name__
+    compiled.defersubcon = format
+    return count_compile_fallbacks(compiled)
+
+
+def _store(path: str, data: bytes) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # atomic, so that other processes/threads never read half written files
+    except OSError:
+        pass  # the cache is only an optimisation
+
+
+def compile_cached(
+    format: Construct[ParsedType, BuildTypes], cache_dir: t.Optional[str] = None
+) -> Construct[ParsedType, BuildTypes]:
+    """
+    Same as "format.compile()", but the generated code is stored in a cache directory and loaded again by later processes.
+
+    The cache entry is keyed by "schema_fingerprint", so it is invalidated automatically, if the schema, Python,
+    construct or construct_typed changes. Objects that are not part of the generated code (eg. linked
+    instances, which can not be compiled) are taken from the passed format. If the schema has no stable
+    fingerprint, the format is compiled without cache. For a DataclassStruct the result is kept like by
+    "compile()", so the cache entry is read only once per process.
+
+    :param format: construct to compile, eg. a DataclassStruct
+    :param cache_dir: cache directory, default is "$XDG_CACHE_HOME/construct_typed" or "~/.cache/construct_typed"
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Int8ub
+        >>> from construct_typed import DataclassMixin, DataclassStruct, compile_cached, csfield
+        >>> @dataclasses.dataclass
+        ... class Image(DataclassMixin):
+        ...     width: int = csfield(Int8ub)
+        ...     height: int = csfield(Int8ub)
+        >>> compiled = compile_cached(DataclassStruct(Image))
+        >>> compiled.parse(bytes([1, 2]))
+        Image(width=1, height=2)
+    """
+    if isinstance(format, DataclassStruct):
+        # the same plan as "compile()", which is also used by the cold path
+        return t.cast(
+            Construct[ParsedType, BuildTypes],
+            format._plan("compiled", lambda: _compile_cached(format, cache_dir)),
+        )
+    return _compile_cached(format, cache_dir)
+
+
+def _compile_cached(
+    format: Construct[ParsedType, BuildTypes], cache_dir: t.Optional[str]
+) -> Construct[ParsedType, BuildTypes]:
+    try:
+        fingerprint, objects = _fingerprint(format)
+    except (_Unfingerprintable, RecursionError):
+        return format.compile()
+    path = os.path.join(cache_dir or _default_cache_dir(), f"{fingerprint}.marshal")
+
+    try:
+        with open(path, "rb") as f:
+            source, code, linked = marshal.load(f)
+        return t.cast(
+            Construct[ParsedType, BuildTypes],
+            _load(format, fingerprint, source, code, linked, objects),
+        )
+    except (OSError, EOFError, ValueError, TypeError, IndexError):
+        pass  # not cached yet or invalid cache entry
+
+    compiled = format.compile()
+    module = compiled.module  # type: ignore
+    source = t.cast(str, compiled.source)  # type: ignore
+
+    # replace the ids of the linked instances by their index in the schema
+    indices = {id(obj): index for index, obj in enumerate(objects)}
+    if not all(obj_id in indices for obj_id in module.linkedinstances):
+        return compiled
+    linked = [indices[obj_id] for obj_id in module.linkedinstances]
+    if linked:
+        pattern = r"\b(" + "|".join(str(obj_id) for obj_id in module.linkedinstances) + r")\b"
+        source = re.sub(pattern, lambda m: str(indices[int(m.group(1))]), source)
+
+    code = compile(source, f"<construct_typed compiled {fingerprint}>", "exec")
+    _store(path, marshal.dumps((source, code, linked)))
+    return compiled
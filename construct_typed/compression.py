@@ -0,0 +1,280 @@
+import io
+import typing as t
+
+import construct as cs
+
+from .generic_wrapper import Construct, Context, PathType
+from .metrics import count_slow_path
+from .zerocopy import BufferStream, _stream_readview
+
+ParsedType = t.TypeVar("ParsedType")
+BuildTypes = t.TypeVar("BuildTypes")
+
+Encoding = t.Literal["zlib", "gzip", "bzip2", "lzma", "lz4"]
+
+# size of the chunks of compressed data, which are passed to the decompressor
+_INPUT_CHUNK_SIZE = 64 * 1024
+# size of the buffer of decompressed data, from which the records are parsed
+_OUTPUT_BUFFER_SIZE = 64 * 1024
+
+
+def _decompressor(encoding: Encoding) -> t.Any:
+    if encoding == "zlib":
+        import zlib
+
+        return zlib.decompressobj()
+    if encoding == "gzip":
+        import zlib
+
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "bzip2":
+        import bz2
+
+        return bz2.BZ2Decompressor()
+    if encoding == "lzma":
+        import lzma
+
+        return lzma.LZMADecompressor()
+    import lz4.frame  # type: ignore  # optional dependency, only needed for encoding="lz4"
+
+    return lz4.frame.LZ4FrameDecompressor()
+
+
+def _compressor(encoding: Encoding, level: t.Optional[int]) -> t.Any:
+    if encoding == "zlib":
+        import zlib
+
+        return zlib.compressobj(-1 if level is None else level)
+    if encoding == "gzip":
+        import zlib
+
+        return zlib.compressobj(9 if level is None else level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if encoding == "bzip2":
+        import bz2
+
+        return bz2.BZ2Compressor(9 if level is None else level)
+    if encoding == "lzma":
+        import lzma
+
+        return lzma.LZMACompressor(preset=level)
+    import lz4.frame  # type: ignore
+
+    return lz4.frame.LZ4FrameCompressor(compression_level=0 if level is None else level)
+
+
+class _DecompressingReader(io.RawIOBase):
+    """
+    Raw stream of the decompressed data, which decompresses the input chunk by chunk only as far as it is read.
+
+    The stream is seekable, so that records can use "Tell", "Pointer", "FieldChecksum", etc. The position is the
+    offset in the decompressed data, like in "Compressed". Seeking forward decompresses and skips the data, seeking
+    backward decompresses the data again from the beginning (short seeks are done by the buffer of the
+    "io.BufferedReader" without seeking this stream).
+    """
+
+    def __init__(self, data: t.Any, encoding: Encoding) -> None:
+        super().__init__()
+        self._data = memoryview(data)
+        self._encoding: Encoding = encoding
+        # the decompressors of zlib keep the input, which exceeds max_length, as "unconsumed_tail"
+        self._zlib = encoding in ("zlib", "gzip")
+        self._restart()
+
+    def _restart(self) -> None:
+        self._pos = 0
+        self._offset = 0  # position in the decompressed data
+        self._pending = memoryview(b"")
+        self._decompressor = _decompressor(self._encoding)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._offset
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._offset
+        elif whence == io.SEEK_END:
+            self._skip(None)
+            offset += self._offset
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"invalid whence {whence!r}")
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        if offset < self._offset:
+            count_slow_path("compressed_rewind")
+            self._restart()
+        self._skip(offset)
+        return self._offset
+
+    def _skip(self, offset: t.Optional[int]) -> None:
+        buffer = bytearray(_OUTPUT_BUFFER_SIZE)
+        while offset is None or self._offset < offset:
+            size = len(buffer) if offset is None else min(len(buffer), offset - self._offset)
+            if not self.readinto(memoryview(buffer)[:size]):
+                break  # the end of the decompressed data
+
+    def _next_input(self) -> t.Any:
+        chunk = self._data[self._pos : self._pos + _INPUT_CHUNK_SIZE]
+        self._pos += len(chunk)
+        return chunk
+
+    def _decompress(self, max_length: int) -> bytes:
+        decompressor = self._decompressor
+        while not decompressor.eof:
+            if self._zlib:
+                chunk = decompressor.unconsumed_tail or self._next_input()
+                if not chunk:
+                    out: bytes = decompressor.flush()  # output, which is still pending at the end of the input
+                    if out:
+                        return out
+                    break
+                out = decompressor.decompress(chunk, max_length)
+            else:
+                chunk = self._next_input() if decompressor.needs_input else b""
+                if decompressor.needs_input and not chunk:
+                    break
+                out = decompressor.decompress(chunk, max_length=max_length)
+            if out:
+                return out
+        if not decompressor.eof:
+            raise cs.StreamError("compressed data ended before the end of the stream")
+        return b""
+
+    def readinto(self, buffer: t.Any) -> int:
+        if not self._pending:
+            self._pending = memoryview(self._decompress(len(buffer)))
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self._offset += size
+        return size
+
+
+class CompressedRecords(t.Generic[ParsedType]):
+    """
+    Result of parsing "StreamingCompressed": iterable over the records, which are parsed while the compressed data
+    is decompressed. Every iteration starts to decompress the data from the beginning.
+    """
+
+    def __init__(
+        self,
+        format: "StreamingCompressed[ParsedType, t.Any]",
+        data: t.Any,
+        context: Context,
+        path: PathType,
+    ) -> None:
+        self.format = format
+        self.data = data
+        self._context = context
+        self._path = path
+
+    def __iter__(self) -> t.Iterator[ParsedType]:
+        reader = _DecompressingReader(self.data, self.format.encoding)
+        stream = io.BufferedReader(reader, _OUTPUT_BUFFER_SIZE)
+        subcon = self.format.subcon
+        while stream.peek(1):
+            yield subcon._parsereport(stream, self._context, self._path)  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"<CompressedRecords {self.format.encoding} ({len(self.data)} compressed bytes)>"
+
+
+class StreamingCompressed(Construct[CompressedRecords[ParsedType], t.Iterable[BuildTypes]]):
+    r"""
+    Streaming variant of "Compressed" and "CompressedLZ4" for the records of a large compressed block.
+
+    "Compressed" decompresses the entire data into memory before the subcon is parsed. Here the subcon is a single
+    record, and parsing returns a "CompressedRecords" iterable, which decompresses the data incrementally while the
+    records are parsed one by one, until the end of the decompressed data. So the peak memory is bounded by the
+    buffers and a single record instead of the decompressed size. Building compresses the records one by one.
+
+    Like "Compressed" the compressed data is the rest of the stream, or it is prefixed by its length, if a
+    lengthfield is given (the same as "Prefixed(lengthfield, Compressed(...))"). It is kept by the result until the
+    records are iterated. In a DataclassStruct with zerocopy=True (or when parsing from a "BufferStream") it is a
+    memoryview of the input buffer (eg. a mmap), so not even the compressed data is copied. This does not work with
+    "Prefixed", which copies its data, so use the lengthfield instead.
+
+    The records are parsed from a seekable stream of the decompressed data, so they can use "Tell", "Pointer" or
+    "FieldChecksum" with the same offsets as in "Compressed" (offsets in the decompressed data). But seeking back
+    further than the buffer of the decompressed data (64 KiB) decompresses the data again from the beginning,
+    which is counted as "compressed_rewind" in "slow_path_counts".
+
+    :param subcon: construct of a single record, eg. a DataclassStruct
+    :param encoding: "zlib", "gzip", "bzip2", "lzma" (like "Compressed") or "lz4" (like "CompressedLZ4", requires lz4)
+    :param level: optional compression level for building
+    :param lengthfield: optional integer construct of the length of the compressed data, which is placed before it
+
+    :raises ValueError: unknown encoding
+    :raises StreamError: compressed data is truncated
+    :raises SizeofError: the size is never known
+
+    Example::
+
+        >>> from construct import Int16ub
+        >>> from construct_typed import StreamingCompressed
+        >>> d = StreamingCompressed(Int16ub, "zlib")
+        >>> records = d.parse(d.build(range(1000)))
+        >>> sum(records)
+        499500
+    """
+
+    def __init__(
+        self,
+        subcon: Construct[ParsedType, BuildTypes],
+        encoding: Encoding,
+        level: t.Optional[int] = None,
+        lengthfield: t.Optional[Construct[int, int]] = None,
+    ) -> None:
+        super().__init__()  # type: ignore
+        if encoding not in ("zlib", "gzip", "bzip2", "lzma", "lz4"):
+            raise ValueError(f"invalid encoding {encoding!r}")
+        self.subcon = subcon
+        self.encoding: Encoding = encoding
+        self.level = level
+        self.lengthfield = lengthfield
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> CompressedRecords[ParsedType]:
+        if self.lengthfield is not None:
+            length: int = self.lengthfield._parsereport(stream, context, path)  # type: ignore
+            data: t.Any = _stream_readview(stream, length, path)
+        elif isinstance(stream, BufferStream):
+            data = stream.readview()
+        else:
+            data = cs.stream_read_entire(stream, path)
+        return CompressedRecords(self, data, context, path)
+
+    def _build(self, obj: t.Iterable[BuildTypes], stream: t.Any, context: Context, path: PathType) -> t.Any:
+        if self.lengthfield is None:
+            self._compress(obj, stream, context, path)
+            return obj
+        compressed = io.BytesIO()
+        self._compress(obj, compressed, context, path)
+        data = compressed.getvalue()
+        self.lengthfield._build(len(data), stream, context, path)  # type: ignore
+        cs.stream_write(stream, data, len(data), path)
+        return obj
+
+    def _compress(self, obj: t.Iterable[BuildTypes], stream: t.Any, context: Context, path: PathType) -> None:
+        compressor = _compressor(self.encoding, self.level)
+        if self.encoding == "lz4":
+            header = compressor.begin()
+            cs.stream_write(stream, header, len(header), path)
+        record = io.BytesIO()
+        for item in obj:
+            record.seek(0)
+            record.truncate()
+            self.subcon._build(item, record, context, path)  # type: ignore
+            with record.getbuffer() as view:
+                out = compressor.compress(view)
+            if out:
+                cs.stream_write(stream, out, len(out), path)
+        out = compressor.flush()
+        cs.stream_write(stream, out, len(out), path)
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        raise cs.SizeofError("compressed data has no fixed size", path=path)
@@ -0,0 +1,290 @@
+import dataclasses
+import typing as t
+
+import construct as cs
+
+from .dataclass_struct import DataclassMixin, DataclassStruct, DataclassType
+from .generic_wrapper import Construct
+from .lazy import LazyField
+from .tenum import EnumBase, FlagsEnumBase, TEnum, TFlagsEnum
+from .zerocopy import ZeroCopyBytes, ZeroCopyGreedyBytes
+
+EnumAs = t.Literal["name", "value"]
+BytesAs = t.Literal["bytes", "hex"]
+Converter = t.Callable[[t.Any], t.Any]
+
+# Subconstructs that do not change the type of the value of their subcon.
+_TRANSPARENT_TYPES: t.Tuple[t.Type[t.Any], ...] = (
+    cs.Renamed,
+    cs.Const,
+    cs.Default,
+    cs.Rebuild,
+    cs.Padded,
+    cs.Aligned,
+    cs.Prefixed,
+    cs.FixedSized,
+    cs.NullTerminated,
+    cs.NullStripped,
+    cs.Pointer,
+    cs.Peek,
+    cs.Transformed,
+    cs.Restreamed,
+    LazyField,
+)
+_LIST_TYPES: t.Tuple[t.Type[t.Any], ...] = (cs.Array, cs.GreedyRange, cs.RepeatUntil)
+_IDENTITY_TYPES: t.Tuple[t.Type[t.Any], ...] = (
+    cs.FormatField,
+    cs.BytesInteger,
+    cs.BitsInteger,
+    cs.StringEncoded,
+)
+_IDENTITY_INSTANCES: t.Tuple[t.Any, ...] = (cs.Flag, cs.VarInt, cs.ZigZag, cs.Pass)
+_BYTES_TYPES: t.Tuple[t.Type[t.Any], ...] = (cs.Bytes, ZeroCopyBytes, ZeroCopyGreedyBytes)
+_BYTES_INSTANCES: t.Tuple[t.Any, ...] = (cs.GreedyBytes,)
+
+
+def _identity(value: t.Any) -> t.Any:
+    return value
+
+
+def _cached(
+    dc_type: t.Type[t.Any], key: t.Tuple[t.Any, ...], factory: t.Callable[[], Converter]
+) -> Converter:
+    # the converters are plans of the shared DataclassStruct of the dataclass
+    return DataclassStruct(dc_type)._plan(key, factory)
+
+
+def _generate(
+    name: str, body: str, namespace: t.Dict[str, t.Any]
+) -> t.Callable[..., t.Any]:
+    source = f"def {name}(obj):\n    return {body}\n"
+    exec(compile(source, f"<construct_typed {name}>", "exec"), namespace)
+    return t.cast(t.Callable[..., t.Any], namespace[name])
+
+
+def _unwrap(subcon: Construct[t.Any, t.Any]) -> Construct[t.Any, t.Any]:
+    while isinstance(subcon, _TRANSPARENT_TYPES):
+        subcon = t.cast("cs.Subconstruct[t.Any, t.Any, t.Any, t.Any]", subcon).subcon
+    return subcon
+
+
+# ## to_dict ##########################################################################################################
+def _bytes_to_dict(bytes_as: BytesAs) -> Converter:
+    if bytes_as == "hex":
+        return lambda value: None if value is None else bytes(value).hex()
+    return lambda value: value if value is None or type(value) is bytes else bytes(value)
+
+
+def _enum_to_dict(enum_as: EnumAs) -> Converter:
+    if enum_as == "name":
+        return lambda value: None if value is None else value.name
+    return lambda value: None if value is None else int(value)
+
+
+def _dynamic_to_dict(enum_as: EnumAs, bytes_as: BytesAs) -> Converter:
+    convert_bytes = _bytes_to_dict(bytes_as)
+    convert_enum = _enum_to_dict(enum_as)
+
+    def convert(value: t.Any) -> t.Any:
+        if isinstance(value, DataclassMixin):
+            return to_dict(value, enum_as, bytes_as)
+        if isinstance(value, FlagsEnumBase):
+            return int(value)
+        if isinstance(value, EnumBase):
+            return convert_enum(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return convert_bytes(value)
+        if isinstance(value, dict):
+            # only the private keys of a Container (eg. "_io") are skipped, other keys may not be strings (the cast
+            # gives pyright concrete type arguments, which mypy already infers)
+            items = t.cast(t.Dict[t.Any, t.Any], value).items()  # type: ignore[redundant-cast]
+            return {k: convert(v) for k, v in items if not (isinstance(k, str) and k.startswith("_"))}
+        if isinstance(value, (list, tuple)):
+            return [convert(v) for v in t.cast(t.List[t.Any], value)]
+        return value
+
+    return convert
+
+
+def _subcon_to_dict(
+    subcon: Construct[t.Any, t.Any], enum_as: EnumAs, bytes_as: BytesAs
+) -> Converter:
+    subcon = _unwrap(subcon)
+    if isinstance(subcon, DataclassStruct):
+        dc_struct: "DataclassStruct[t.Any]" = subcon
+        return _get_to_dict(dc_struct.dc_type, enum_as, bytes_as)
+    if isinstance(subcon, TFlagsEnum):
+        return _enum_to_dict("value")
+    if isinstance(subcon, TEnum):
+        return _enum_to_dict(enum_as)
+    if isinstance(subcon, _BYTES_TYPES) or subcon in _BYTES_INSTANCES:
+        return _bytes_to_dict(bytes_as)
+    if isinstance(subcon, _IDENTITY_TYPES) or subcon in _IDENTITY_INSTANCES:
+        return _identity
+    if isinstance(subcon, _LIST_TYPES):
+        list_subcon = t.cast("cs.Subconstruct[t.Any, t.Any, t.Any, t.Any]", subcon)
+        convert = _subcon_to_dict(list_subcon.subcon, enum_as, bytes_as)
+        if convert is _identity:
+            return list
+        return lambda value: [convert(v) for v in value]
+    return _dynamic_to_dict(enum_as, bytes_as)
+
+
+def _get_to_dict(
+    dc_type: t.Type[DataclassMixin], enum_as: EnumAs, bytes_as: BytesAs
+) -> Converter:
+    def factory() -> Converter:
+        namespace: t.Dict[str, t.Any] = {}
+        items: t.List[str] = []
+        for field in dataclasses.fields(dc_type):
+            convert = _subcon_to_dict(field.metadata["subcon"], enum_as, bytes_as)
+            if convert is _identity:
+                items.append(f"{field.name!r}: obj.{field.name}")
+            else:
+                namespace[f"convert_{field.name}"] = convert
+                items.append(f"{field.name!r}: convert_{field.name}(obj.{field.name})")
+        return _generate("to_dict", "{" + ", ".join(items) + "}", namespace)
+
+    return _cached(dc_type, ("to_dict", enum_as, bytes_as), factory)
+
+
+def to_dict(
+    obj: DataclassMixin, enum_as: EnumAs = "value", bytes_as: BytesAs = "bytes"
+) -> t.Dict[str, t.Any]:
+    """
+    Convert a dataclass instance (derived from DataclassMixin) into a plain dict.
+
+    In comparison to "dataclasses.asdict" no deep copy is made. Instead a converter is generated once per
+    dataclass type from the csfields of the dataclass and cached. Nested dataclasses are converted to dicts,
+    lists (eg. ListContainer) to plain lists, enums (EnumBase) to their value or name and bytes to bytes or a hex
+    string. Flags enums (FlagsEnumBase) are always converted to their integer value.
+
+    :param obj: instance of a dataclass, which also inherits from DataclassMixin
+    :param enum_as: convert enum members to their "value" (int) or to their "name" (str)
+    :param bytes_as: convert bytes to "bytes" or to a "hex" string
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Bytes, Int8ub
+        >>> from construct_typed import DataclassMixin, csfield, to_dict
+        >>> @dataclasses.dataclass
+        ... class Image(DataclassMixin):
+        ...     width: int = csfield(Int8ub)
+        ...     pixels: bytes = csfield(Bytes(2))
+        >>> to_dict(Image(width=1, pixels=b"12"))
+        {'width': 1, 'pixels': b'12'}
+    """
+    if not isinstance(obj, DataclassMixin):  # type: ignore
+        raise TypeError(f"'{repr(obj)}' has to be a '{repr(DataclassMixin)}'")
+    return t.cast(
+        t.Dict[str, t.Any], _get_to_dict(type(obj), enum_as, bytes_as)(obj)
+    )
+
+
+# ## from_dict ########################################################################################################
+def _bytes_from_dict(value: t.Any) -> t.Any:
+    if isinstance(value, str):
+        return bytes.fromhex(value)
+    return value
+
+
+def _enum_from_dict(enum_type: t.Type[EnumBase]) -> Converter:
+    members = enum_type.__members__
+
+    def convert(value: t.Any) -> t.Any:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            member = members.get(value)
+            return member if member is not None else enum_type(int(value))
+        return enum_type(value)
+
+    return convert
+
+
+def _subcon_from_dict(subcon: Construct[t.Any, t.Any]) -> Converter:
+    subcon = _unwrap(subcon)
+    if isinstance(subcon, DataclassStruct):
+        dc_struct: "DataclassStruct[t.Any]" = subcon
+        convert_dc = _get_from_dict(dc_struct.dc_type)
+        return lambda value: value if isinstance(value, DataclassMixin) else convert_dc(value)
+    if isinstance(subcon, TFlagsEnum):
+        flags_enum: "TFlagsEnum[t.Any]" = subcon
+        flags_type = flags_enum.enum_type
+        return lambda value: None if value is None else flags_type(value)
+    if isinstance(subcon, TEnum):
+        tenum: "TEnum[t.Any]" = subcon
+        return _enum_from_dict(tenum.enum_type)
+    if isinstance(subcon, _BYTES_TYPES) or subcon in _BYTES_INSTANCES:
+        return _bytes_from_dict
+    if isinstance(subcon, _LIST_TYPES):
+        list_subcon = t.cast("cs.Subconstruct[t.Any, t.Any, t.Any, t.Any]", subcon)
+        convert = _subcon_from_dict(list_subcon.subcon)
+        if convert is _identity:
+            return cs.ListContainer
+        return lambda value: cs.ListContainer(convert(v) for v in value)
+    return _identity
+
+
+def _get_from_dict(dc_type: t.Type[DataclassType]) -> Converter:
+    def factory() -> Converter:
+        namespace: t.Dict[str, t.Any] = {"dc_type": dc_type}
+        init_items: t.List[str] = []
+        other_fields: t.List[t.Tuple[str, Converter]] = []
+        for field in dataclasses.fields(dc_type):
+            convert = _subcon_from_dict(field.metadata["subcon"])
+            if not field.init:
+                other_fields.append((field.name, convert))
+            elif convert is _identity:
+                init_items.append(f"{field.name}=obj[{field.name!r}]")
+            else:
+                namespace[f"convert_{field.name}"] = convert
+                init_items.append(f"{field.name}=convert_{field.name}(obj[{field.name!r}])")
+        create = _generate("from_dict", f"dc_type({', '.join(init_items)})", namespace)
+        if not other_fields:
+            return create
+
+        def convert_all(obj: t.Mapping[str, t.Any]) -> t.Any:
+            dc = create(obj)
+            for name, convert in other_fields:
+                if name in obj:
+                    setattr(dc, name, convert(obj[name]))
+            return dc
+
+        return convert_all
+
+    return _cached(dc_type, ("from_dict",), factory)
+
+
+def from_dict(dc_type: t.Type[DataclassType], data: t.Mapping[str, t.Any]) -> DataclassType:
+    """
+    Create a dataclass instance (derived from DataclassMixin) from a plain dict, eg. one that was created by "to_dict".
+
+    The converter is generated once per dataclass type from the csfields of the dataclass and cached. Nested
+    dicts are converted to the nested dataclasses, lists to ListContainers, enum names or values to the enum
+    members and hex strings to bytes. So the result can be passed directly to "DataclassStruct.build".
+
+    Fields that are not passed to the dataclass constructor (eg. Const fields) are set afterwards, if they are
+    contained in the dict.
+
+    :param dc_type: Type of the dataclass, which also inherits from DataclassMixin
+    :param data: dict with the values of the fields
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Bytes, Int8ub
+        >>> from construct_typed import DataclassMixin, csfield, from_dict
+        >>> @dataclasses.dataclass
+        ... class Image(DataclassMixin):
+        ...     width: int = csfield(Int8ub)
+        ...     pixels: bytes = csfield(Bytes(2))
+        >>> from_dict(Image, {"width": 1, "pixels": "3132"})
+        Image(width=1, pixels=b'12')
+    """
+    if not issubclass(dc_type, DataclassMixin):  # type: ignore
+        raise TypeError(f"'{repr(dc_type)}' has to be a '{repr(DataclassMixin)}'")
+    if not dataclasses.is_dataclass(dc_type):
+        raise TypeError(f"'{repr(dc_type)}' has to be a 'dataclasses.dataclass'")
+    return t.cast(DataclassType, _get_from_dict(dc_type)(data))
@@ -0,0 +1,130 @@
+import dataclasses
+import typing as t
+
+import construct as cs
+
+from .dataclass_struct import DataclassStruct, DataclassType
+from .generic_wrapper import Construct, Context, PathType
+from .metrics import count_slow_path
+
+SelectType = t.TypeVar("SelectType")
+
+
+def const_prefix(dc_type: t.Type[t.Any]) -> bytes:
+    """
+    Get the bytes of the leading Const fields of a dataclass (eg. magic bytes of a file format or a message header).
+    """
+    prefix = b""
+    for field in dataclasses.fields(dc_type):
+        subcon = field.metadata["subcon"]
+        while isinstance(subcon, cs.Renamed):
+            subcon = subcon.subcon
+        if not isinstance(subcon, cs.Const):
+            break
+        prefix += subcon.build(None)
+    return prefix
+
+
+class DataclassSelect(Construct[SelectType, SelectType]):
+    r"""
+    Recognizes the dataclass of a record by the bytes of its leading Const fields, and parses/builds it with "DataclassStruct".
+
+    In comparison to "construct.Select" the alternatives are not tried one after the other (catching an exception
+    for every mismatch). Instead the leading Const fields of all dataclasses are collected in an index, and the
+    dataclass is looked up with the head of the stream. If the prefixes of multiple dataclasses match, the longest
+    prefix wins. When building, the dataclass is selected by the type of the object.
+
+    :param dc_types: types of the dataclasses, which must begin with at least one Const field
+
+    :raises ValueError: a dataclass has no leading Const fields or the same prefix as another dataclass
+    :raises SelectError: no prefix matches the stream, or the type of the object is not registered
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Const, Int8ub
+        >>> from construct_typed import DataclassMixin, DataclassSelect, csfield
+        >>> @dataclasses.dataclass
+        ... class Png(DataclassMixin):
+        ...     magic: bytes = csfield(Const(b"\x89PNG"))
+        ...     version: int = csfield(Int8ub)
+        >>> @dataclasses.dataclass
+        ... class Gif(DataclassMixin):
+        ...     magic: bytes = csfield(Const(b"GIF8"))
+        ...     version: int = csfield(Int8ub)
+        >>> d = DataclassSelect(Png, Gif)
+        >>> d.parse(b"GIF8\x09")
+        Gif(magic=b'GIF8', version=9)
+        >>> d.recognize(b"\x89PNG\x01") is Png
+        True
+    """
+
+    def __init__(
+        self: "DataclassSelect[DataclassType]", *dc_types: t.Type[DataclassType]
+    ) -> None:
+        super().__init__()  # type: ignore
+        self._prefixes: t.Dict[bytes, "DataclassStruct[t.Any]"] = {}
+        self._lengths: t.List[int] = []
+        self._build_cases: t.Dict[t.Type[t.Any], "DataclassStruct[t.Any]"] = {}
+        for dc_type in dc_types:
+            self.register(dc_type)
+
+    def register(self, dc_type: t.Type[SelectType]) -> None:
+        """
+        Add a dataclass, which must begin with at least one Const field.
+        """
+        prefix = const_prefix(dc_type)
+        if not prefix:
+            raise ValueError(f"'{repr(dc_type)}' does not begin with a Const field")
+        other = self._prefixes.get(prefix)
+        if other is not None:
+            raise ValueError(
+                f"'{repr(dc_type)}' has the same prefix {prefix!r} as '{repr(other.dc_type)}'"
+            )
+        case = DataclassStruct(dc_type)  # type: ignore
+        self._prefixes[prefix] = case
+        self._build_cases[dc_type] = case
+        if len(prefix) not in self._lengths:
+            self._lengths.append(len(prefix))
+            self._lengths.sort(reverse=True)
+
+    def _lookup(self, head: bytes) -> t.Optional["DataclassStruct[t.Any]"]:
+        prefixes = self._prefixes
+        for length in self._lengths:
+            case = prefixes.get(head[:length])
+            if case is not None:
+                return case
+        return None
+
+    def recognize(self, data: bytes) -> t.Optional[t.Type[SelectType]]:
+        """
+        Get the dataclass type, whose prefix matches the beginning of the data, without parsing it.
+        """
+        case = self._lookup(bytes(data[: self._lengths[0]]) if self._lengths else b"")
+        return None if case is None else t.cast(t.Type[SelectType], case.dc_type)
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        if not self._lengths:
+            count_slow_path("select_error")
+            raise cs.SelectError("no dataclass is registered", path=path)
+        fallback = cs.stream_tell(stream, path)
+        head = stream.read(self._lengths[0])
+        cs.stream_seek(stream, fallback, 0, path)
+        case = self._lookup(head)
+        if case is None:
+            count_slow_path("select_error")
+            raise cs.SelectError(f"no prefix matches {bytes(head)!r}", path=path)
+        return case._parsereport(stream, context, path)  # type: ignore
+
+    def _build(self, obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        case = self._build_cases.get(type(obj))
+        if case is None:
+            count_slow_path("select_error")
+            raise cs.SelectError(f"no dataclass for type {type(obj)!r}", path=path)
+        return case._build(obj, stream, context, path)  # type: ignore
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        sizes = {case._sizeof(context, path) for case in self._prefixes.values()}  # type: ignore
+        if len(sizes) != 1:
+            raise cs.SizeofError("dataclasses have different sizes", path=path)
+        return sizes.pop()
@@ -1,18 +1,47 @@
 # -*- coding: utf-8 -*-
 # pyright: strict
+import copy
 import dataclasses
-import textwrap
+import io
+import sys
+import threading
 import typing as t
+import weakref
 
 import construct as cs
-from construct.lib.containers import (
-    globalPrintFullStrings,
-    globalPrintPrivateEntries,
-    recursion_lock,
-)
+from construct.expr import ExprMixin
+from construct.lib.containers import globalPrintFullStrings, globalPrintPrivateEntries
 from construct.lib.py3compat import bytestringtype, reprstring, unicodestringtype
 
-from .generic_wrapper import Adapter, Construct, Context, ParsedType, PathType
+from .generic_wrapper import Adapter, Construct, Context, ParsedType, PathType, emit_decode, emit_encode
+
+# The modules of the optional features are imported on demand, so that a plain DataclassStruct does not pay their
+# import time (see the lazy imports in "__init__.py").
+if t.TYPE_CHECKING:
+    from .bitfields import BitFieldStruct
+    from .zerocopy import ReadableBuffer
+
+# ids of the objects, whose "__str__" is running in the current thread
+_str_running = threading.local()
+
+
+def _recursion_guard(method: t.Callable[[t.Any], str]) -> t.Callable[[t.Any], str]:
+    """
+    Like "construct.lib.containers.recursion_lock", but the running objects are tracked per thread. Otherwise an
+    object, which is printed in two threads at the same time, is reported as recursion in one of them.
+    """
+
+    def wrapper(self: t.Any) -> str:
+        running: t.Set[int] = _str_running.__dict__.setdefault("ids", set())
+        if id(self) in running:
+            return "<recursion detected>"
+        running.add(id(self))
+        try:
+            return method(self)
+        finally:
+            running.discard(id(self))
+
+    return wrapper
 
 
 class DataclassMixin:
@@ -35,7 +64,7 @@ class DataclassMixin:
     def __setitem__(self, key: str, value: t.Any) -> None:
         setattr(self, key, value)
 
-    @recursion_lock()
+    @_recursion_guard
     def __str__(self) -> str:
         indentation = "\n    "
         text = [f"{self.__class__.__name__}: "]
@@ -79,17 +108,28 @@ def csfield(
     subcon: Construct[ParsedType, t.Any],
     doc: t.Optional[str] = None,
     parsed: t.Optional[t.Callable[[t.Any, Context], None]] = None,
+    lazy: bool = False,
 ) -> ParsedType:
     """
     Helper method for "DataclassStruct" and "DataclassBitStruct" to create the dataclass fields.
 
     This method also processes Const and Default, to pass these values als default values to the dataclass.
+
+    If "lazy" is set, only the raw bytes of the field are read while parsing. They are decoded on the first
+    access of the field (and then cached), and are written unchanged when building, if the field was never
+    accessed. See "LazyField" for details.
     """
     orig_subcon = subcon
+    if lazy:
+        from .lazy import LazyField
+
+        subcon = LazyField(subcon)
 
     # Rename subcon, if doc or parsed are available
     if (doc is not None) or (parsed is not None):
         if doc is not None:
+            import textwrap  # only needed for documented fields, so it is imported on demand
+
             doc = textwrap.dedent(doc).strip("\n")
         subcon = cs.Renamed(subcon, newdocs=doc, newparsed=parsed)
 
@@ -116,12 +156,258 @@ def csfield(
         dataclasses.field(
             default=default,
             init=init,
-            metadata={"subcon": subcon},
+            metadata={"subcon": subcon, "lazy": lazy},
         ),
     )
 
 
 DataclassType = t.TypeVar("DataclassType", bound=DataclassMixin)
+T = t.TypeVar("T")
+
+# maximum number of parent paths per field, for which the path of the field is cached
+_PATH_CACHE_SIZE = 64
+
+
+if t.TYPE_CHECKING:
+    _RenamedField = cs.Renamed[t.Any, t.Any]
+else:
+    _RenamedField = cs.Renamed  # not subscriptable at runtime
+
+
+class _StructField(_RenamedField):
+    """
+    Same as "Renamed" for a field of the Struct of a DataclassStruct, but the path of the field (eg. "(parsing) ->
+    header -> kind"), which is only used in error messages, is created once per parent path and then reused,
+    instead of being concatenated on every call. The parent paths are the same for every record, because they are
+    built by the fields of the enclosing DataclassStructs in the same way.
+
+    The this-expressions of the subcon are compiled into plain python functions (see "compile_expression") in a
+    copy of the subcon, which is used for parsing, building and sizeof. The subcon itself keeps the expressions,
+    because "compile()" emits their source code.
+    """
+
+    # The state derived from the schema is stored in slots instead of the instance dict, so that the walks over
+    # "vars()" of the constructs (eg. the fingerprint of "compile_cached" and "_uses_context") only see the schema.
+    __slots__ = ("paths", "evaluated")
+    paths: t.Dict[PathType, PathType]  # parent path -> path of the field
+    evaluated: Construct[t.Any, t.Any]  # subcon with the compiled expressions
+
+    def __init__(self, subcon: Construct[t.Any, t.Any], name: str) -> None:
+        super().__init__(subcon, newname=name)
+        self.paths = {}
+        self.evaluated = _compile_expressions(subcon, {})
+
+    def create_path(self, path: PathType) -> PathType:
+        field_path = f"{path} -> {self.name}"
+        if len(self.paths) < _PATH_CACHE_SIZE:
+            self.paths[path] = field_path
+        return field_path
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        field_path = self.paths.get(path) or self.create_path(path)
+        return self.evaluated._parsereport(stream, context, field_path)  # type: ignore
+
+    def _build(self, obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        field_path = self.paths.get(path) or self.create_path(path)
+        return self.evaluated._build(obj, stream, context, field_path)  # type: ignore
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        field_path = self.paths.get(path) or self.create_path(path)
+        return self.evaluated._sizeof(context, field_path)  # type: ignore
+
+
+class _RangeField(_StructField):
+    """
+    Field of the range of a "FieldChecksum", which stores its offsets in the stream in the context (see
+    "RangeOffsets").
+    """
+
+    def __init__(self, subcon: Construct[t.Any, t.Any], name: str) -> None:
+        from .checksum import RangeOffsets
+
+        super().__init__(subcon, name)
+        self.offsets = RangeOffsets(name)
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        return self.offsets.record(
+            stream, context, path, lambda: super(_RangeField, self)._parse(stream, context, path)
+        )
+
+    def _build(self, obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        return self.offsets.record(
+            stream, context, path, lambda: super(_RangeField, self)._build(obj, stream, context, path)
+        )
+
+    def _emitparse(self, code: t.Any) -> str:
+        code.linkedinstances[id(self.offsets)] = self.offsets
+        parse = self.subcon._compileparse(code)  # type: ignore
+        return f"linkedinstances[{id(self.offsets)}].record(io, this, '(???)', lambda: {parse})"
+
+    def _emitbuild(self, code: t.Any) -> str:
+        code.linkedinstances[id(self.offsets)] = self.offsets
+        build = self.subcon._compilebuild(code)  # type: ignore
+        return f"linkedinstances[{id(self.offsets)}].record(io, this, '(???)', lambda: {build})"
+
+
+def _range_fields(fields: t.Sequence["dataclasses.Field[t.Any]"]) -> t.Set[str]:
+    """
+    Names of the fields, which are in the range of a "FieldChecksum".
+    """
+    checksum = sys.modules.get(f"{__package__}.checksum")
+    if checksum is None:
+        return set()  # without the module, there is no "FieldChecksum"
+    FieldChecksum = checksum.FieldChecksum
+    names = [field.name for field in fields]
+    range_fields: t.Set[str] = set()
+    for index, field in enumerate(fields):
+        subcon = field.metadata["subcon"]
+        if not isinstance(subcon, FieldChecksum):
+            continue
+        for name in (subcon.start, subcon.end):
+            if name not in names[:index]:
+                raise ValueError(f"checksum field {field.name!r}: {name!r} is not a field before the checksum")
+        if names.index(subcon.start) > names.index(subcon.end):
+            raise ValueError(f"checksum field {field.name!r}: {subcon.start!r} is after {subcon.end!r}")
+        range_fields.update((subcon.start, subcon.end))
+    return range_fields
+
+
+def _compile_value(value: t.Any, memo: t.Dict[int, t.Any]) -> t.Any:
+    # the casts give the values narrowed by isinstance concrete type arguments for pyright (see "_uses_context")
+    if isinstance(value, ExprMixin):
+        from .expressions import compile_expression
+
+        expr = t.cast("ExprMixin[t.Any]", value)  # type: ignore[redundant-cast]
+        func = compile_expression(expr)
+        return expr if func is None else func
+    if isinstance(value, cs.Construct):
+        return _compile_expressions(t.cast(Construct[t.Any, t.Any], value), memo)  # type: ignore[redundant-cast]
+    if isinstance(value, (list, tuple)):
+        items = t.cast(t.Sequence[t.Any], value)
+        compiled = [_compile_value(v, memo) for v in items]
+        if all(c is v for c, v in zip(compiled, items)):
+            return items
+        return type(items)(compiled)  # type: ignore
+    if isinstance(value, dict):
+        entries = t.cast(t.Dict[t.Any, t.Any], value)  # type: ignore[redundant-cast]
+        compiled_entries = {k: _compile_value(v, memo) for k, v in entries.items()}
+        if all(compiled_entries[k] is v for k, v in entries.items()):
+            return entries
+        new_entries = copy.copy(entries)  # keeps the type, eg. "Container"
+        new_entries.update(compiled_entries)
+        return new_entries
+    return value
+
+
+def _compile_expressions(subcon: Construct[t.Any, t.Any], memo: t.Dict[int, t.Any]) -> Construct[t.Any, t.Any]:
+    """
+    Get a copy of a construct tree, in which the supported this-expressions are replaced by compiled functions.
+    Constructs without expressions are not copied. Nested DataclassStructs compile their own fields.
+    """
+    if id(subcon) in memo:
+        return t.cast(Construct[t.Any, t.Any], memo[id(subcon)])
+    memo[id(subcon)] = subcon
+    if isinstance(subcon, DataclassStruct):
+        return subcon
+    changes: t.Dict[str, t.Any] = {}
+    for name, value in vars(subcon).items():
+        if name.startswith("_emit"):
+            continue  # functions, which are only used for compiling
+        compiled = _compile_value(value, memo)
+        if compiled is not value:
+            changes[name] = compiled
+    if not changes:
+        return subcon
+    evaluated = copy.copy(subcon)
+    vars(evaluated).update(changes)
+    memo[id(subcon)] = evaluated
+    return evaluated
+
+
+# constructs of construct, which access the context without an expression or a function
+_CONTEXT_CONSTRUCTS: t.Tuple[t.Type[t.Any], ...] = (type(cs.Index), cs.Probe, cs.Debugger)
+# arrays store the index in the context, unless they are parsed in bulk (see "construct_typed.Array")
+_INDEXED_CONSTRUCTS: t.Tuple[t.Type[t.Any], ...] = (cs.Array, cs.GreedyRange, cs.RepeatUntil)
+# functions of constructs, which are called without the context
+_CONTEXT_FREE_FUNCTIONS = frozenset(("decodefunc", "encodefunc", "decoder", "encoder", "sizecomputer"))
+
+
+def _uses_context(value: t.Any, seen: t.Set[int]) -> bool:
+    """
+    Check if a construct (or an attribute of a construct) may need the context of the enclosing Struct, eg.
+    because of a this-expression, a lambda or a "parsed" hook. Unknown construct classes may use the context in
+    their methods, so only the classes of construct and construct_typed are analyzed.
+    """
+    if isinstance(value, ExprMixin):
+        return True
+    if value is None or isinstance(value, (bool, int, float, str, bytes, type)):
+        return False
+    if id(value) in seen:
+        return False
+    seen.add(id(value))
+
+    if isinstance(value, DataclassStruct):
+        return not value.context_free
+    # pyright narrows "Any" to unknown type arguments, which mypy already infers as "Any" (so the casts are redundant)
+    if isinstance(value, cs.Construct):
+        construct = t.cast(Construct[t.Any, t.Any], value)  # type: ignore[redundant-cast]
+        if not type(construct).__module__.startswith(("construct.", "construct_typed.")):
+            return True
+        if isinstance(construct, _CONTEXT_CONSTRUCTS):
+            return True
+        if isinstance(construct, _INDEXED_CONSTRUCTS) and getattr(construct, "_primitive", None) is None:
+            return True
+        for name, attr in vars(construct).items():
+            if name.startswith("_emit"):
+                continue  # functions, which are only used for compiling
+            if callable(attr) and not isinstance(attr, (type, cs.Construct, ExprMixin)):
+                if name in _CONTEXT_FREE_FUNCTIONS and isinstance(construct, (cs.Transformed, cs.Restreamed)):
+                    continue
+                return True
+            if _uses_context(attr, seen):
+                return True
+        return False
+    if isinstance(value, dict):
+        entries = t.cast(t.Dict[t.Any, t.Any], value)  # type: ignore[redundant-cast]
+        return any(_uses_context(v, seen) for v in entries.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = t.cast(t.Iterable[t.Any], value)
+        return any(_uses_context(v, seen) for v in items)
+    if dataclasses.is_dataclass(value):
+        return any(_uses_context(v, seen) for v in vars(value).values())
+    return False
+
+
+BuildValidation = t.Literal["all", "first"]
+
+# The shared DataclassStruct instances are stored in the dataclass itself, so that they are collected together with
+# the dataclass. The registry only holds weak references to the dataclasses, to find them in "clear_schema_cache".
+_SCHEMA_ATTR = "__construct_typed_schemas__"
+_schema_types: "weakref.WeakSet[t.Type[t.Any]]" = weakref.WeakSet()
+# guards the shared instances and their plans, which are created on demand in any thread (reentrant, because the
+# factories of plans use other plans)
+_schema_lock = threading.RLock()
+
+
+def clear_schema_cache() -> None:
+    """
+    Forget all shared DataclassStruct instances and their derived plans (eg. layouts, converters, compiled code).
+
+    Afterwards "DataclassStruct" creates new instances, eg. after the csfields of a dataclass were modified.
+    Existing instances stay usable.
+    """
+    with _schema_lock:
+        for dc_type in list(_schema_types):
+            if _SCHEMA_ATTR in vars(dc_type):
+                delattr(dc_type, _SCHEMA_ATTR)
+        _schema_types.clear()
+
+
+def _schema_key(reverse: bool = False, zerocopy: bool = False) -> t.Tuple[bool, bool]:
+    """
+    Binds the optional arguments of "DataclassStruct" like "__init__" does, to look up a shared instance.
+    """
+    return reverse, zerocopy
 
 
 class DataclassStruct(Adapter[t.Any, t.Any, DataclassType, DataclassType]):
@@ -132,10 +418,17 @@ class DataclassStruct(Adapter[t.Any, t.Any, DataclassType, DataclassType]):
 
     Internally, all fields are converted to a Struct, which does the actual parsing/building.
 
+    The instances are shared and immutable: Creating a DataclassStruct with the same arguments again returns the
+    same instance, which also holds all plans derived from the schema (eg. layouts, converters, compiled code).
+    See "clear_schema_cache" to forget them. So the same instance can parse/build in several threads at the same
+    time (eg. with a ThreadPoolExecutor): the plans are created once under a lock, and all other state of parsing
+    and building is local to the call.
+
     Parses to a dataclasses.dataclass instance, and builds from such instance. Size is the sum of all subcon sizes, unless any subcon raises SizeofError.
 
     :param dc_type: Type of the dataclass, which also inherits from DataclassMixin
     :param reverse: Flag if the fields of the dataclass should be reversed
+    :param zerocopy: Flag if Bytes and GreedyBytes fields should be parsed into memoryview slices of the input buffer instead of copies (see "detach")
 
     Example::
 
@@ -153,34 +446,275 @@ class DataclassStruct(Adapter[t.Any, t.Any, DataclassType, DataclassType]):
     """
 
     subcon: "cs.Struct" # type: ignore
+    def __new__(
+        cls,
+        dc_type: t.Type[DataclassType],
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> "DataclassStruct[DataclassType]":
+        if not isinstance(dc_type, type) or cls.__init__ is not DataclassStruct.__init__:  # type: ignore
+            # "__init__" raises the TypeError, or a subclass with an own "__init__" (with unknown arguments) is
+            # initialized as usual
+            return super().__new__(cls)
+        key = (cls, *_schema_key(*args, **kwargs))
+        schemas = vars(dc_type).get(_SCHEMA_ATTR)
+        if schemas is not None:
+            shared = schemas.get(key)
+            if shared is not None:
+                return t.cast("DataclassStruct[DataclassType]", shared)
+        with _schema_lock:
+            # the new instance is initialized under the lock, so that threads, which create the same DataclassStruct
+            # at the same time, get the same instance ("__init__" is skipped afterwards)
+            schemas = vars(dc_type).get(_SCHEMA_ATTR)
+            shared = None if schemas is None else schemas.get(key)
+            if shared is None:
+                shared = super().__new__(cls)
+                cls.__init__(shared, dc_type, *args, **kwargs)
+            return t.cast("DataclassStruct[DataclassType]", shared)
+
     def __init__(
         self,
         dc_type: t.Type[DataclassType],
         reverse: bool = False,
+        zerocopy: bool = False,
     ) -> None:
+        if "_plans" in self.__dict__:
+            return  # shared instance, which is already initialized
         if not issubclass(dc_type, DataclassMixin):  # type: ignore
             raise TypeError(f"'{repr(dc_type)}' has to be a '{repr(DataclassMixin)}'")
         if not dataclasses.is_dataclass(dc_type):
             raise TypeError(f"'{repr(dc_type)}' has to be a 'dataclasses.dataclass'")
         self.dc_type = dc_type
         self.reverse = reverse
+        self.zerocopy = zerocopy
 
         # get all fields from the dataclass
         fields = dataclasses.fields(self.dc_type)
         if self.reverse:
             fields = tuple(reversed(fields))
 
+        self._field_names = tuple(field.name for field in fields)
+
+        # install descriptors for the lazy fields, which decode the raw values on first access
+        self._lazy_fields = frozenset(
+            field.name for field in fields if field.metadata.get("lazy", False)
+        )
+        if self._lazy_fields:
+            from .lazy import LazyFieldDescriptor
+
+            for name in self._lazy_fields:
+                if not isinstance(vars(dc_type).get(name), LazyFieldDescriptor):
+                    if hasattr(dc_type, "__slots__"):
+                        raise TypeError(
+                            f"'{repr(dc_type)}' can not have lazy fields, because it uses '__slots__'"
+                        )
+                    setattr(dc_type, name, LazyFieldDescriptor(name))
+
         # extract the construct formats from the struct_type
-        subcon_fields = {}
+        range_fields = _range_fields(fields)
+        subcon_fields: t.List[_StructField] = []
         for field in fields:
-            subcon_fields[field.name] = field.metadata["subcon"]
+            subcon = field.metadata["subcon"]
+            if self.zerocopy:
+                from .zerocopy import zerocopy_subcon
+
+                subcon = zerocopy_subcon(subcon)
+            field_type = _RangeField if field.name in range_fields else _StructField
+            subcon_fields.append(field_type(subcon, field.name))
 
         # init adatper
-        super().__init__(cs.Struct(**subcon_fields))  # type: ignore
+        super().__init__(cs.Struct(*subcon_fields))  # type: ignore
+
+        # without any reference to the context, the fields are parsed/built without creating a context
+        self._context_free = not _uses_context(subcon_fields, set())
+
+        # share this instance, after it is completely initialized (other threads may get it immediately)
+        self._plans: t.Dict[t.Hashable, t.Any] = {}
+        with _schema_lock:
+            schemas = vars(dc_type).get(_SCHEMA_ATTR)
+            if schemas is None:
+                schemas = {}
+                setattr(dc_type, _SCHEMA_ATTR, schemas)
+                _schema_types.add(dc_type)
+            schemas[(type(self), reverse, zerocopy)] = self
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        if "_plans" in self.__dict__:
+            raise AttributeError(
+                f"'{type(self).__name__}' instances are shared and can not be modified"
+            )
+        super().__setattr__(name, value)
 
     def __getattr__(self, name: str) -> t.Any:
         return getattr(self.subcon, name)
 
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        return type(self), (self.dc_type, self.reverse, self.zerocopy)
+
+    def __copy__(self) -> "DataclassStruct[DataclassType]":
+        return self
+
+    def __deepcopy__(self, memo: t.Dict[int, t.Any]) -> "DataclassStruct[DataclassType]":
+        return self
+
+    @property
+    def context_free(self) -> bool:
+        """
+        True, if no field references the context (eg. with a this-expression or a lambda), so that the fields are
+        parsed and built without creating a context for the struct.
+        """
+        return self._context_free
+
+    def _plan(self, key: t.Hashable, factory: t.Callable[[], T]) -> T:
+        """
+        Get a plan derived from the schema (eg. a layout or a converter), which is created once with the factory.
+
+        Plans are looked up without a lock. Only the creation is serialized, so that every thread gets the same plan.
+        """
+        try:
+            return t.cast(T, self._plans[key])
+        except KeyError:
+            pass
+        with _schema_lock:
+            try:
+                return t.cast(T, self._plans[key])
+            except KeyError:
+                plan = self._plans[key] = factory()
+                return plan
+
+    def compile(self, filename: t.Any = None) -> Construct[DataclassType, DataclassType]:
+        from .metrics import count_compile_fallbacks
+
+        if filename is not None:
+            return count_compile_fallbacks(super().compile(filename))  # type: ignore
+        return self._plan("compiled", lambda: count_compile_fallbacks(super(DataclassStruct, self).compile()))  # type: ignore
+
+    def parse(self, data: "ReadableBuffer", **contextkw: t.Any) -> DataclassType:
+        if self.zerocopy:
+            from .zerocopy import BufferStream
+
+            # read directly from the buffer, so that bytes fields can reference it
+            stream = t.cast(t.IO[bytes], BufferStream(data))
+            return self.parse_stream(stream, **contextkw)
+        return super().parse(t.cast(bytes, data), **contextkw)
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> DataclassType:
+        if not self._context_free:
+            return super()._parse(stream, context, path)
+        # same as "Struct", but the fields get the context of the caller instead of a new one
+        obj: t.Dict[str, t.Any] = {}
+        try:
+            for sc in self.subcon.subcons:
+                obj[sc.name] = sc._parsereport(stream, context, path)  # type: ignore
+        except cs.StopFieldError:
+            pass
+        return self._decode(obj, context, path)  # type: ignore
+
+    def _build(self, obj: DataclassType, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        if not self._context_free:
+            return super()._build(obj, stream, context, path)
+        values = self._encode(obj, context, path)
+        for sc in self.subcon.subcons:
+            try:
+                subobj = values.get(sc.name) if sc.flagbuildnone else values[sc.name]  # type: ignore
+                sc._build(subobj, stream, context, path)  # type: ignore
+            except cs.StopFieldError:
+                break
+        return obj
+
+    def build_many(
+        self, objs: t.Iterable[DataclassType], validate: BuildValidation = "all", **contextkw: t.Any
+    ) -> bytes:
+        """
+        Build many objects into one bytes object (eg. for a bulk export), which is the same as joining the results
+        of "build" for every object.
+
+        With validate="all" every object is checked like in "build" (eg. that it is an instance of the dataclass and
+        that the values of "TEnum" fields are members of the enum), which is the mode for debugging. With
+        validate="first" only the first object is checked, and all other objects are trusted to have the same
+        types, so that the checks are skipped for the direct fields of the DataclassStruct and of nested
+        DataclassStructs. The values themselves are still checked by the subcons (eg. the range of integers).
+        Objects, which are built without checks, are not traced (see "add_trace_hook").
+
+        :param objs: instances of the dataclass
+        :param validate: "all" or "first"
+
+        :raises ValueError: unknown validate mode
+
+        Example::
+
+            >>> import dataclasses
+            >>> from construct import Int8ub
+            >>> from construct_typed import DataclassMixin, DataclassStruct, csfield
+            >>> @dataclasses.dataclass
+            ... class Image(DataclassMixin):
+            ...     width: int = csfield(Int8ub)
+            ...     height: int = csfield(Int8ub)
+            >>> DataclassStruct(Image).build_many([Image(1, 2), Image(3, 4)], validate="first")
+            b'\\x01\\x02\\x03\\x04'
+        """
+        if validate not in ("all", "first"):
+            raise ValueError(f"unknown validate mode {validate!r}, expected 'all' or 'first'")
+        stream = io.BytesIO()
+        objs = iter(objs)
+        if validate == "first":
+            for obj in objs:
+                self.build_stream(obj, stream, **contextkw)
+                break
+            # same context as in "build_stream", which is shared by the trusted objects
+            context: t.Any = cs.Container(**contextkw)
+            context._parsing = False
+            context._building = True
+            context._sizing = False
+            context._params = context
+            for obj in objs:
+                self._build_trusted(obj, stream, context, "(building)")
+        else:
+            for obj in objs:
+                self.build_stream(obj, stream, **contextkw)
+        return stream.getvalue()
+
+    def _build_trusted(self, obj: DataclassType, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        # same as "_build", but without checking the types of the object and of its fields
+        values = self._field_values(obj)
+        if not self._context_free:
+            self.subcon._build(values, stream, context, path)  # type: ignore
+            return obj
+        for name, build in self._plan("trusted_builders", self._trusted_builders):
+            try:
+                build(values[name], stream, context, path)
+            except cs.StopFieldError:
+                break
+        return obj
+
+    def _trusted_builders(self) -> t.List[t.Tuple[str, t.Callable[..., t.Any]]]:
+        fields: t.List[_StructField] = self.subcon.subcons  # type: ignore
+        return [(t.cast(str, sc.name), self._trusted_builder(sc)) for sc in fields]
+
+    def _trusted_builder(self, sc: _StructField) -> t.Callable[..., t.Any]:
+        """
+        Get the builder of a field for "_build_trusted", which skips the type checks of nested DataclassStructs and
+        enums.
+        """
+        field = sc.evaluated
+        if isinstance(field, DataclassStruct):
+            build_trusted = field._build_trusted
+
+            def build_struct(obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+                return build_trusted(obj, stream, context, sc.paths.get(path) or sc.create_path(path))
+
+            return build_struct
+        from .tenum import TEnum, TFlagsEnum
+
+        if type(field) in (TEnum, TFlagsEnum):
+            subcon: t.Any = getattr(field, "subcon")
+
+            def build_enum(obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+                return subcon._build(int(obj), stream, context, sc.paths.get(path) or sc.create_path(path))
+
+            return build_enum
+        return sc._build  # type: ignore
+
     def _decode(
         self, obj: "cs.Container[t.Any]", context: Context, path: PathType
     ) -> DataclassType:
@@ -210,17 +744,25 @@ class DataclassStruct(Adapter[t.Any, t.Any, DataclassType, DataclassType]):
     ) -> t.Dict[str, t.Any]:
         if not isinstance(obj, self.dc_type):
             raise TypeError(f"'{repr(obj)}' has to be of type {repr(self.dc_type)}")
+        return self._field_values(obj)
 
-        # get all fields from the dataclass
-        fields = dataclasses.fields(self.dc_type)
+    def _emitparse(self, code: t.Any) -> str:
+        return emit_decode(self, code)
 
-        # extract all fields from the container, that are used for create the dataclass object
-        ret_dict: t.Dict[str, t.Any] = {}
-        for field in fields:
-            value = getattr(obj, field.name)
-            ret_dict[field.name] = value
+    def _emitbuild(self, code: t.Any) -> str:
+        return emit_encode(self, code)
 
-        return ret_dict
+    def _field_values(self, obj: DataclassType) -> t.Dict[str, t.Any]:
+        # extract all fields from the dataclass object
+        if not self._lazy_fields:
+            return {name: getattr(obj, name) for name in self._field_names}
+        # pass lazy values, that were never accessed, undecoded to the LazyField
+        from .lazy import raw_field_value
+
+        return {
+            name: raw_field_value(obj, name) if name in self._lazy_fields else getattr(obj, name)
+            for name in self._field_names
+        }
 
 
 def DataclassBitStruct(
@@ -228,10 +770,14 @@ def DataclassBitStruct(
 ) -> t.Union[
     "cs.Transformed[DataclassType, DataclassType]",
     "cs.Restreamed[DataclassType, DataclassType]",
+    "BitFieldStruct[DataclassType]",
 ]:
     r"""
     Makes a DataclassStruct inside a Bitwise.
 
+    If all fields have a static bit layout (see "bit_layout"), the record is not restreamed bit by bit. Instead it
+    is read once as an integer, and the fields are extracted with shifts and masks (see "BitFieldStruct").
+
     See :class:`~construct.core.Bitwise` and :class:`~construct_typed.dataclass_struct.DatclassStruct` for semantics and raisable exceptions.
 
     :param dc_type: Type of the dataclass, which also inherits from DataclassMixin
@@ -253,7 +799,24 @@ def DataclassBitStruct(
         >>> d.parse(b"\x01\x02")
         TestDataclass(a=False, b=0, c=129, d=None)
     """
-    return cs.Bitwise(DataclassStruct(dc_type, reverse))
+    struct = DataclassStruct(dc_type, reverse)
+
+    def factory() -> t.Union[
+        "cs.Transformed[DataclassType, DataclassType]",
+        "cs.Restreamed[DataclassType, DataclassType]",
+        "BitFieldStruct[DataclassType]",
+    ]:
+        from .bitfields import BitFieldStruct, bit_layout
+        from .metrics import count_slow_path
+
+        layout = bit_layout(struct)
+        if layout is None:
+            count_slow_path("bitstruct_restream")
+            return cs.Bitwise(struct)
+        return BitFieldStruct(struct, layout)
+
+    # the bitwise variant is cached with the other plans of the shared struct, which are internal to this module
+    return struct._plan("bitwise", factory)  # pyright: ignore[reportPrivateUsage]
 
 
 # support legacy names
@@ -0,0 +1,195 @@
+import dataclasses
+import typing as t
+
+import construct as cs
+
+from .dataclass_struct import DataclassStruct, DataclassType
+from .generic_wrapper import Construct, Context, PathType
+from .metrics import count_slow_path
+
+TagType = t.TypeVar("TagType")
+SwitchType = t.TypeVar("SwitchType")
+
+
+@dataclasses.dataclass
+class UnknownCase:
+    """
+    Parsed value of a "DataclassSwitch" for a tag, which has no case. The value is parsed with the default construct.
+    """
+
+    tag: t.Any
+    value: t.Any
+
+
+class DataclassSwitch(Construct[SwitchType, SwitchType]):
+    r"""
+    Typed dispatch from a tag (eg. a TEnum) to dataclasses, which are parsed/built with "DataclassStruct".
+
+    In comparison to "construct.Switch" the tag is not part of the dataclasses. When parsing, the tag is parsed
+    first, and the case is selected with a single dict lookup. When building, the case (and so the tag) is
+    selected by the type of the object. In comparison to "construct.Select" no alternatives are tried.
+
+    Tags without a case are parsed with the default construct into an "UnknownCase" instance, which can also be
+    built again. Without a default construct, a SwitchError is raised.
+
+    :param tag: construct of the tag, eg. a TEnum
+    :param cases: dict of tag values to dataclass types
+    :param default: optional construct for the data of unknown tags, eg. GreedyBytes
+
+    :raises SwitchError: the tag has no case and there is no default, or the type of the object has no case
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Int8ub
+        >>> from construct_typed import DataclassMixin, DataclassSwitch, EnumBase, TEnum, csfield
+        >>> class MsgType(EnumBase):
+        ...     Ping = 1
+        ...     Data = 2
+        >>> @dataclasses.dataclass
+        ... class Ping(DataclassMixin):
+        ...     seq: int = csfield(Int8ub)
+        >>> @dataclasses.dataclass
+        ... class Data(DataclassMixin):
+        ...     value: int = csfield(Int8ub)
+        >>> d = DataclassSwitch(TEnum(Int8ub, MsgType), {MsgType.Ping: Ping, MsgType.Data: Data})
+        >>> d.parse(b"\x02\x05")
+        Data(value=5)
+        >>> d.build(Ping(seq=3))
+        b'\x01\x03'
+    """
+
+    @t.overload
+    def __init__(
+        self: "DataclassSwitch[DataclassType]",
+        tag: Construct[TagType, TagType],
+        cases: t.Mapping[TagType, t.Type[DataclassType]],
+        default: None = None,
+    ) -> None:
+        ...
+
+    @t.overload
+    def __init__(
+        self: "DataclassSwitch[t.Union[DataclassType, UnknownCase]]",
+        tag: Construct[TagType, TagType],
+        cases: t.Mapping[TagType, t.Type[DataclassType]],
+        default: Construct[t.Any, t.Any],
+    ) -> None:
+        ...
+
+    def __init__(
+        self,
+        tag: Construct[t.Any, t.Any],
+        cases: t.Mapping[t.Any, t.Type[t.Any]],
+        default: t.Optional[Construct[t.Any, t.Any]] = None,
+    ) -> None:
+        super().__init__()  # type: ignore
+        self.tag = tag
+        self.default = default
+        self.cases: t.Dict[t.Any, "DataclassStruct[t.Any]"] = {}
+        self._build_cases: t.Dict[t.Type[t.Any], t.Tuple[t.Any, "DataclassStruct[t.Any]"]] = {}
+        for key, dc_type in cases.items():
+            if dc_type in self._build_cases:
+                raise ValueError(
+                    f"'{repr(dc_type)}' is used for multiple tags, so the tag for building is ambiguous"
+                )
+            case = DataclassStruct(dc_type)
+            self.cases[key] = case
+            self._build_cases[dc_type] = (key, case)
+
+    def _find_build_case(
+        self, obj: t.Any
+    ) -> t.Optional[t.Tuple[t.Any, "DataclassStruct[t.Any]"]]:
+        build_case = self._build_cases.get(type(obj))
+        if build_case is None:
+            # instances of derived dataclasses
+            count_slow_path("switch_subclass_lookup")
+            for base in type(obj).__mro__[1:]:
+                build_case = self._build_cases.get(base)
+                if build_case is not None:
+                    break
+        return build_case
+
+    def _parse_unknown(self, tag: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        if self.default is None:
+            count_slow_path("switch_error")
+            raise cs.SwitchError(f"no case for tag {tag!r}", path=path)
+        count_slow_path("switch_default")
+        value = self.default._parsereport(stream, context, path)  # type: ignore
+        return UnknownCase(tag, value)
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        tag = self.tag._parsereport(stream, context, path)  # type: ignore
+        case = self.cases.get(tag)
+        if case is None:
+            return self._parse_unknown(tag, stream, context, path)
+        return case._parsereport(stream, context, path)  # type: ignore
+
+    def _build(self, obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        build_case = self._find_build_case(obj)
+        if build_case is not None:
+            tag, case = build_case
+            self.tag._build(tag, stream, context, path)  # type: ignore
+            return case._build(obj, stream, context, path)  # type: ignore
+        if isinstance(obj, UnknownCase) and self.default is not None:
+            self.tag._build(obj.tag, stream, context, path)  # type: ignore
+            self.default._build(obj.value, stream, context, path)  # type: ignore
+            return obj
+        count_slow_path("switch_error")
+        raise cs.SwitchError(f"no case for type {type(obj)!r}", path=path)
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        sizes = {case._sizeof(context, path) for case in self.cases.values()}  # type: ignore
+        if self.default is not None:
+            sizes.add(self.default._sizeof(context, path))  # type: ignore
+        if len(sizes) != 1:
+            raise cs.SizeofError("cases have different sizes", path=path)
+        return self.tag._sizeof(context, path) + sizes.pop()  # type: ignore
+
+    def _check_compilable(self, code: t.Any) -> None:
+        # the tags are emitted as int literals
+        if not all(isinstance(key, int) for key in self.cases):
+            raise NotImplementedError
+        self._compileinstance(code)  # type: ignore
+
+    def _emitparse(self, code: t.Any) -> str:
+        self._check_compilable(code)
+        cases = f"dispatch_cases_{code.allocateId()}"
+        code.append(f"{cases} = {{}}")
+        for key, case in self.cases.items():
+            parse_case = case._compileparse(code)  # type: ignore
+            code.append(f"{cases}[{int(key)!r}] = lambda io,this: {parse_case}")
+        parse_tag = self.tag._compileparse(code)  # type: ignore
+        fname = f"parse_dispatch_{code.allocateId()}"
+        code.append(
+            f"""
+            def {fname}(io, this):
+                tag = {parse_tag}
+                case = {cases}.get(tag)
+                if case is None:
+                    return linkedinstances[{id(self)}]._parse_unknown(tag, io, this, '(???)')
+                return case(io, this)
+            """
+        )
+        return f"{fname}(io, this)"
+
+    def _emitbuild(self, code: t.Any) -> str:
+        self._check_compilable(code)
+        cases = f"dispatch_cases_{code.allocateId()}"
+        code.append(f"{cases} = {{}}")
+        for key, case in self.cases.items():
+            build_case = case._compilebuild(code)  # type: ignore
+            code.append(f"{cases}[{int(key)!r}] = lambda obj,io,this: {build_case}")
+        build_tag = self.tag._compilebuild(code)  # type: ignore
+        fname = f"build_dispatch_{code.allocateId()}"
+        code.append(
+            f"""
+            def {fname}(obj, io, this):
+                build_case = linkedinstances[{id(self)}]._build_cases.get(type(obj))
+                if build_case is None:
+                    return linkedinstances[{id(self)}]._build(obj, io, this, '(???)')
+                (lambda obj: {build_tag})(build_case[0])
+                return {cases}[int(build_case[0])](obj, io, this)
+            """
+        )
+        return f"{fname}(obj, io, this)"
@@ -0,0 +1,121 @@
+import operator
+import typing as t
+
+from construct.expr import BinExpr, ExprMixin, FuncPath, Path, UniExpr
+
+# python syntax of the operators of "ExprMixin" (see "scripts/expr_mixin_generator.py")
+_BINARY_OPERATORS: t.Dict[t.Callable[[t.Any, t.Any], t.Any], str] = {
+    operator.add: "({} + {})",
+    operator.sub: "({} - {})",
+    operator.mul: "({} * {})",
+    operator.truediv: "({} / {})",
+    operator.floordiv: "({} // {})",
+    operator.mod: "({} % {})",
+    operator.pow: "({} ** {})",
+    operator.xor: "({} ^ {})",
+    operator.lshift: "({} << {})",
+    operator.rshift: "({} >> {})",
+    operator.and_: "({} & {})",
+    operator.or_: "({} | {})",
+    operator.contains: "({1} in {0})",  # operator.contains(a, b) is "b in a"
+    operator.gt: "({} > {})",
+    operator.ge: "({} >= {})",
+    operator.lt: "({} < {})",
+    operator.le: "({} <= {})",
+    operator.eq: "({} == {})",
+    operator.ne: "({} != {})",
+}
+_UNARY_OPERATORS: t.Dict[t.Callable[[t.Any], t.Any], str] = {
+    operator.neg: "(-{})",
+    operator.pos: "(+{})",
+    operator.not_: "(not {})",
+}
+_LITERAL_TYPES = (bool, int, float, str, bytes, type(None))
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class _ExprTranslator:
+    """
+    Translates an expression tree into the source of a python expression, which uses "this" for the context.
+    Objects, which can not be written as literals, are passed as names in the namespace.
+    """
+
+    def __init__(self) -> None:
+        self.namespace: t.Dict[str, t.Any] = {}
+
+    def constant(self, value: t.Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def translate(self, expr: t.Any) -> str:
+        if isinstance(expr, ExprMixin):
+            return self.translate_expr(expr)
+        if callable(expr):
+            # operands, which are callable, are called with the context (eg. a lambda)
+            return f"{self.constant(expr)}(this)"
+        if type(expr) in _LITERAL_TYPES:
+            return repr(expr)
+        return self.constant(expr)
+
+    def translate_expr(self, expr: "ExprMixin[t.Any]") -> str:
+        if type(expr) is BinExpr:
+            template = _BINARY_OPERATORS.get(expr.op)
+            if template is None:
+                raise _Unsupported(expr)
+            return template.format(self.translate(expr.lhs), self.translate(expr.rhs))
+        if type(expr) is UniExpr:
+            template = _UNARY_OPERATORS.get(expr.op)
+            if template is None:
+                raise _Unsupported(expr)
+            return template.format(self.translate(expr.operand))
+        if type(expr) is Path:
+            name: str = expr._Path__name  # type: ignore
+            field = expr._Path__field  # type: ignore
+            parent = expr._Path__parent  # type: ignore
+            if parent is None:
+                if name != "this":
+                    raise _Unsupported(expr)  # eg. "obj_", which is called with other arguments
+                return "this"
+            if not isinstance(field, (str, int)):
+                raise _Unsupported(expr)
+            return f"{self.translate_expr(parent)}[{field!r}]"
+        if type(expr) is FuncPath:
+            func = expr._FuncPath__func  # type: ignore
+            operand = expr._FuncPath__operand  # type: ignore
+            if operand is None:
+                raise _Unsupported(expr)  # "len_" without operand returns a new FuncPath
+            return f"{self.constant(func)}({self.translate(operand)})"
+        raise _Unsupported(expr)
+
+
+def compile_expression(expr: t.Any) -> t.Optional[t.Callable[..., t.Any]]:
+    """
+    Translate a this-expression (eg. "this.width * this.height" or "len_(this.items)") into a plain python
+    function, which returns the same result for a context, or None if the expression is not supported.
+
+    The expression tree is evaluated with one method call per node, while the function evaluates the same
+    operations in a single flat python expression. Supported are all operators of "ExprMixin", paths of "this"
+    (also of parent contexts like "this._.length"), "len_", "sum_", "min_", "max_", "abs_" and constants.
+
+    :param expr: expression of "construct.expr"
+
+    Example::
+
+        >>> from construct import Container, this
+        >>> from construct_typed import compile_expression
+        >>> func = compile_expression(this.width * this.height + 1)
+        >>> func(Container(width=2, height=3))
+        7
+    """
+    translator = _ExprTranslator()
+    try:
+        source = translator.translate_expr(expr)
+    except _Unsupported:
+        return None
+    # further arguments are ignored, like "ExprMixin.__call__" does (eg. for the predicate of RepeatUntil)
+    func: t.Callable[..., t.Any] = eval(f"lambda this, *args: {source}", translator.namespace)
+    return func
@@ -17,32 +17,131 @@ if t.TYPE_CHECKING:
     from construct import ListContainer as ListContainer
     from construct import PathType as PathType
     from construct import Array as Array
+    from construct import GreedyRange as GreedyRange
 
 
 else:
+    import struct
+    import types
+
     import construct as cs
 
-    # at runtime, the original classes are no generics, so whe have to make new classes with generics support
-    class Construct(t.Generic[ParsedType, BuildTypes], cs.Construct):
-        pass
+    # At runtime, the original classes are no generics, so we have to make new classes with generics support. To
+    # keep them as fast as the original classes, they do not derive from "t.Generic" (which adds MRO entries and
+    # "__init_subclass__" work). Only subscripting is supported via "__class_getitem__", like for the builtin
+    # generic types (eg. "list[int]").
+    class Construct(cs.Construct):
+        __class_getitem__ = classmethod(types.GenericAlias)
 
-    class Adapter(
-        t.Generic[SubconParsedType, SubconBuildTypes, ParsedType, BuildTypes],
-        cs.Adapter,
-    ):
-        pass
+    class Adapter(cs.Adapter):
+        __class_getitem__ = classmethod(types.GenericAlias)
 
-    class ListContainer(t.Generic[ListType], cs.ListContainer):
-        pass
+    # "cs.ListContainer" derives from "list", which already supports subscripting. So the original class is used.
+    ListContainer = cs.ListContainer
 
     class Context:
         pass
 
-    class Array(
-        t.Generic[SubconParsedType, SubconBuildTypes],
-        cs.Array,
-    ):
-        pass
+    # Arrays of primitive fixed-width elements (eg. Int16ul) are parsed/built with a single read/write and a single
+    # "struct" call with a count format (eg. "<4096H"), instead of one per element.
+    class Array(cs.Array):
+        __class_getitem__ = classmethod(types.GenericAlias)
+
+        def __init__(self, count, subcon, discard=False):
+            super().__init__(count, subcon, discard)
+            from .numeric_array import primitive_format  # not at the top, because it imports this module
+
+            self._primitive = None if discard else primitive_format(subcon)
+
+        def _parse(self, stream, context, path):
+            if self._primitive is None:
+                return super()._parse(stream, context, path)
+            count = cs.evaluate(self.count, context)
+            if not 0 <= count:
+                raise cs.RangeError("invalid count %s" % (count,), path=path)
+            byteorder, format, size = self._primitive
+            data = cs.stream_read(stream, count * size, path)
+            return cs.ListContainer(struct.unpack(f"{byteorder}{count}{format}", data))
+
+        def _build(self, obj, stream, context, path):
+            if self._primitive is None:
+                return super()._build(obj, stream, context, path)
+            count = cs.evaluate(self.count, context)
+            if not 0 <= count:
+                raise cs.RangeError("invalid count %s" % (count,), path=path)
+            if not len(obj) == count:
+                raise cs.RangeError("expected %d elements, found %d" % (count, len(obj)), path=path)
+            byteorder, format, size = self._primitive
+            try:
+                data = struct.pack(f"{byteorder}{count}{format}", *obj)
+            except Exception:
+                raise cs.FormatFieldError(
+                    "struct %r error during building, given value %r" % (byteorder + format, obj), path=path
+                )
+            cs.stream_write(stream, data, count * size, path)
+            return cs.ListContainer(obj)
+
+        def _emitparse(self, code):
+            if self._primitive is None:
+                return super()._emitparse(code)
+            byteorder, format, size = self._primitive
+            return f"ListContainer(struct.unpack('{byteorder}%d{format}' % ({self.count}), io.read(({self.count}) * {size})))"
+
+        def _emitbuild(self, code):
+            if self._primitive is None:
+                return super()._emitbuild(code)
+            byteorder, format, _ = self._primitive
+            return f"(io.write(struct.pack('{byteorder}%d{format}' % ({self.count}), *obj)), ListContainer(obj))[1]"
+
+    # Same bulk path as in "Array" for primitive elements. The count is computed from the remaining bytes.
+    class GreedyRange(cs.GreedyRange):
+        __class_getitem__ = classmethod(types.GenericAlias)
+
+        def __init__(self, subcon, discard=False):
+            super().__init__(subcon, discard)
+            from .numeric_array import primitive_format  # not at the top, because it imports this module
+
+            self._primitive = None if discard else primitive_format(subcon)
+
+        def _parse(self, stream, context, path):
+            if self._primitive is None:
+                return super()._parse(stream, context, path)
+            byteorder, format, size = self._primitive
+            data = cs.stream_read_entire(stream, path)
+            count, rest = divmod(len(data), size)
+            if rest:
+                # like the element wise parsing, the stream is placed after the last complete element
+                cs.stream_seek(stream, -rest, 1, path)
+            return cs.ListContainer(struct.unpack_from(f"{byteorder}{count}{format}", data))
+
+        def _build(self, obj, stream, context, path):
+            if self._primitive is None:
+                return super()._build(obj, stream, context, path)
+            byteorder, format, size = self._primitive
+            try:
+                data = struct.pack(f"{byteorder}{len(obj)}{format}", *obj)
+            except Exception:
+                raise cs.FormatFieldError(
+                    "struct %r error during building, given value %r" % (byteorder + format, obj), path=path
+                )
+            cs.stream_write(stream, data, len(data), path)
+            return cs.ListContainer(obj)
 
     ConstantOrContextLambda = t.Union[ValueType, t.Callable[[Context], t.Any]]
     PathType = str
+
+
+# The typed adapters (eg. "TEnum") only call "_decode"/"_encode" around their subcon, so they can be compiled by
+# emitting the subcon as code and calling "_decode"/"_encode" of the linked instance around it. This is not done for
+# every "Adapter", because subclasses of the user may override "_parse"/"_build" as well. Those are linked as a whole
+# (the default of construct).
+def emit_decode(adapter: t.Any, code: t.Any) -> str:
+    parse = adapter.subcon._compileparse(code)
+    adapter._compileinstance(code)
+    return f"linkedinstances[{id(adapter)}]._decode({parse}, this, '(???)')"
+
+
+def emit_encode(adapter: t.Any, code: t.Any) -> str:
+    build = adapter.subcon._compilebuild(code)
+    adapter._compileinstance(code)
+    return f"(reuse(linkedinstances[{id(adapter)}]._encode(obj, this, '(???)'), lambda obj: {build}), obj)[1]"
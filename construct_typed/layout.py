@@ -0,0 +1,196 @@
+import dataclasses
+import mmap
+import sys
+import typing as t
+
+import construct as cs
+
+from .dataclass_struct import DataclassStruct, _uses_context
+from .generic_wrapper import Construct
+
+WritableBuffer = t.Union[bytearray, memoryview, mmap.mmap]
+
+
+@dataclasses.dataclass(frozen=True)
+class FieldLayout:
+    """
+    Static position of a field inside of a serialized DataclassStruct record.
+    """
+
+    name: str
+    offset: int
+    size: int
+    subcon: Construct[t.Any, t.Any]
+
+
+def static_layout(format: "DataclassStruct[t.Any]") -> t.Dict[str, FieldLayout]:
+    """
+    Get the static layout of a DataclassStruct, which is computed once and then cached.
+
+    The layout contains all fields, whose offset and size can be determined without parsing (and without a
+    context). These are all fields up to the first field with a variable size. Fields after that are not
+    contained in the layout.
+
+    :param format: DataclassStruct instance
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Bytes, Int8ub, Int16ub, this
+        >>> from construct_typed import DataclassMixin, DataclassStruct, csfield, static_layout
+        >>> @dataclasses.dataclass
+        ... class Frame(DataclassMixin):
+        ...     seq: int = csfield(Int16ub)
+        ...     length: int = csfield(Int8ub)
+        ...     data: bytes = csfield(Bytes(this.length))
+        >>> list(static_layout(DataclassStruct(Frame)))
+        ['seq', 'length']
+    """
+    if not isinstance(format, DataclassStruct):  # type: ignore
+        raise TypeError(f"'{repr(format)}' has to be a '{repr(DataclassStruct)}'")
+
+    def factory() -> t.Dict[str, FieldLayout]:
+        layout: t.Dict[str, FieldLayout] = {}
+        offset = 0
+        for sc in format.subcon.subcons:
+            try:
+                size = sc.sizeof()
+            except cs.SizeofError:
+                break
+            if sc.name is not None:
+                layout[sc.name] = FieldLayout(sc.name, offset, size, sc)
+            offset += size
+        return layout
+
+    return format._plan("static_layout", factory)
+
+
+def patch_field(
+    format: "DataclassStruct[t.Any]",
+    buffer: WritableBuffer,
+    name: str,
+    value: t.Any,
+    offset: int = 0,
+) -> None:
+    r"""
+    Rewrite a single field of an already serialized record in place, without parsing and rebuilding the whole record.
+
+    Only fields with a static offset and size (see "static_layout") can be patched. The new value is built with
+    the subcon of the field (without the context of the record, so fields which need it can not be patched) and
+    must result in exactly the same size as the field. The "FieldChecksum" fields, whose range contains the field,
+    are calculated again and patched too (also checksums over these checksums), so they must have a static offset
+    and size as well as all fields of their ranges.
+
+    :param format: DataclassStruct instance, which describes the record
+    :param buffer: writable buffer, eg. bytearray, mmap or a writable memoryview, which holds the record
+    :param name: name of the field
+    :param value: new value of the field
+    :param offset: offset of the record in the buffer
+
+    :raises KeyError: the dataclass has no field with this name
+    :raises SizeofError: the field (or a checksum over it, or a field of its range) has no static offset or size, or the built value has another size
+    :raises StreamError: the buffer is too short for the record
+    :raises ConstructError: the field needs the context of the record to be built
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Int8ub, Int16ub
+        >>> from construct_typed import DataclassMixin, DataclassStruct, csfield, patch_field
+        >>> @dataclasses.dataclass
+        ... class Frame(DataclassMixin):
+        ...     seq: int = csfield(Int16ub)
+        ...     value: int = csfield(Int8ub)
+        >>> buffer = bytearray(b"\x00\x01\x02")
+        >>> patch_field(DataclassStruct(Frame), buffer, "seq", 258)
+        >>> buffer
+        bytearray(b'\x01\x02\x02')
+    """
+    layout = static_layout(format)
+    field = layout.get(name)
+    if field is None:
+        if name not in format.dc_type.__dataclass_fields__:
+            raise KeyError(name)
+        raise cs.SizeofError(f"field '{name}' has no static offset and size")
+    if _uses_context(field.subcon, set()):
+        raise cs.ConstructError(f"field '{name}' needs the context of the record to be built, so it can not be patched")
+
+    data = field.subcon.build(value)
+    if len(data) != field.size:
+        raise cs.SizeofError(
+            f"field '{name}' has a size of {field.size}, but the new value was built to {len(data)} bytes"
+        )
+    patches = [(field, data)]
+
+    # the checksums over the patched fields are calculated again, on a copy of the affected bytes of the record
+    checksums = _covering_checksums(format, name)
+    if checksums:
+        fields = [layout[checksum_name] for checksum_name, _, _ in checksums]
+        fields.extend(layout[range_name] for _, _, range_names in checksums for range_name in range_names)
+        fields.append(field)
+        base = min(f.offset for f in fields)
+        record = bytearray(_record_slice(buffer, offset, base, max(f.offset + f.size for f in fields), name))
+        record[field.offset - base : field.offset - base + field.size] = data
+        for checksum_name, checksum, range_names in checksums:
+            start = layout[range_names[0]].offset - base
+            end = layout[range_names[-1]].offset + layout[range_names[-1]].size - base
+            checksum_field = layout[checksum_name]
+            checksum_data = checksum.subcon.build(checksum.compute([record[start:end]]))
+            if len(checksum_data) != checksum_field.size:
+                raise cs.SizeofError(
+                    f"checksum field '{checksum_name}' has a size of {checksum_field.size}, but the checksum was "
+                    f"built to {len(checksum_data)} bytes"
+                )
+            record[checksum_field.offset - base : checksum_field.offset - base + checksum_field.size] = checksum_data
+            patches.append((checksum_field, checksum_data))
+
+    for patched, patch in patches:
+        start = offset + patched.offset
+        _record_slice(buffer, offset, patched.offset, patched.offset + patched.size, patched.name)
+        buffer[start : start + patched.size] = patch
+
+
+def _record_slice(buffer: WritableBuffer, offset: int, start: int, end: int, name: str) -> bytes:
+    start += offset
+    end += offset
+    if start < 0 or end > len(buffer):
+        raise cs.StreamError(
+            f"buffer of length {len(buffer)} is too short for field '{name}' at offset {start}"
+        )
+    return bytes(buffer[start:end])
+
+
+def _covering_checksums(
+    format: "DataclassStruct[t.Any]", name: str
+) -> t.List[t.Tuple[str, t.Any, t.List[str]]]:
+    """
+    The "FieldChecksum" fields (name, checksum, names of the fields of the range), whose range contains the field
+    or another of these checksum fields, in the order of the record. All of them must have a static layout.
+    """
+    checksum_module = sys.modules.get(f"{__package__}.checksum")
+    if checksum_module is None:
+        return []  # without the module, there is no "FieldChecksum"
+    FieldChecksum = checksum_module.FieldChecksum
+    layout = static_layout(format)
+    fields = dataclasses.fields(format.dc_type)
+    if format.reverse:
+        fields = tuple(reversed(fields))
+    names = [field.name for field in fields]
+    changed = {name}
+    checksums: t.List[t.Tuple[str, t.Any, t.List[str]]] = []
+    for field in fields:
+        checksum = field.metadata["subcon"]
+        if not isinstance(checksum, FieldChecksum):
+            continue
+        range_names = names[names.index(checksum.start) : names.index(checksum.end) + 1]
+        if changed.isdisjoint(range_names):
+            continue
+        for needed in [field.name, *range_names]:
+            if needed not in layout:
+                raise cs.SizeofError(
+                    f"checksum field '{field.name}' over field '{name}' can not be updated, because field "
+                    f"'{needed}' has no static offset and size"
+                )
+        checksums.append((field.name, checksum, range_names))
+        changed.add(field.name)
+    return checksums
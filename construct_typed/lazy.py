@@ -0,0 +1,166 @@
+import io
+import typing as t
+
+import construct as cs
+
+from .generic_wrapper import Construct, Context, ParsedType, PathType
+from .metrics import count_slow_path
+from .zerocopy import BufferStream, _stream_readview, _stream_writeview
+
+
+class LazyValue:
+    """
+    Raw bytes of a lazy field, which are decoded on first access.
+
+    Instances of this class are stored in the dataclass instance (in its "__dict__") until the field is accessed
+    the first time. Then the raw bytes are decoded with the subcon of the field and the result replaces this
+    object. A copy of the context of the field is kept for decoding, without the stream and without the values,
+    if the subcon does not need them (see "_trim_context").
+    """
+
+    __slots__ = ("subcon", "raw", "context", "path")
+
+    def __init__(
+        self,
+        subcon: Construct[t.Any, t.Any],
+        raw: t.Union[bytes, memoryview],
+        context: Context,
+        path: PathType,
+    ) -> None:
+        self.subcon = subcon
+        self.raw = raw
+        self.context = context
+        self.path = path
+
+    def decode(self) -> t.Any:
+        raw = self.raw
+        stream = BufferStream(raw) if isinstance(raw, memoryview) else io.BytesIO(raw)
+        return self.subcon._parsereport(stream, self.context, self.path)  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"<LazyValue {bytes(self.raw)!r}>"
+
+
+_CONTEXT_FLAGS = ("_params", "_parsing", "_building", "_sizing", "_index")
+
+
+def _trim_context(context: Context, values: bool) -> Context:
+    """
+    Copy of the context of a lazy field, which does not reference the input stream ("_io", also of nested
+    Containers of parsed values), so that an undecoded field does not keep the input buffer alive. Without
+    values only the flags of the context are kept (eg. "_params"). The parent contexts are copied the same way,
+    and "_root" is set like "Struct" does.
+    """
+    trimmed: "cs.Container[t.Any]" = cs.Container()
+    for key, value in context.items():
+        if key in ("_io", "_root") or not (values or key in _CONTEXT_FLAGS or key == "_"):
+            continue
+        if isinstance(value, cs.Container) and key != "_params":
+            value = _trim_context(t.cast(Context, value), values or key != "_")
+        trimmed[key] = value
+    if "_root" in context:
+        parent = trimmed.get("_")
+        trimmed["_root"] = parent.get("_root", trimmed) if isinstance(parent, cs.Container) else trimmed
+    return t.cast(Context, trimmed)
+
+
+def _raw_size(subcon: Construct[t.Any, t.Any], stream: t.Any, context: Context, path: PathType) -> int:
+    """
+    Size of the raw bytes of a lazy field, which are the next bytes in the stream.
+    """
+    try:
+        return subcon._sizeof(context, path)  # type: ignore
+    except cs.SizeofError:
+        pass
+    # adapters (eg. "StringEncoded" of "PascalString") have the same raw bytes as their subcon
+    inner: t.Any = subcon
+    while isinstance(inner, (cs.Adapter, cs.Renamed)):
+        inner = inner.subcon
+    if not isinstance(inner, cs.Prefixed):
+        raise cs.SizeofError("size of the lazy field is unknown", path=path)
+    # only the length prefix is read ahead, then the stream is moved back to the start of the field
+    try:
+        start = cs.stream_tell(stream, path)
+    except cs.StreamError:
+        raise cs.SizeofError("length prefix of the lazy field can not be read ahead", path=path) from None
+    length: int = inner.lengthfield._parsereport(stream, context, path)
+    prefix_size = cs.stream_tell(stream, path) - start
+    cs.stream_seek(stream, start, 0, path)
+    return length if inner.includelength else prefix_size + length
+
+
+class LazyField(Construct[ParsedType, t.Any]):
+    """
+    Reads the raw bytes of its subcon without decoding them. The decoding is done on the first access of the field.
+
+    Created by "csfield(..., lazy=True)". The size of the raw bytes has to be known before decoding: either the
+    subcon has a size (eg. it can depend on previous fields in the context), or it is a "Prefixed" (also inside of
+    adapters, eg. "PascalString" or "Prefixed(..., Compressed(...))"), whose length prefix is read ahead. Otherwise
+    (or if the prefix can not be read ahead, because the stream is not seekable), the field is parsed eagerly,
+    which is counted as "lazy_eager_parse" in "slow_path_counts".
+
+    When building, the raw bytes are written unchanged, if the field was never accessed after parsing.
+    """
+
+    def __init__(self, subcon: Construct[ParsedType, t.Any]) -> None:
+        from .dataclass_struct import _uses_context
+
+        super().__init__()  # type: ignore
+        self.subcon = subcon
+        self.flagbuildnone = subcon.flagbuildnone
+        self._context_values = _uses_context(subcon, set())
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        try:
+            length = _raw_size(self.subcon, stream, context, path)
+        except cs.SizeofError:
+            count_slow_path("lazy_eager_parse")
+            return self.subcon._parsereport(stream, context, path)  # type: ignore
+        raw = _stream_readview(stream, length, path)
+        return LazyValue(self.subcon, raw, _trim_context(context, self._context_values), path)
+
+    def _build(self, obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        if isinstance(obj, LazyValue):
+            _stream_writeview(stream, obj.raw, len(obj.raw), path)
+            return obj
+        return self.subcon._build(obj, stream, context, path)  # type: ignore
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        return self.subcon._sizeof(context, path)  # type: ignore
+
+
+class LazyFieldDescriptor:
+    """
+    Data descriptor, which is installed for every lazy field in the dataclass by "DataclassStruct".
+
+    The value is stored in the "__dict__" of the instance under the name of the field. A LazyValue is decoded on
+    first access and replaced by the decoded value. If several threads access the field for the first time at the
+    same time, it may be decoded more than once, but all of them get an equal value.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: t.Any, owner: t.Optional[t.Type[t.Any]] = None) -> t.Any:
+        if instance is None:
+            return self
+        try:
+            value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if isinstance(value, LazyValue):
+            value = instance.__dict__[self.name] = value.decode()
+        return value
+
+    def __set__(self, instance: t.Any, value: t.Any) -> None:
+        instance.__dict__[self.name] = value
+
+
+def raw_field_value(obj: t.Any, name: str) -> t.Any:
+    """
+    Get the value of a field without decoding it, if it is a lazy field that was not accessed yet.
+    """
+    try:
+        return obj.__dict__[name]
+    except (AttributeError, KeyError):
+        return getattr(obj, name)
@@ -0,0 +1,107 @@
+import collections
+import contextlib
+import threading
+import typing as t
+
+_counters: "collections.Counter[str]" = collections.Counter()
+# "+= 1" is no atomic operation, so the counters of slow paths in several threads are updated under a lock
+_counters_lock = threading.Lock()
+
+
+# "count_slow_path" and "count_compile_fallbacks" are used by the other modules of this package (but they are not
+# exported by "construct_typed")
+def count_slow_path(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def _counted(name: str, func: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+    def counted(*args: t.Any) -> t.Any:
+        with _counters_lock:
+            _counters[name] += 1
+        return func(*args)
+
+    return counted
+
+
+def count_compile_fallbacks(compiled: t.Any) -> t.Any:
+    # the linked parsers/builders of a compiled construct are only called for subcons, which could not be compiled
+    module = compiled.module
+    for linked, name in (
+        (module.linkedparsers, "compile_fallback_parse"),
+        (module.linkedbuilders, "compile_fallback_build"),
+    ):
+        for key, func in linked.items():
+            linked[key] = _counted(name, func)
+    return compiled
+
+
+def slow_path_counts() -> t.Dict[str, int]:
+    """
+    Get a snapshot of the counters, how often a slow path was taken since the start of the process (or since
+    "reset_slow_path_counts"). Counters, whose slow path was never taken, are missing.
+
+    - "enum_pseudo_member": a pseudo member of an "EnumBase" was created for a missing value
+    - "flags_enum_pseudo_member": a pseudo member of a "FlagsEnumBase" was created for a combination of flags
+    - "compile_fallback_parse" / "compile_fallback_build": a compiled "DataclassStruct" called the interpreted
+      parser/builder of a subcon, which could not be compiled
+    - "switch_default": "DataclassSwitch" parsed a tag without a case with the default construct
+    - "switch_subclass_lookup": "DataclassSwitch" searched the case of an object via the base classes of its type
+    - "switch_error" / "select_error": "DataclassSwitch" / "DataclassSelect" raised a SwitchError / SelectError
+    - "zerocopy_stream_copy": a zero-copy field was read from a stream, which is not a buffer, so it was copied
+    - "detach_copy": "detach" copied a memoryview into bytes
+    - "lazy_eager_parse": a lazy field was parsed eagerly, because the size of its raw bytes is unknown
+    - "compressed_rewind": the records of a "StreamingCompressed" seeked back further than the buffer of the
+      decompressed data, so the data is decompressed again from the beginning
+    - "checksum_reread": a "FieldChecksum" read the bytes of its range again, because the stream has no buffer
+    - "bitstruct_restream": a "DataclassBitStruct" was created for a dataclass without a static bit layout, so it
+      restreams every byte into bits (counted once per dataclass type)
+
+    Example::
+
+        >>> from construct_typed import EnumBase, slow_path_counts
+        >>> class State(EnumBase):
+        ...     Idle = 1
+        >>> before = slow_path_counts().get("enum_pseudo_member", 0)
+        >>> State(5)
+        <State.5: 5>
+        >>> slow_path_counts()["enum_pseudo_member"] - before
+        1
+    """
+    with _counters_lock:
+        return dict(_counters)
+
+
+def reset_slow_path_counts() -> None:
+    """
+    Set all counters of "slow_path_counts" to zero.
+    """
+    with _counters_lock:
+        _counters.clear()
+
+
+@contextlib.contextmanager
+def count_slow_paths() -> t.Iterator[t.Dict[str, int]]:
+    """
+    Context manager, which counts the slow paths (see "slow_path_counts") taken inside of the with block. The
+    yielded dict is filled when the block is left. The counters are global, so the slow paths taken by other
+    threads in the meantime are included.
+
+    Example::
+
+        >>> from construct_typed import EnumBase, count_slow_paths
+        >>> class State(EnumBase):
+        ...     Idle = 1
+        >>> with count_slow_paths() as counts:
+        ...     _ = State(7)
+        >>> counts
+        {'enum_pseudo_member': 1}
+    """
+    with _counters_lock:
+        before = collections.Counter(_counters)
+    counts: t.Dict[str, int] = {}
+    try:
+        yield counts
+    finally:
+        with _counters_lock:
+            counts.update(_counters - before)
@@ -0,0 +1,243 @@
+import array
+import sys
+import typing as t
+
+import construct as cs
+
+from .generic_wrapper import ConstantOrContextLambda, Construct, Context, PathType
+from .zerocopy import BufferStream, ReadableBuffer, _stream_readview
+
+if t.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+ElementType = t.TypeVar("ElementType", int, float)
+ArrayType = t.TypeVar("ArrayType")
+ArrayBuildTypes = t.TypeVar("ArrayBuildTypes")
+
+
+def primitive_format(
+    subcon: Construct[t.Any, t.Any]
+) -> t.Optional[t.Tuple[str, str, int]]:
+    """
+    Get the byte order, the struct format character and the size of a primitive fixed-width subcon (eg. Int16ul or
+    Float32b), or None if the subcon is not a plain "FormatField".
+    """
+    while isinstance(subcon, cs.Renamed) and subcon.parsed is None:
+        subcon = subcon.subcon
+    # derived classes may change the parsing, so only the original class is accepted
+    if type(subcon) is not cs.FormatField:
+        return None
+    fmtstr: str = subcon.fmtstr  # type: ignore
+    return fmtstr[0], fmtstr[1], subcon.length  # type: ignore
+
+
+def _array_typecode(format: str, size: int) -> t.Optional[str]:
+    # the item sizes of "array.array" are platform dependent, so the typecode is selected by the size
+    if format in "fd":
+        return format
+    if format in "bBhHlLqQ":
+        candidates = "bhilq" if format.islower() else "BHILQ"
+        for typecode in candidates:
+            if array.array(typecode).itemsize == size:
+                return typecode
+    return None
+
+
+def _numpy_dtype(byteorder: str, format: str, size: int) -> "np.dtype[t.Any]":
+    import numpy as np  # optional dependency, only needed for output="numpy"
+
+    if format == "?":
+        return np.dtype("?")
+    kind = "f" if format in "efd" else "i" if format.islower() else "u"
+    return np.dtype(f"{byteorder}{kind}{size}")
+
+
+def _numpy_values(obj: t.Any, dtype: "np.dtype[t.Any]") -> "npt.NDArray[t.Any]":
+    """
+    Convert the object to an ndarray of the dtype. Unlike "numpy.asarray", values which do not fit into the dtype
+    (eg. floats for an integer dtype, or integers out of its range) raise a ValueError instead of being truncated
+    or wrapped around.
+    """
+    import numpy as np
+
+    values = np.asarray(obj)
+    if values.dtype == dtype or values.size == 0:
+        return values.astype(dtype)
+    kinds = "biuf" if dtype.kind == "f" else "biu"
+    if values.dtype.kind not in kinds:
+        raise ValueError(f"can not convert values of dtype {values.dtype.str!r}")
+    if dtype.kind in "iu" and values.dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            raise ValueError(f"values are out of the range {info.min}..{info.max}")
+    elif dtype.kind == "b" and values.dtype.kind != "b":
+        if values.min() < 0 or values.max() > 1:
+            raise ValueError("values are out of the range 0..1")
+    return values.astype(dtype)
+
+
+def _needs_byteswap(byteorder: str, size: int) -> bool:
+    if size == 1 or byteorder == "=":
+        return False
+    return (byteorder == "<") != (sys.byteorder == "little")
+
+
+class NumericArray(Construct[ArrayType, ArrayBuildTypes]):
+    r"""
+    Homogenous array of primitive fixed-width numbers (eg. Int16ul or Float32b), which is parsed into an
+    "array.array" or a "numpy.ndarray" instead of a ListContainer.
+
+    All elements are read with a single stream read. With output="array" they are converted with "array.frombytes"
+    (and "byteswap" if the byte order of the subcon differs from the byte order of the platform). With
+    output="numpy" they are wrapped with "numpy.frombuffer" and a dtype with the byte order of the subcon. If the
+    input is a buffer (eg. bytes or mmap), the ndarray is a read-only view of it without a copy, so call ".copy()"
+    to get a writable array or to release the buffer. Compared to a ListContainer of Python ints the memory usage
+    is only the size of the elements.
+
+    Building accepts an "array.array", a "numpy.ndarray" (for output="numpy") or any sequence of numbers.
+
+    :param count: integer or context lambda, number of elements, or None to parse all remaining complete elements of the stream (like "construct.GreedyRange")
+    :param subcon: FormatField of the elements, eg. Int16ul, Int32sb or Float64l
+    :param output: "array" to parse into an "array.array", "numpy" to parse into a "numpy.ndarray" (requires numpy)
+
+    :raises ValueError: subcon is not a FormatField or has no matching "array.array" typecode (eg. Float16l)
+    :raises RangeError: specified count is not valid, or the object has a different number of elements
+    :raises FormatFieldError: an element can not be converted without loss (eg. a float for an integer subcon, or an integer out of range)
+
+    Example::
+
+        >>> from construct import Int16ul
+        >>> from construct_typed import NumericArray
+        >>> d = NumericArray(3, Int16ul)
+        >>> d.parse(b"\x01\x00\x02\x00\x03\x00")
+        array('H', [1, 2, 3])
+        >>> d.build([1, 2, 3])
+        b'\x01\x00\x02\x00\x03\x00'
+        >>> NumericArray(None, Int16ul, output="numpy").parse(b"\x01\x00\x02\x00\x03")
+        array([1, 2], dtype=uint16)
+    """
+
+    @t.overload
+    def __init__(
+        self: "NumericArray[array.array[ElementType], t.Union[array.array[ElementType], t.Sequence[ElementType]]]",
+        count: t.Optional[ConstantOrContextLambda[int]],
+        subcon: Construct[ElementType, t.Any],
+        output: t.Literal["array"] = "array",
+    ) -> None:
+        ...
+
+    @t.overload
+    def __init__(
+        self: "NumericArray[npt.NDArray[t.Any], t.Union[npt.NDArray[t.Any], t.Sequence[ElementType]]]",
+        count: t.Optional[ConstantOrContextLambda[int]],
+        subcon: Construct[ElementType, t.Any],
+        output: t.Literal["numpy"],
+    ) -> None:
+        ...
+
+    def __init__(
+        self,
+        count: t.Optional[ConstantOrContextLambda[int]],
+        subcon: Construct[t.Any, t.Any],
+        output: t.Literal["array", "numpy"] = "array",
+    ) -> None:
+        super().__init__()  # type: ignore
+        primitive = primitive_format(subcon)
+        if primitive is None:
+            raise ValueError(f"'{repr(subcon)}' is not a primitive fixed-width subcon")
+        byteorder, format, size = primitive
+        if output == "array":
+            typecode = _array_typecode(format, size)
+            if typecode is None:
+                raise ValueError(f"format {format!r} is not supported by array.array")
+            self._typecode = typecode
+            self._byteswap = _needs_byteswap(byteorder, size)
+        elif output == "numpy":
+            self._dtype = _numpy_dtype(byteorder, format, size)
+        else:
+            raise ValueError(f"invalid output {output!r}")
+        self.count = count
+        self.subcon = subcon
+        self.output = output
+        self._size = size
+
+    def _evaluate_count(self, context: Context, path: PathType) -> int:
+        count: int = cs.evaluate(self.count, context)  # type: ignore
+        if not 0 <= count:
+            raise cs.RangeError(f"invalid count {count}", path=path)
+        return count
+
+    def _read(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        if self.count is not None:
+            count = self._evaluate_count(context, path)
+            return _stream_readview(stream, count * self._size, path)
+        # greedy: all remaining complete elements, the stream is placed after the last one
+        if isinstance(stream, BufferStream):
+            data: t.Any = stream.readview()
+        else:
+            data = cs.stream_read_entire(stream, path)
+        rest = len(data) % self._size
+        if rest:
+            cs.stream_seek(t.cast(t.IO[bytes], stream), -rest, 1, path)
+            data = data[: len(data) - rest]
+        return data
+
+    def parse(self, data: ReadableBuffer, **contextkw: t.Any) -> ArrayType:
+        if self.output == "numpy":
+            # read directly from the buffer, so that the ndarray can reference it
+            stream = t.cast(t.IO[bytes], BufferStream(data))
+            return self.parse_stream(stream, **contextkw)
+        return super().parse(t.cast(bytes, data), **contextkw)
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        data = self._read(stream, context, path)
+        if self.output == "numpy":
+            import numpy as np
+
+            return np.frombuffer(data, dtype=self._dtype)
+        obj = array.array(self._typecode)
+        obj.frombytes(data)
+        if self._byteswap:
+            obj.byteswap()
+        return obj
+
+    def _tobytes(self, obj: t.Any, path: PathType) -> bytes:
+        if self.output == "numpy":
+            try:
+                return _numpy_values(obj, self._dtype).tobytes()
+            except (TypeError, ValueError, OverflowError) as e:
+                raise cs.FormatFieldError(
+                    f"dtype {self._dtype.str!r} error during building: {e}", path=path
+                )
+        if isinstance(obj, array.array) and obj.typecode == self._typecode and not self._byteswap:
+            return obj.tobytes()
+        try:
+            values = array.array(self._typecode, obj)
+        except (TypeError, OverflowError) as e:
+            raise cs.FormatFieldError(
+                f"array {self._typecode!r} error during building: {e}", path=path
+            )
+        if self._byteswap:
+            values.byteswap()
+        return values.tobytes()
+
+    def _build(self, obj: t.Any, stream: t.Any, context: Context, path: PathType) -> t.Any:
+        if self.count is not None:
+            count = self._evaluate_count(context, path)
+            if not len(obj) == count:
+                raise cs.RangeError(f"expected {count} elements, found {len(obj)}", path=path)
+        data = self._tobytes(obj, path)
+        cs.stream_write(stream, data, len(data), path)
+        return obj
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        if self.count is None:
+            raise cs.SizeofError(path=path)
+        try:
+            count: int = cs.evaluate(self.count, context)  # type: ignore
+        except (KeyError, AttributeError):
+            raise cs.SizeofError(
+                "cannot calculate size, key not found in context", path=path
+            )
+        return count * self._size
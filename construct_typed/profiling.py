@@ -0,0 +1,294 @@
+import dataclasses
+import dis
+import functools
+import linecache
+import tracemalloc
+import types
+import typing as t
+
+import construct as cs
+
+from .dataclass_struct import DataclassStruct
+from .zerocopy import ReadableBuffer
+
+AllocationCategory = t.Literal["dataclasses", "containers", "contexts", "lists", "paths", "enums", "other"]
+
+# allocations outside of the csfields (eg. the Struct container, the context and the dataclass instance)
+RECORD = "(record)"
+
+_TRACEBACK_LIMIT = 32
+
+
+@dataclasses.dataclass(frozen=True)
+class AllocationStats:
+    """
+    Memory blocks, which are allocated per record (averaged over all samples).
+    """
+
+    bytes: float = 0.0
+    objects: float = 0.0
+
+    def __add__(self, other: "AllocationStats") -> "AllocationStats":
+        return AllocationStats(self.bytes + other.bytes, self.objects + other.objects)
+
+    def __sub__(self, other: "AllocationStats") -> "AllocationStats":
+        return AllocationStats(self.bytes - other.bytes, self.objects - other.objects)
+
+
+@dataclasses.dataclass(frozen=True)
+class AllocationReport:
+    """
+    Result of "allocation_report".
+
+    "fields" maps every csfield (and "(record)" for the allocations outside of the csfields) to the allocations per
+    category. "retained" are the allocations per record, which are still alive after parsing, eg. the dataclass
+    instance with its values and newly created pseudo enum members. Everything else is transient garbage.
+    """
+
+    schema: str
+    records: int
+    fields: t.Dict[str, t.Dict[AllocationCategory, AllocationStats]]
+    retained: AllocationStats
+
+    @property
+    def allocated(self) -> AllocationStats:
+        """Sum of all allocations per record."""
+        total = AllocationStats()
+        for categories in self.fields.values():
+            for stats in categories.values():
+                total += stats
+        return total
+
+    def field_total(self, name: str) -> AllocationStats:
+        total = AllocationStats()
+        for stats in self.fields[name].values():
+            total += stats
+        return total
+
+    def __str__(self) -> str:
+        allocated = self.allocated
+        lines = [
+            f"{self.schema}: {self.records} records, per record",
+            f"  allocated {allocated.bytes:10.1f} bytes {allocated.objects:8.1f} objects",
+            f"  retained  {self.retained.bytes:10.1f} bytes {self.retained.objects:8.1f} objects",
+            "",
+            f"  {'field':<24} {'category':<12} {'bytes':>10} {'objects':>8}",
+        ]
+        for name, categories in self.fields.items():
+            for category, stats in categories.items():
+                lines.append(f"  {name:<24} {category:<12} {stats.bytes:10.1f} {stats.objects:8.1f}")
+        return "\n".join(lines)
+
+
+@dataclasses.dataclass
+class _LineNames:
+    """
+    Names, which the instructions of a source line load and store, and if they build a string.
+    """
+
+    loaded: t.Set[str] = dataclasses.field(default_factory=set)
+    stored: t.Set[str] = dataclasses.field(default_factory=set)
+    builds_string: bool = False
+
+
+# instructions, which create a new string from other strings (f-strings, "%" formatting and concatenation)
+_STRING_OPS = {
+    "BUILD_STRING",
+    "FORMAT_VALUE",
+    "FORMAT_SIMPLE",
+    "FORMAT_WITH_SPEC",
+    "BINARY_OP",
+    "BINARY_ADD",
+    "BINARY_MODULO",
+    "INPLACE_ADD",
+    "INPLACE_MODULO",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _module_lines(filename: str) -> t.Dict[int, _LineNames]:
+    """
+    Names of every line of a module, from the code objects of its source (the code objects of the loaded module
+    are not available by the file name, so the source is compiled again).
+    """
+    try:
+        code = compile("".join(linecache.getlines(filename)), filename, "exec")
+    except (SyntaxError, ValueError):
+        return {}
+    lines: t.Dict[int, _LineNames] = {}
+    codes = [code]
+    while codes:
+        code = codes.pop()
+        starts = dict(dis.findlinestarts(code))
+        lineno = code.co_firstlineno
+        for instruction in dis.get_instructions(code):
+            lineno = starts.get(instruction.offset) or lineno
+            names = lines.setdefault(lineno, _LineNames())
+            argval = instruction.argval
+            if isinstance(argval, types.CodeType):
+                codes.append(argval)
+            values = argval if isinstance(argval, tuple) else (argval,)  # eg. LOAD_FAST_LOAD_FAST
+            if instruction.opname.startswith("LOAD_"):
+                names.loaded.update(value for value in values if isinstance(value, str))
+            elif instruction.opname.startswith("STORE_"):
+                names.stored.update(value for value in values if isinstance(value, str))
+            elif instruction.opname in _STRING_OPS:
+                names.builds_string = True
+    return lines
+
+
+def _classify(traceback: tracemalloc.Traceback) -> AllocationCategory:
+    # the most recent frame, whose line creates an object of a category, as told by the names of its code objects
+    for frame in reversed(traceback):
+        if frame.filename.endswith("enum.py"):
+            return "enums"  # pseudo members of enum.py and tenum.py
+        names = _module_lines(frame.filename).get(frame.lineno)
+        if names is None:
+            continue
+        if names.builds_string and any(name.endswith("path") for name in names.stored):
+            return "paths"
+        if "ListContainer" in names.loaded:
+            return "lists"
+        if "Container" in names.loaded:
+            return "contexts" if names.stored & {"context", "this"} else "containers"
+        if "dc_type" in names.loaded:
+            return "dataclasses"
+    return "other"
+
+
+Allocations = t.Dict[tracemalloc.Traceback, t.List[int]]  # traceback -> [bytes, objects]
+
+
+def _diff(after: tracemalloc.Snapshot, before: t.Optional[tracemalloc.Snapshot], totals: Allocations) -> None:
+    # the allocations are classified at the end, so that reading the sources does not show up in the snapshots
+    if before is None:
+        stats = [(stat.traceback, stat.size, stat.count) for stat in after.statistics("traceback")]
+    else:
+        stats = [(stat.traceback, stat.size_diff, stat.count_diff) for stat in after.compare_to(before, "traceback")]
+    for traceback, size, count in stats:
+        if traceback[-1].filename in (tracemalloc.__file__, __file__):
+            continue  # allocations of the snapshots and of the profiler itself
+        if size > 0 or count > 0:
+            sums = totals.setdefault(traceback, [0, 0])
+            sums[0] += max(size, 0)
+            sums[1] += max(count, 0)
+
+
+def _categories(totals: Allocations) -> t.Dict[AllocationCategory, t.List[int]]:
+    categories: t.Dict[AllocationCategory, t.List[int]] = {}
+    for traceback, (size, count) in totals.items():
+        sums = categories.setdefault(_classify(traceback), [0, 0])
+        sums[0] += size
+        sums[1] += count
+    return categories
+
+
+def allocation_report(format: "DataclassStruct[t.Any]", samples: t.Iterable[ReadableBuffer]) -> AllocationReport:
+    """
+    Parse every sample (one serialized record each) with the DataclassStruct under "tracemalloc" and report the
+    bytes and objects allocated per record, broken down by csfield and category:
+
+    - "dataclasses": dataclass instances
+    - "containers": containers of Structs (which are converted to dataclasses afterwards)
+    - "contexts": context containers
+    - "lists": ListContainers of arrays
+    - "paths": path strings for error messages
+    - "enums": pseudo members of enums for missing values
+    - "other": everything else, eg. ints and bytes
+
+    Short lived objects (contexts, path strings and the results of all subcons) are kept alive until the end of
+    each csfield, so that they are counted although they are garbage after parsing. Other transient objects (eg.
+    the bytes read from the stream before they are converted) are not counted. The allocations of nested
+    DataclassStructs are counted for their csfield in the given DataclassStruct. The numbers of the first record
+    include caches, which are created only once (eg. pseudo enum members), so pass enough samples.
+
+    While the report is created, the method "_parsereport" of all constructs is replaced, so do not parse in other
+    threads at the same time. "tracemalloc" is started and stopped for every record.
+
+    :param format: DataclassStruct instance
+    :param samples: serialized records, eg. a list of bytes
+
+    :raises ValueError: no samples are given
+    :raises RuntimeError: "tracemalloc" is already tracing
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Int8ub
+        >>> from construct_typed import DataclassMixin, DataclassStruct, allocation_report, csfield
+        >>> @dataclasses.dataclass
+        ... class Image(DataclassMixin):
+        ...     width: int = csfield(Int8ub)
+        ...     height: int = csfield(Int8ub)
+        >>> report = allocation_report(DataclassStruct(Image), [b"\\x01\\x02"] * 10)
+        >>> list(report.fields)
+        ['width', 'height', '(record)']
+        >>> report.field_total("width").objects > 0
+        True
+    """
+    field_names = {id(sc): sc.name for sc in format.subcon.subcons if sc.name is not None}
+    field_totals: t.Dict[str, Allocations] = {name: {} for name in field_names.values()}
+    record_totals: Allocations = {}
+    retained_totals: Allocations = {}
+    keep: t.List[t.Any] = []
+    active = False
+
+    original = cs.Construct._parsereport
+
+    def parsereport(self: t.Any, stream: t.Any, context: t.Any, path: t.Any) -> t.Any:
+        nonlocal active
+        name = None if active else field_names.get(id(self))
+        if name is None:
+            obj = original(self, stream, context, path)
+            keep.append((context, path, obj))
+            return obj
+        active = True
+        try:
+            before = tracemalloc.take_snapshot()
+            obj = original(self, stream, context, path)
+            keep.append((context, path, obj))
+            _diff(tracemalloc.take_snapshot(), before, field_totals[name])
+        finally:
+            active = False
+        return obj
+
+    if tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is already tracing")
+    records = 0
+    cs.Construct._parsereport = parsereport  # type: ignore
+    try:
+        for sample in samples:
+            # tracing is restarted for every record, so that the snapshots contain only the allocations of the record
+            tracemalloc.start(_TRACEBACK_LIMIT)
+            obj = format.parse(sample)
+            _diff(tracemalloc.take_snapshot(), None, record_totals)
+            keep.clear()
+            _diff(tracemalloc.take_snapshot(), None, retained_totals)
+            tracemalloc.stop()
+            del obj
+            records += 1
+    finally:
+        cs.Construct._parsereport = original  # type: ignore
+        tracemalloc.stop()
+    if not records:
+        raise ValueError("no samples given")
+
+    def stats(sums: t.List[int]) -> AllocationStats:
+        return AllocationStats(sums[0] / records, sums[1] / records)
+
+    fields: t.Dict[str, t.Dict[AllocationCategory, AllocationStats]] = {}
+    outside: t.Dict[AllocationCategory, AllocationStats] = {}
+    for category, sums in _categories(record_totals).items():
+        outside[category] = stats(sums)
+    for name, totals in field_totals.items():
+        fields[name] = {category: stats(sums) for category, sums in sorted(_categories(totals).items())}
+        for category, field_stats in fields[name].items():
+            outside[category] = outside.get(category, AllocationStats()) - field_stats
+    fields[RECORD] = {
+        category: stats for category, stats in sorted(outside.items()) if stats.bytes > 0 or stats.objects > 0
+    }
+
+    retained = AllocationStats()
+    for sums in _categories(retained_totals).values():
+        retained += stats(sums)
+    return AllocationReport(format.dc_type.__name__, records, fields, retained)
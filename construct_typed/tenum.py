@@ -1,9 +1,16 @@
 import enum
+import threading
 import typing as t
 
-from typing_extensions import Self
+from .generic_wrapper import Adapter, Construct, Context, PathType, emit_decode, emit_encode
+from .metrics import count_slow_path
 
-from .generic_wrapper import *
+if t.TYPE_CHECKING:
+    from typing_extensions import Self
+
+# the pseudo members are created under a lock, so that parsing the same missing value in several threads at the
+# same time creates only one member (and counts it once)
+_pseudo_member_lock = threading.Lock()
 
 
 # ## TEnum ############################################################################################################
@@ -65,14 +72,19 @@ class EnumBase(enum.IntEnum):
     def _missing_(cls, value: t.Any) -> t.Optional[enum.Enum]:
         if isinstance(value, int):
             pseudo_member = cls._value2member_map_.get(value, None)
-            if pseudo_member is None:
-                new_member = int.__new__(cls, value)
-                # I expect a name attribute to hold a string, hence str(value)
-                # However, new_member._name_ = value works, too
-                new_member._name_ = str(value)
-                new_member._value_ = value
-                new_member.__doc__ = "missing value"
-                pseudo_member = cls._value2member_map_.setdefault(value, new_member)
+            if pseudo_member is not None:
+                return pseudo_member
+            with _pseudo_member_lock:
+                pseudo_member = cls._value2member_map_.get(value, None)
+                if pseudo_member is None:
+                    new_member = int.__new__(cls, value)
+                    # I expect a name attribute to hold a string, hence str(value)
+                    # However, new_member._name_ = value works, too
+                    new_member._name_ = str(value)
+                    new_member._value_ = value
+                    new_member.__doc__ = "missing value"
+                    pseudo_member = cls._value2member_map_.setdefault(value, new_member)
+                    count_slow_path("enum_pseudo_member")
             return pseudo_member
         return None  # will raise the ValueError in Enum.__new__
 
@@ -118,6 +130,12 @@ class TEnum(Adapter[int, int, EnumType, EnumType]):
             "'{}' has to be of type {}".format(repr(obj), repr(self.enum_type))
         )
 
+    def _emitparse(self, code: t.Any) -> str:
+        return emit_decode(self, code)
+
+    def _emitbuild(self, code: t.Any) -> str:
+        return emit_encode(self, code)
+
 
 # ## TFlagsEnum #######################################################################################################
 class FlagsEnumBase(enum.IntFlag):
@@ -168,9 +186,14 @@ class FlagsEnumBase(enum.IntFlag):
         """
         Returns member (possibly creating it) if one can be found for value.
         """
-        new_member = super()._missing_(value)
-        new_member.__doc__ = "missing value"
-        return new_member
+        with _pseudo_member_lock:
+            member = cls._value2member_map_.get(value, None)
+            if member is not None:
+                return member  # created by another thread in the meantime
+            new_member = super()._missing_(value)
+            new_member.__doc__ = "missing value"
+            count_slow_path("flags_enum_pseudo_member")
+            return new_member
 
     def __reduce_ex__(self, proto: t.Any) -> t.Tuple[t.Any, ...]:
         """
@@ -213,3 +236,9 @@ class TFlagsEnum(Adapter[int, int, FlagsEnumType, FlagsEnumType]):
         raise TypeError(
             "'{}' has to be of type {}".format(repr(obj), repr(self.enum_type))
         )
+
+    def _emitparse(self, code: t.Any) -> str:
+        return emit_decode(self, code)
+
+    def _emitbuild(self, code: t.Any) -> str:
+        return emit_encode(self, code)
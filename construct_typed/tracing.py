@@ -0,0 +1,199 @@
+import dataclasses
+import threading
+import time
+import typing as t
+import weakref
+
+from .bitfields import BitFieldStruct
+from .dataclass_struct import DataclassStruct
+from .generic_wrapper import Construct, PathType
+from .tenum import TEnum, TFlagsEnum
+
+TracePhase = t.Literal["start", "end"]
+TraceOperation = t.Literal["parse", "build"]
+
+
+@dataclasses.dataclass(frozen=True)
+class TraceEvent:
+    """
+    Event, which is passed to the trace hooks at the start and at the end of parsing/building a traced construct.
+
+    The size (in bytes) and the duration (in seconds) are only set at the end. The offset and the size are None, if
+    the stream is not tellable. If parsing/building failed, the end event has the exception as error.
+    """
+
+    phase: TracePhase
+    operation: TraceOperation
+    schema: str
+    path: PathType
+    offset: t.Optional[int]
+    size: t.Optional[int] = None
+    duration: t.Optional[float] = None
+    error: t.Optional[BaseException] = None
+
+
+TraceHook = t.Callable[[TraceEvent], None]
+
+# classes, whose "_parse"/"_build" are replaced while hooks are registered
+_TRACED_CLASSES: t.Tuple[t.Type[Construct[t.Any, t.Any]], ...] = (
+    DataclassStruct,
+    BitFieldStruct,
+    TEnum,
+    TFlagsEnum,
+)
+
+# the lists of hooks are never modified but replaced, so that the traced constructs in other threads can iterate
+# over them without a lock, while hooks are added or removed
+_global_hooks: t.Tuple[TraceHook, ...] = ()
+_format_hooks: "weakref.WeakKeyDictionary[Construct[t.Any, t.Any], t.Tuple[TraceHook, ...]]" = (
+    weakref.WeakKeyDictionary()
+)
+_originals: t.Dict[t.Tuple[type, str], t.Optional[t.Callable[..., t.Any]]] = {}
+_hooks_lock = threading.Lock()
+
+
+def _schema_name(format: t.Any) -> str:
+    if isinstance(format, DataclassStruct):
+        return format.dc_type.__name__
+    if isinstance(format, BitFieldStruct):
+        return format.struct.dc_type.__name__
+    if isinstance(format, (TEnum, TFlagsEnum)):
+        return format.enum_type.__name__
+    return type(format).__name__
+
+
+def _tell(stream: t.Any) -> t.Optional[int]:
+    try:
+        return t.cast(int, stream.tell())
+    except Exception:
+        return None
+
+
+def _hooks_of(format: t.Any) -> t.Tuple[TraceHook, ...]:
+    hooks = _format_hooks.get(format)
+    if hooks is None:
+        return _global_hooks
+    return _global_hooks + hooks
+
+
+def _traced(operation: TraceOperation, original: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+    def emit(
+        hooks: t.Tuple[TraceHook, ...], phase: TracePhase, schema: str, path: PathType, offset: t.Optional[int], **kw: t.Any
+    ) -> None:
+        event = TraceEvent(phase, operation, schema, path, offset, **kw)
+        for hook in hooks:
+            hook(event)
+
+    def traced(self: t.Any, *args: t.Any) -> t.Any:
+        hooks = _hooks_of(self)
+        if not hooks:
+            return original(self, *args)
+        stream, path = args[-3], args[-1]  # (stream, context, path) or (obj, stream, context, path)
+        schema = _schema_name(self)
+        offset = _tell(stream)
+        emit(hooks, "start", schema, path, offset)
+        start = time.perf_counter()
+        try:
+            result = original(self, *args)
+        except BaseException as e:
+            emit(hooks, "end", schema, path, offset, duration=time.perf_counter() - start, error=e)
+            raise
+        duration = time.perf_counter() - start
+        end = _tell(stream)
+        size = None if offset is None or end is None else end - offset
+        emit(hooks, "end", schema, path, offset, size=size, duration=duration)
+        return result
+
+    return traced
+
+
+def _without(
+    hooks: t.Tuple[TraceHook, ...], hook: TraceHook, format: t.Optional[Construct[t.Any, t.Any]]
+) -> t.Tuple[TraceHook, ...]:
+    # like "list.remove", only the first occurrence is removed
+    for i, registered in enumerate(hooks):
+        if registered == hook:
+            return hooks[:i] + hooks[i + 1 :]
+    if format is None:
+        raise ValueError(f"{hook!r} is not registered")
+    raise ValueError(f"{hook!r} is not registered for {format!r}")
+
+
+def _install() -> None:
+    if _originals:
+        return
+    for cls in _TRACED_CLASSES:
+        for name, operation in (("_parse", "parse"), ("_build", "build")):
+            _originals[(cls, name)] = vars(cls).get(name)
+            original = getattr(cls, name)
+            setattr(cls, name, _traced(t.cast(TraceOperation, operation), original))
+
+
+def _uninstall() -> None:
+    if _global_hooks or _format_hooks:
+        return
+    for (cls, name), original in _originals.items():
+        if original is None:
+            delattr(cls, name)
+        else:
+            setattr(cls, name, original)
+    _originals.clear()
+
+
+def add_trace_hook(hook: TraceHook, format: t.Optional[Construct[t.Any, t.Any]] = None) -> None:
+    """
+    Register a hook, which is called with a "TraceEvent" at the start and at the end of parsing/building.
+
+    Traced are "DataclassStruct" (also nested ones and inside of "DataclassBitStruct"), "TEnum" and "TFlagsEnum".
+    Without a format the hook is called for all of them, otherwise only for the given instance (eg. the
+    DataclassStruct of a message type). Compiled constructs are not traced.
+
+    As long as no hook is registered, tracing costs nothing: the tracing wrappers are only installed while hooks
+    are registered.
+
+    :param hook: callable, which gets a "TraceEvent"
+    :param format: optional construct instance, which should be traced
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import Int8ub
+        >>> from construct_typed import DataclassMixin, DataclassStruct, add_trace_hook, csfield, remove_trace_hook
+        >>> @dataclasses.dataclass
+        ... class Image(DataclassMixin):
+        ...     width: int = csfield(Int8ub)
+        ...     height: int = csfield(Int8ub)
+        >>> events = []
+        >>> add_trace_hook(events.append)
+        >>> DataclassStruct(Image).parse(b"\\x01\\x02")
+        Image(width=1, height=2)
+        >>> remove_trace_hook(events.append)
+        >>> [(e.phase, e.schema, e.offset, e.size) for e in events]
+        [('start', 'Image', 0, None), ('end', 'Image', 0, 2)]
+    """
+    global _global_hooks
+    with _hooks_lock:
+        if format is None:
+            _global_hooks = _global_hooks + (hook,)
+        else:
+            _format_hooks[format] = _format_hooks.get(format, ()) + (hook,)
+        _install()
+
+
+def remove_trace_hook(hook: TraceHook, format: t.Optional[Construct[t.Any, t.Any]] = None) -> None:
+    """
+    Unregister a hook, which was registered with "add_trace_hook" (with the same format).
+
+    :raises ValueError: the hook is not registered
+    """
+    global _global_hooks
+    with _hooks_lock:
+        if format is None:
+            _global_hooks = _without(_global_hooks, hook, format)
+        else:
+            hooks = _without(_format_hooks.get(format, ()), hook, format)
+            if hooks:
+                _format_hooks[format] = hooks
+            else:
+                del _format_hooks[format]
+        _uninstall()
@@ -0,0 +1,281 @@
+import dataclasses
+import io
+import typing as t
+
+import construct as cs
+
+from .generic_wrapper import Construct, Context, PathType
+from .metrics import count_slow_path
+
+if t.TYPE_CHECKING:
+    from typing_extensions import Buffer
+
+    ReadableBuffer = Buffer
+else:
+    ReadableBuffer = t.Union[bytes, bytearray, memoryview]
+ZeroCopyParsedType = t.Union[bytes, memoryview]
+ZeroCopyBuildTypes = t.Union[bytes, bytearray, memoryview]
+
+
+class BufferStream(io.BufferedIOBase):
+    """
+    Read-only stream over an in-memory buffer (eg. bytes, bytearray, mmap or memoryview).
+
+    In comparison to "io.BytesIO" the buffer is not copied and "readview" can hand out memoryview slices of the
+    buffer, which reference the original memory instead of copying it.
+    """
+
+    def __init__(self, data: ReadableBuffer) -> None:
+        super().__init__()
+        view = memoryview(data)
+        if view.ndim != 1 or view.format != "B":
+            view = view.cast("B")
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def read(self, size: t.Optional[int] = -1) -> bytes:
+        return self.readview(size).tobytes()
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readview(self, size: t.Optional[int] = -1) -> memoryview:
+        """
+        Read up to size bytes (or until EOF if size is negative or None) and return them as a memoryview slice.
+        """
+        start = self._pos
+        if size is None or size < 0:
+            end = len(self._view)
+        else:
+            end = min(start + size, len(self._view))
+        self._pos = end
+        return self._view[start:end]
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+
+def _stream_readview(stream: t.Any, length: int, path: PathType) -> ZeroCopyParsedType:
+    if not isinstance(stream, BufferStream):
+        return cs.stream_read(stream, length, path)
+    if length < 0:
+        raise cs.StreamError(f"length must be non-negative, found {length}", path=path)
+    data = stream.readview(length)
+    if len(data) != length:
+        raise cs.StreamError(
+            f"stream read less than specified amount, expected {length}, found {len(data)}",
+            path=path,
+        )
+    return data
+
+
+def _stream_writeview(
+    stream: t.Any, data: ZeroCopyBuildTypes, length: int, path: PathType
+) -> None:
+    if not isinstance(data, (bytes, bytearray, memoryview)):  # type: ignore
+        raise cs.StringError(f"given non-bytes value, perhaps unicode? {data!r}", path=path)
+    if len(data) != length:
+        raise cs.StreamError(
+            f"bytes object of wrong length, expected {length}, found {len(data)}",
+            path=path,
+        )
+    written = stream.write(data)
+    if written != length:
+        raise cs.StreamError(
+            f"stream written less than specified, expected {length}, written {written}",
+            path=path,
+        )
+
+
+class ZeroCopyBytes(Construct[ZeroCopyParsedType, ZeroCopyBuildTypes]):
+    """
+    Same as "construct.Bytes", but parses into a memoryview slice of the input buffer instead of a copy, if the stream is a "BufferStream".
+
+    Used by "DataclassStruct(..., zerocopy=True)". For all other streams it behaves like "construct.Bytes".
+    """
+
+    def __init__(self, length: t.Union[int, t.Callable[[Context], int]]) -> None:
+        super().__init__()  # type: ignore
+        self.length = length
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> ZeroCopyParsedType:
+        length = self.length(context) if callable(self.length) else self.length
+        if not isinstance(stream, BufferStream):
+            count_slow_path("zerocopy_stream_copy")
+        return _stream_readview(stream, length, path)
+
+    def _build(
+        self, obj: ZeroCopyBuildTypes, stream: t.Any, context: Context, path: PathType
+    ) -> t.Any:
+        length = self.length(context) if callable(self.length) else self.length
+        data = cs.integer2bytes(obj, length) if isinstance(obj, int) else obj
+        _stream_writeview(stream, data, length, path)
+        return data
+
+    def _sizeof(self, context: Context, path: PathType) -> int:
+        try:
+            return self.length(context) if callable(self.length) else self.length
+        except (KeyError, AttributeError):
+            raise cs.SizeofError(
+                "cannot calculate size, key not found in context", path=path
+            )
+
+    def _emitparse(self, code: t.Any) -> str:
+        return f"io.read({self.length})"
+
+    def _emitbuild(self, code: t.Any) -> str:
+        return f"(io.write(obj), obj)[1]"
+
+
+class ZeroCopyGreedyBytes(Construct[ZeroCopyParsedType, ZeroCopyBuildTypes]):
+    """
+    Same as "construct.GreedyBytes", but parses into a memoryview slice of the input buffer instead of a copy, if the stream is a "BufferStream".
+
+    Used by "DataclassStruct(..., zerocopy=True)". For all other streams it behaves like "construct.GreedyBytes".
+    """
+
+    def _parse(self, stream: t.Any, context: Context, path: PathType) -> ZeroCopyParsedType:
+        if isinstance(stream, BufferStream):
+            return stream.readview()
+        count_slow_path("zerocopy_stream_copy")
+        return cs.stream_read_entire(stream, path)
+
+    def _build(
+        self, obj: ZeroCopyBuildTypes, stream: t.Any, context: Context, path: PathType
+    ) -> t.Any:
+        _stream_writeview(stream, obj, len(obj), path)
+        return obj
+
+    def _emitparse(self, code: t.Any) -> str:
+        return f"io.read()"
+
+    def _emitbuild(self, code: t.Any) -> str:
+        return f"(io.write(obj), obj)[1]"
+
+
+def zerocopy_subcon(subcon: Construct[t.Any, t.Any]) -> Construct[t.Any, t.Any]:
+    """
+    Replace "Bytes" and "GreedyBytes" (also when wrapped by "Renamed") by their zero-copy versions.
+
+    All other subcons are returned unchanged.
+    """
+    if isinstance(subcon, cs.Renamed):
+        renamed: "cs.Renamed[t.Any, t.Any]" = subcon
+        inner = zerocopy_subcon(renamed.subcon)
+        if inner is renamed.subcon:
+            return subcon
+        return cs.Renamed(
+            inner, newname=renamed.name, newdocs=renamed.docs, newparsed=renamed.parsed
+        )
+    if type(subcon) is cs.Bytes:
+        return ZeroCopyBytes(subcon.length)
+    if subcon is cs.GreedyBytes:
+        return ZeroCopyGreedyBytes()
+    return subcon
+
+
+T = t.TypeVar("T")
+
+
+def _detach_context(context: t.Any, contexts: t.Set[int]) -> None:
+    """
+    Detach the values of the context of a lazy value in place, also of the parent contexts (eg. "_" and "_root").
+    The context is already a copy without the stream (see "LazyField"), but its values may be memoryview slices.
+    """
+    if id(context) in contexts:
+        return
+    contexts.add(id(context))
+    for key, value in context.items():
+        if isinstance(value, cs.Container):
+            _detach_context(value, contexts)
+        else:
+            detached = _detach(value, contexts)
+            if detached is not value:
+                context[key] = detached
+
+
+def _detach(obj: t.Any, contexts: t.Set[int]) -> t.Any:
+    from .lazy import LazyValue, raw_field_value
+
+    if isinstance(obj, memoryview):
+        count_slow_path("detach_copy")
+        return obj.tobytes()
+    if isinstance(obj, LazyValue):
+        if isinstance(obj.raw, memoryview):
+            count_slow_path("detach_copy")
+            obj.raw = obj.raw.tobytes()
+        # the context references the stream of the input buffer and the values of the other fields
+        _detach_context(obj.context, contexts)
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        for field in dataclasses.fields(obj):
+            # lazy fields are not decoded, only their raw bytes are detached
+            value = raw_field_value(obj, field.name)
+            detached = _detach(value, contexts)
+            if detached is not value:
+                setattr(obj, field.name, detached)
+    elif isinstance(obj, list):
+        items: t.List[t.Any] = obj
+        for i, value in enumerate(items):
+            detached = _detach(value, contexts)
+            if detached is not value:
+                items[i] = detached
+    elif isinstance(obj, dict):
+        entries: t.Dict[t.Any, t.Any] = obj
+        for key, value in entries.items():
+            detached = _detach(value, contexts)
+            if detached is not value:
+                entries[key] = detached
+    return obj
+
+
+def detach(obj: T) -> T:
+    r"""
+    Copy all memoryview slices, that are still referenced by a parsed object, into bytes objects.
+
+    Objects that were parsed with "DataclassStruct(..., zerocopy=True)" reference the input buffer via memoryview
+    slices. After detaching, the object does not reference the input buffer anymore, so that it can be freed.
+    Nested dataclasses, lists and dicts are detached in place. Lazy fields, which were not accessed yet, keep
+    their raw bytes and their context, which are detached too. The object itself is returned (or a
+    bytes copy, if the object itself is a memoryview).
+
+    :param obj: parsed object
+
+    Example::
+
+        >>> import dataclasses
+        >>> from construct import GreedyBytes, Int8ub
+        >>> from construct_typed import DataclassMixin, DataclassStruct, csfield, detach
+        >>> @dataclasses.dataclass
+        ... class Frame(DataclassMixin):
+        ...     kind: int = csfield(Int8ub)
+        ...     payload: bytes = csfield(GreedyBytes)
+        >>> frame = DataclassStruct(Frame, zerocopy=True).parse(b"\x01payload")
+        >>> type(frame.payload)
+        <class 'memoryview'>
+        >>> type(detach(frame).payload)
+        <class 'bytes'>
+    """
+    return t.cast(T, _detach(obj, set()))
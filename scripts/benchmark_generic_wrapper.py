@@ -0,0 +1,101 @@
+"""
+Micro-benchmark of the runtime classes in construct_typed.generic_wrapper.
+
+Compares the classes of construct_typed with the plain construct classes and with the former implementation,
+which derived from "t.Generic". The times are the best of several repeats, in nanoseconds per operation.
+
+Usage: python scripts/benchmark_generic_wrapper.py
+"""
+import timeit
+import typing as t
+
+import construct as cs
+
+import construct_typed as cst
+
+T = t.TypeVar("T")
+U = t.TypeVar("U")
+
+
+# former implementation of the runtime classes (only at runtime, like in generic_wrapper, because the classes of the
+# stubs are already generics)
+if t.TYPE_CHECKING:
+    GenericConstruct = cs.Construct
+    GenericListContainer = cs.ListContainer
+else:
+
+    class GenericConstruct(t.Generic[T, U], cs.Construct):
+        pass
+
+    class GenericListContainer(t.Generic[T], cs.ListContainer):
+        pass
+
+
+class PlainTyped(cst.Construct[int, int]):
+    def _parse(self, stream: t.Any, context: t.Any, path: t.Any) -> int:
+        return 0
+
+
+class GenericTyped(GenericConstruct[int, int]):
+    def _parse(self, stream: t.Any, context: t.Any, path: t.Any) -> int:
+        return 0
+
+
+class Original(cs.Construct):
+    def _parse(self, stream: t.Any, context: t.Any, path: t.Any) -> int:
+        return 0
+
+
+items = list(range(8))
+samples = bytes(2 * 4096)
+benchmarks: t.Dict[str, t.Dict[str, t.Callable[[], t.Any]]] = {
+    "ListContainer(...)": {
+        "construct": lambda: cs.ListContainer(items),
+        "construct_typed": lambda: cst.ListContainer(items),
+        "t.Generic": lambda: GenericListContainer(items),
+    },
+    "Construct subclass instantiation": {
+        "construct": Original,
+        "construct_typed": PlainTyped,
+        "t.Generic": GenericTyped,
+    },
+    "Construct subclass parse": {
+        "construct": lambda construct=Original(): construct.parse(b""),
+        "construct_typed": lambda construct=PlainTyped(): construct.parse(b""),
+        "t.Generic": lambda construct=GenericTyped(): construct.parse(b""),
+    },
+    "isinstance(..., Construct)": {
+        "construct": lambda obj=Original(): isinstance(obj, cs.Construct),
+        "construct_typed": lambda obj=PlainTyped(): isinstance(obj, cst.Construct),
+        "t.Generic": lambda obj=GenericTyped(): isinstance(obj, GenericConstruct),
+    },
+    "Array parse (8 elements)": {
+        "construct": lambda construct=cs.Array(8, cs.Byte): construct.parse(bytes(8)),
+        "construct_typed": lambda construct=cst.Array(8, cs.Byte): construct.parse(bytes(8)),
+    },
+    "Array parse (4096 x Int16ul)": {
+        "construct": lambda construct=cs.Array(4096, cs.Int16ul): construct.parse(samples),
+        "construct_typed": lambda construct=cst.Array(4096, cs.Int16ul): construct.parse(samples),
+        "NumericArray": lambda construct=cst.NumericArray(4096, cs.Int16ul): construct.parse(samples),
+        "NumericArray numpy": lambda construct=cst.NumericArray(4096, cs.Int16ul, output="numpy"): construct.parse(
+            samples
+        ),
+    },
+}
+
+
+def measure(func: t.Callable[[], t.Any]) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main() -> None:
+    for name, variants in benchmarks.items():
+        print(name)
+        for variant, func in variants.items():
+            print(f"    {variant:<16} {measure(func):10.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Measures the import time of construct_typed in fresh interpreters.
+
+Every statement is executed in a new subprocess (so nothing is cached in sys.modules) and the best wall time of
+several runs is reported. The baseline is an empty interpreter start.
+
+Usage: python scripts/benchmark_import_time.py [runs]
+"""
+import subprocess
+import sys
+import time
+
+statements = {
+    "python (baseline)": "pass",
+    "import construct": "import construct",
+    "import construct_typed": "import construct_typed",
+    "construct_typed.EnumBase": "import construct_typed; construct_typed.EnumBase",
+    "construct_typed.DataclassStruct": "import construct_typed; construct_typed.DataclassStruct",
+    "from construct_typed import *": "from construct_typed import *",
+}
+
+
+def measure(statement: str, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    baseline = measure(statements["python (baseline)"], runs)
+    print(f"best of {runs} runs, in milliseconds")
+    for name, statement in statements.items():
+        duration = measure(statement, runs)
+        print(f"{name:<35} {duration * 1000:8.2f} ms  (+{(duration - baseline) * 1000:7.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
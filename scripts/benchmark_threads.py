@@ -0,0 +1,78 @@
+"""
+Benchmark of parsing records with a shared DataclassStruct in several threads.
+
+The same records are parsed by a ThreadPoolExecutor with 1, 2, 4 and 8 threads (every thread parses its share of
+the records), interpreted and compiled. The records contain enum values without a member, so pseudo members are
+looked up concurrently. The throughput is the best of several repeats, in records per second.
+
+With the GIL the throughput does not scale with the number of threads. The script also runs on a free-threaded
+build of Python (eg. "python3.13t"), but how the throughput scales there has not been measured yet.
+
+Usage: python scripts/benchmark_threads.py
+"""
+import concurrent.futures
+import dataclasses
+import sys
+import time
+import typing as t
+
+import construct as cs
+
+import construct_typed as cst
+
+
+class Kind(cst.EnumBase):
+    Data = 1
+    Ack = 2
+
+
+@dataclasses.dataclass
+class Record(cst.DataclassMixin):
+    kind: Kind = cst.csfield(cst.TEnum(cs.Int8ub, Kind))
+    length: int = cst.csfield(cs.Int16ub)
+    payload: bytes = cst.csfield(cs.Bytes(cs.this.length))
+    values: t.List[int] = cst.csfield(cs.Array(8, cs.Int32ub))
+
+
+RECORDS = 20_000
+THREAD_COUNTS = (1, 2, 4, 8)
+
+record_struct = cst.DataclassStruct(Record)
+samples = [
+    record_struct.build(Record(kind=Kind(i % 4), length=16, payload=bytes(16), values=list(range(8))))
+    for i in range(RECORDS)
+]
+
+
+def parse_all(parser: t.Callable[[bytes], t.Any], chunk: t.List[bytes]) -> int:
+    for sample in chunk:
+        parser(sample)
+    return len(chunk)
+
+
+def measure(parser: t.Callable[[bytes], t.Any], threads: int) -> float:
+    chunks = [samples[i::threads] for i in range(threads)]
+    best = float("inf")
+    parsed = 0
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        for _ in range(5):
+            start = time.perf_counter()
+            parsed = sum(executor.map(parse_all, [parser] * threads, chunks))
+            best = min(best, time.perf_counter() - start)
+    assert parsed == RECORDS
+    return RECORDS / best
+
+
+def main() -> None:
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}")
+    for name, parser in (("interpreted", record_struct.parse), ("compiled", record_struct.compile().parse)):
+        print(name)
+        single = measure(parser, 1)
+        for threads in THREAD_COUNTS:
+            throughput = single if threads == 1 else measure(parser, threads)
+            print(f"    {threads} threads {throughput:12.0f} records/s {throughput / single:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Measures the time of mypy (and pyright, if it is installed) against the stubs of construct, and checks that the
+compact expression stubs infer the same types as the full ones (with every measured type checker).
+
+For every variant of "expr.pyi" (the current file and the output of "expr_mixin_generator.py" with and without
+"--compact") the stubs are copied into a temporary directory, which is passed to the type checker ("MYPYPATH" for
+mypy, "stubPath" for pyright), so that the installed stubs are not used. The checked module is "tests/test_core.py"
+(or the given files) together with a generated module, which reveals the types of all expression operators.
+
+Reported are the best wall times of several runs, in seconds:
+
+- cold: without cache
+- warm: incremental run with a filled cache, after the checked module was modified
+
+Usage: python scripts/benchmark_type_checking.py [--runs N] [files ...]
+"""
+import argparse
+import itertools
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import typing as t
+
+import expr_mixin_generator
+
+ROOT = pathlib.Path(__file__).parent.parent
+STUBS = ROOT / "construct-stubs"
+
+operand_exprs = {
+    "int": "i",
+    "bool": "b",
+    "float": "f",
+}
+argument_exprs = ["1", "True", "1.0", "'x'", "i", "b", "f"]
+
+
+def probe_module() -> str:
+    """Module, which reveals the result types of all operators on typed expressions."""
+    lines = [
+        "from construct.expr import BinExpr",
+        "",
+        "def probe(i: BinExpr[int], b: BinExpr[bool], f: BinExpr[float]) -> None:",
+    ]
+    for op in expr_mixin_generator.operators_bin:
+        for lhs, rhs in itertools.product(operand_exprs.values(), argument_exprs):
+            lines.append(f"    reveal_type({lhs}.{op}({rhs}))")
+    for op in expr_mixin_generator.operators_uni:
+        for lhs in operand_exprs.values():
+            lines.append(f"    reveal_type({lhs}.{op}())")
+    return "\n".join(lines) + "\n"
+
+
+def make_stubs(directory: pathlib.Path, expr_source: t.Optional[str]) -> pathlib.Path:
+    stubs = directory / "construct"
+    shutil.copytree(STUBS, stubs)
+    if expr_source is not None:
+        stub = stubs / "expr.pyi"
+        stub.write_text(expr_mixin_generator.replace_class(stub.read_text(), expr_source))
+    return directory
+
+
+def run_mypy(stub_path: pathlib.Path, files: t.Sequence[pathlib.Path], cache_dir: pathlib.Path) -> str:
+    env = dict(os.environ, MYPYPATH=str(stub_path))
+    result = subprocess.run(
+        [sys.executable, "-m", "mypy", "--cache-dir", str(cache_dir), "--no-error-summary", *map(str, files)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def run_pyright(stub_path: pathlib.Path, files: t.Sequence[pathlib.Path]) -> str:
+    with tempfile.TemporaryDirectory() as project:
+        config = pathlib.Path(project) / "pyrightconfig.json"
+        config.write_text(f'{{"stubPath": "{stub_path}"}}')
+        result = subprocess.run(
+            ["pyright", "--project", str(config), *map(str, files)],
+            capture_output=True,
+            text=True,
+        )
+    return result.stdout
+
+
+def best_time(func: t.Callable[[], t.Any], runs: int, prepare: t.Callable[[], t.Any] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        prepare()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def revealed_types(output: str) -> t.List[str]:
+    return re.findall(r'Revealed type is "(.*)"', output)
+
+
+def pyright_revealed_types(output: str) -> t.List[str]:
+    return re.findall(r'information: Type of ".*" is "(.*)"', output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("files", nargs="*", type=pathlib.Path, default=[ROOT / "tests" / "test_core.py"])
+    args = parser.parse_args()
+
+    variants = {
+        "current": None,
+        "generated": expr_mixin_generator.generate(compact=False),
+        "compact": expr_mixin_generator.generate(compact=True),
+    }
+    pyright = shutil.which("pyright")
+    if pyright is None:
+        print("pyright is not installed, only mypy is measured")
+
+    revealed: t.Dict[t.Tuple[str, str], t.List[str]] = {}  # (type checker, variant) -> types
+    print(f"best of {args.runs} runs, in seconds")
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = pathlib.Path(tmp)
+        probe = workdir / "probe_expr.py"
+        probe.write_text(probe_module())
+        checked = workdir / "checked"
+        for name, expr_source in variants.items():
+            stub_path = make_stubs(workdir / name, expr_source)
+            overloads = (stub_path / "construct" / "expr.pyi").read_text().count("@t.overload")
+
+            # the checked files are copied, so that they can be modified for the warm runs
+            shutil.rmtree(checked, ignore_errors=True)
+            checked.mkdir()
+            files = [probe]
+            for file in args.files:
+                files.append(checked / file.name)
+                shutil.copy(file, files[-1])
+
+            cache_dir = workdir / f"cache-{name}"
+            cold = best_time(
+                lambda: run_mypy(stub_path, files, cache_dir),
+                args.runs,
+                prepare=lambda: shutil.rmtree(cache_dir, ignore_errors=True),
+            )
+            revealed["mypy", name] = revealed_types(run_mypy(stub_path, [probe], workdir / "cache-probe"))
+            shutil.rmtree(workdir / "cache-probe")
+
+            def touch() -> None:
+                with open(files[-1], "a") as f:
+                    f.write("\n")
+
+            warm = best_time(lambda: run_mypy(stub_path, files, cache_dir), args.runs, prepare=touch)
+            line = f"{name:<10} {overloads:4d} overloads   mypy cold {cold:6.2f}  warm {warm:6.2f}"
+            if pyright is not None:
+                pyright_time = best_time(lambda: run_pyright(stub_path, files), args.runs)
+                line += f"   pyright {pyright_time:6.2f}"
+                revealed["pyright", name] = pyright_revealed_types(run_pyright(stub_path, [probe]))
+            print(line)
+
+    # the compact overloads must infer the same types as the full overloads
+    for (checker, name), types in revealed.items():
+        reference = revealed[checker, "generated"]
+        differences = [
+            (index, expected, found) for index, (expected, found) in enumerate(zip(reference, types)) if expected != found
+        ]
+        status = "same" if not differences and len(types) == len(reference) else f"{len(differences)} differences"
+        print(f"{checker} inferred types of {name}: {status} as generated ({len(types)} expressions)")
+        for index, expected, found in differences[:10]:
+            print(f"    #{index}: {expected} -> {found}")
+
+
+if __name__ == "__main__":
+    main()
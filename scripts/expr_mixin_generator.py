@@ -1,4 +1,24 @@
+"""
+Generates the overloads of the class "ExprMixin" in "construct-stubs/expr.pyi".
 
+The overloads are derived from the results of the operators on the builtin types int, bool and float. In the
+default mode every combination of the types gets its own overload. With "--compact" the overloads are merged,
+where the type checkers infer the same result types anyway:
+
+- "ConstOrCallable[int]" also accepts bool and "ConstOrCallable[float]" also accepts int and bool (numeric
+  promotion), so an overload for a wider type replaces the overloads of the narrower types with the same result
+- left hand sides with the same overloads share them with a union of self types
+- operators without any typed overload get a single plain method instead of overloads
+
+Combinations, which are not supported by the builtin type (eg. int + float returns NotImplemented), fall back to
+"BinExpr[t.Any]" in both modes.
+
+Usage: python scripts/expr_mixin_generator.py [--compact] [--write]
+"""
+import argparse
+import itertools
+import pathlib
+import typing as t
 
 testobjs = [
     int(10),
@@ -51,51 +71,175 @@ operators_uni = [
     "__inv__",
 ]
 
+# "object" already defines these methods with another signature. mypy reports the incompatible override at the first
+# overload, pyright at the last one.
+operators_override = {"__eq__", "__ne__"}
+MYPY_IGNORE = "  # type: ignore[override]"
+PYRIGHT_IGNORE = "  # pyright: ignore[reportIncompatibleMethodOverride]"
 
-def create_overload_bin(op, lhs=None, rhs=None):
-    if lhs is None and rhs is None:
-        print("    @t.overload")
-        print(f"    def {op}(self, other: t.Any) -> BinExpr[t.Any]: ...")
-    else:
-        try:
-            result = getattr(lhs, op)(rhs)
-            lhs_type = type(lhs).__name__
-            rhs_type = type(rhs).__name__
-            result_type = type(result).__name__
-            if result_type != "NotImplementedType":
-                print("    @t.overload")
-                print(f"    def {op}(self: ExprMixin[{lhs_type}], other: ConstOrCallable[{rhs_type}]) -> BinExpr[{result_type}]: ...")
-        except AttributeError:
-            pass
-
-def create_overload_uni(op, obj=None):
-    if obj is None:
-        print("    @t.overload")
-        print(f"    def {op}(self) -> UniExpr[t.Any]: ...")
+# types, which are accepted by a parameter of type "ConstOrCallable[...]" (bool is an int, int is promoted to float)
+accepted_types = {
+    "bool": {"bool"},
+    "int": {"int", "bool"},
+    "float": {"float", "int", "bool"},
+}
+
+STUB_FILE = pathlib.Path(__file__).parent.parent / "construct-stubs" / "expr.pyi"
+
+Overloads = t.List[t.Tuple[str, str]]  # (type of the parameter, result type)
+
+
+def result_bin(op: str, lhs: t.Any, rhs: t.Any) -> t.Optional[str]:
+    try:
+        result = getattr(lhs, op)(rhs)
+    except AttributeError:
+        return None
+    if result is NotImplemented:
+        return None
+    return type(result).__name__
+
+
+def result_uni(op: str, obj: t.Any) -> t.Optional[str]:
+    try:
+        result = getattr(obj, op)()
+    except AttributeError:
+        return None
+    return type(result).__name__
+
+
+def resolve(overloads: Overloads, rhs_type: str) -> t.Optional[str]:
+    """Result type of the first matching overload, like the type checkers select it (None is the fallback)."""
+    for param_type, result_type in overloads:
+        if rhs_type in accepted_types[param_type]:
+            return result_type
+    return None
+
+
+def full_overloads(op: str, lhs: t.Any) -> Overloads:
+    """One overload per supported right hand side type."""
+    overloads: Overloads = []
+    for rhs in testobjs:
+        result = result_bin(op, lhs, rhs)
+        if result is None:
+            continue
+        # overloads, which are shadowed by a previous overload with another result, are never selected
+        # (eg. bool & bool, because "ConstOrCallable[int]" accepts bool), so the type checkers report them
+        shadowed = resolve(overloads, type(rhs).__name__)
+        if shadowed is not None and shadowed != result:
+            continue
+        overloads.append((type(rhs).__name__, result))
+    return overloads
+
+
+def compact_overloads(full: Overloads) -> Overloads:
+    """Smallest ordered list of overloads, which resolves every right hand side to the same result as the full list."""
+    results = {type(rhs).__name__: resolve(full, type(rhs).__name__) for rhs in testobjs}
+    candidates = [(param, result) for param, result in results.items() if result is not None]
+    for length in range(len(candidates) + 1):
+        for overloads in itertools.permutations(candidates, length):
+            if all(resolve(list(overloads), rhs) == result for rhs, result in results.items()):
+                return list(overloads)
+    raise AssertionError("the full list of overloads is always a solution")
+
+
+def self_type(lhs_types: t.Sequence[str]) -> str:
+    if len(lhs_types) == 1:
+        return f"ExprMixin[{lhs_types[0]}]"
+    return "t.Union[" + ", ".join(f"ExprMixin[{lhs}]" for lhs in lhs_types) + "]"
+
+
+def header(op: str) -> str:
+    return f"    # {op} ".ljust(120, "#")
+
+
+def generate_bin(op: str, compact: bool) -> t.List[str]:
+    overloads: t.List[t.Tuple[t.List[str], str, str]] = []  # (lhs types, param type, result type)
+    if compact:
+        grouped: t.Dict[t.Tuple[t.Tuple[str, str], ...], t.List[str]] = {}
+        for lhs in testobjs:
+            key = tuple(compact_overloads(full_overloads(op, lhs)))
+            grouped.setdefault(key, []).append(type(lhs).__name__)
+        for key, lhs_types in grouped.items():
+            overloads.extend((lhs_types, param, result) for param, result in key)
     else:
-        try:
-            result = getattr(obj, op)()
-            obj_type = type(obj).__name__
-            result_type = type(result).__name__
-            if result_type != "NotImplementedType":
-                print("    @t.overload")
-                print(f"    def {op}(self: ExprMixin[{obj_type}]) -> BinExpr[{result_type}]: ...")
-        except AttributeError:
-            pass
-
-
-print("class ExprMixin(t.Generic[ReturnType], object):")
-for op in operators_bin:
-    print(f"    # {op} ".ljust(120, "#"))
-    for lhs in testobjs:
-        for rhs in testobjs:
-            create_overload_bin(op, lhs, rhs)
-    create_overload_bin(op)
-    print("")
-
-for op in operators_uni:
-    print(f"    # {op} ".ljust(120, "#"))
+        for lhs in testobjs:
+            for param, result in full_overloads(op, lhs):
+                overloads.append(([type(lhs).__name__], param, result))
+
+    override = op in operators_override
+    lines = [header(op)]
+    if not overloads:
+        lines.append(f"    def {op}(self, other: t.Any) -> BinExpr[t.Any]: ...{MYPY_IGNORE if override else ''}")
+        return lines
+    for index, (lhs_types, param, result) in enumerate(overloads):
+        lines.append(f"    @t.overload{MYPY_IGNORE if override and index == 0 else ''}")
+        lines.append(
+            f"    def {op}(self: {self_type(lhs_types)}, other: ConstOrCallable[{param}]) -> BinExpr[{result}]: ..."
+        )
+    lines.append("    @t.overload")
+    lines.append(f"    def {op}(self, other: t.Any) -> BinExpr[t.Any]: ...{PYRIGHT_IGNORE if override else ''}")
+    return lines
+
+
+def generate_uni(op: str, compact: bool) -> t.List[str]:
+    overloads: t.List[t.Tuple[t.List[str], str]] = []  # (lhs types, result type)
     for obj in testobjs:
-        create_overload_uni(op, obj)
-    create_overload_uni(op)
-    print("")
\ No newline at end of file
+        result = result_uni(op, obj)
+        if result is None:
+            continue
+        if compact:
+            for lhs_types, other_result in overloads:
+                if other_result == result:
+                    lhs_types.append(type(obj).__name__)
+                    break
+            else:
+                overloads.append(([type(obj).__name__], result))
+        else:
+            overloads.append(([type(obj).__name__], result))
+
+    lines = [header(op)]
+    if not overloads:
+        lines.append(f"    def {op}(self) -> UniExpr[t.Any]: ...")
+        return lines
+    for lhs_types, result in overloads:
+        lines.append("    @t.overload")
+        lines.append(f"    def {op}(self: {self_type(lhs_types)}) -> BinExpr[{result}]: ...")
+    lines.append("    @t.overload")
+    lines.append(f"    def {op}(self) -> BinExpr[t.Any]: ...")
+    return lines
+
+
+def generate(compact: bool = False) -> str:
+    """Source of the class "ExprMixin"."""
+    lines = ["class ExprMixin(t.Generic[ReturnType], object):"]
+    for op in operators_bin:
+        lines.extend(generate_bin(op, compact))
+        lines.append("")
+    for op in operators_uni:
+        lines.extend(generate_uni(op, compact))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def replace_class(stub: str, source: str) -> str:
+    """Replace the class "ExprMixin" in the source of "expr.pyi"."""
+    start = stub.index("class ExprMixin(")
+    end = stub.index("class UniExpr(")
+    return stub[:start] + source + "\n" + stub[end:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--compact", action="store_true", help="merge overloads with the same inference")
+    parser.add_argument("--write", action="store_true", help=f"replace the class in {STUB_FILE}")
+    args = parser.parse_args()
+
+    source = generate(args.compact)
+    if args.write:
+        STUB_FILE.write_text(replace_class(STUB_FILE.read_text(), source))
+    else:
+        print(source)
+
+
+if __name__ == "__main__":
+    main()
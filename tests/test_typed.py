@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 # pyright: strict
+import ast
 import dataclasses
 import enum
+import io
+import pathlib
 import textwrap
 import typing as t
 
 import construct as cs
+import construct.expr
+import pytest
 
 import construct_typed as cst
 from construct_typed import DataclassBitStruct, DataclassMixin, DataclassStruct, csfield
@@ -574,3 +579,1405 @@ def test_tenum_flags_docstring() -> None:
     assert TestEnum.Value_NoDoc.__doc__ == ""
     assert TestEnum.Value_NoDoc2.__doc__ == ""
     assert TestEnum(8).__doc__ == "missing value"
+
+
+def test_to_dict_from_dict() -> None:
+    class Orientation(cst.EnumBase):
+        HORIZONTAL = 0
+        VERTICAL = 1
+
+    class Options(cst.FlagsEnumBase):
+        one = 1
+        two = 2
+
+    @dataclasses.dataclass
+    class Pixel(DataclassMixin):
+        value: int = csfield(cs.Int8ub)
+
+    @dataclasses.dataclass
+    class Image(DataclassMixin):
+        signature: bytes = csfield(cs.Const(b"BMP"))
+        orientation: Orientation = csfield(cst.TEnum(cs.Int8ub, Orientation))
+        options: Options = csfield(cst.TFlagsEnum(cs.Int8ub, Options))
+        width: int = csfield(cs.Int8ub, doc="width of the image")
+        height: int = csfield(cs.Int8ub)
+        pixels: t.List[Pixel] = csfield(
+            cs.Array(cs.this.width * cs.this.height, DataclassStruct(Pixel))
+        )
+        raw: bytes = csfield(cs.Bytes(2))
+        values: t.List[int] = csfield(cs.Array(2, cs.Int8ub))
+
+    format = DataclassStruct(Image)
+    obj = format.parse(b"BMP\x01\x03\x02\x01\x01\x02\xab\xcd\x03\x04")
+
+    d = cst.to_dict(obj)
+    assert d == {
+        "signature": b"BMP",
+        "orientation": 1,
+        "options": 3,
+        "width": 2,
+        "height": 1,
+        "pixels": [{"value": 1}, {"value": 2}],
+        "raw": b"\xab\xcd",
+        "values": [3, 4],
+    }
+    assert type(d["orientation"]) is int
+    assert type(d["options"]) is int
+    assert type(d["pixels"]) is list
+    assert type(d["values"]) is list
+    assert cst.from_dict(Image, d) == obj
+    assert format.build(cst.from_dict(Image, d)) == format.build(obj)
+
+    d = cst.to_dict(obj, enum_as="name", bytes_as="hex")
+    assert d["orientation"] == "VERTICAL"
+    assert d["raw"] == "abcd"
+    assert d["signature"] == "424d50"
+    assert cst.from_dict(Image, d) == obj
+
+    # pseudo members of enums are converted by their name
+    obj.orientation = Orientation(7)
+    assert cst.to_dict(obj, enum_as="name")["orientation"] == "7"
+    assert cst.from_dict(Image, cst.to_dict(obj, enum_as="name")) == obj
+
+    # converters are cached per dataclass type
+    plans = t.cast(t.Any, DataclassStruct(Image))._plans
+    assert ("to_dict", "value", "bytes") in plans
+    assert ("from_dict",) in plans
+
+    # dicts with keys, which are not strings (eg. from an Adapter)
+    class Mapping(cst.Adapter[t.List[int], t.List[int], t.Dict[int, int], t.Dict[int, int]]):
+        def _decode(self, obj: t.List[int], context: t.Any, path: t.Any) -> t.Dict[int, int]:
+            return dict(enumerate(obj))
+
+        def _encode(self, obj: t.Dict[int, int], context: t.Any, path: t.Any) -> t.List[int]:
+            return [obj[i] for i in range(len(obj))]
+
+    @dataclasses.dataclass
+    class Table(DataclassMixin):
+        entries: t.Dict[int, int] = csfield(Mapping(cs.Array(2, cs.Int8ub)))
+
+    table = DataclassStruct(Table).parse(b"\x05\x06")
+    assert cst.to_dict(table) == {"entries": {0: 5, 1: 6}}
+
+    assert raises(cst.to_dict, Pixel) == TypeError
+    assert raises(cst.from_dict, dict, {}) == TypeError
+
+
+def test_static_layout_patch_field() -> None:
+    @dataclasses.dataclass
+    class Frame(DataclassMixin):
+        magic: bytes = csfield(cs.Const(b"FR"))
+        seq: int = csfield(cs.Int16ub)
+        flags: int = csfield(cs.Int8ub)
+        length: int = csfield(cs.Int8ub)
+        data: bytes = csfield(cs.Bytes(cs.this.length))
+        crc: int = csfield(cs.Int8ub)
+
+    format = DataclassStruct(Frame)
+    layout = cst.static_layout(format)
+    assert list(layout) == ["magic", "seq", "flags", "length"]
+    assert (layout["seq"].offset, layout["seq"].size) == (2, 2)
+    assert cst.static_layout(format) is layout
+
+    record = format.build(Frame(seq=1, flags=2, length=3, data=b"abc", crc=4))
+    buffer = bytearray(b"\xff" + record)
+    cst.patch_field(format, buffer, "seq", 0x1234, offset=1)
+    cst.patch_field(format, buffer, "flags", 7, offset=1)
+    assert format.parse(buffer[1:]) == Frame(seq=0x1234, flags=7, length=3, data=b"abc", crc=4)
+    assert buffer[0] == 0xFF
+
+    # reversed structs have other offsets
+    reverse = DataclassStruct(Frame, reverse=True)
+    assert list(cst.static_layout(reverse)) == ["crc"]
+
+    assert raises(cst.patch_field, format, buffer, "data", b"xyz") == cs.SizeofError
+    assert raises(cst.patch_field, format, buffer, "unknown", 1) == KeyError
+    assert raises(cst.patch_field, format, buffer, "seq", 0x10000) == cs.FormatFieldError
+    assert raises(cst.patch_field, format, bytearray(2), "seq", 1) == cs.StreamError
+    assert raises(cst.patch_field, format, bytes(record), "seq", 1) == TypeError
+
+    # fields, which need the context, can not be patched
+    def scaled(obj: int, ctx: t.Any) -> int:
+        return obj * int(ctx.scale)
+
+    def unscaled(obj: int, ctx: t.Any) -> int:
+        return obj // int(ctx.scale)
+
+    @dataclasses.dataclass
+    class Scaled(DataclassMixin):
+        scale: int = csfield(cs.Int8ub)
+        value: int = csfield(cs.ExprAdapter(cs.Int8ub, scaled, unscaled))
+
+    scaled_format = DataclassStruct(Scaled)
+    buffer = bytearray(scaled_format.build(Scaled(scale=2, value=4)))
+    assert raises(cst.patch_field, scaled_format, buffer, "value", 6) == cs.ConstructError
+    cst.patch_field(scaled_format, buffer, "scale", 3)
+    assert scaled_format.parse(buffer) == Scaled(scale=3, value=6)
+
+    # the checksums over the field (and over these checksums) are updated
+    import zlib
+
+    @dataclasses.dataclass
+    class Checked(DataclassMixin):
+        seq: int = csfield(cs.Int16ub)
+        flags: int = csfield(cs.Int8ub)
+        crc: int = csfield(cst.FieldChecksum(cs.Int32ub, zlib.crc32, "seq", "flags"))
+        other: int = csfield(cs.Int8ub)
+        total: int = csfield(cst.FieldChecksum(cs.Int32ub, zlib.adler32, "crc", "other"))
+        length: int = csfield(cs.Int8ub)
+        data: bytes = csfield(cs.Bytes(cs.this.length))
+        tail_crc: int = csfield(cst.FieldChecksum(cs.Int32ub, zlib.crc32, "length", "data"))
+
+    checked = DataclassStruct(Checked)
+    buffer = bytearray(checked.build(Checked(seq=1, flags=2, other=3, length=2, data=b"ab")))
+    cst.patch_field(checked, buffer, "seq", 0x1234)
+    assert buffer == checked.build(Checked(seq=0x1234, flags=2, other=3, length=2, data=b"ab"))
+    cst.patch_field(checked, buffer, "other", 9)
+    assert buffer == checked.build(Checked(seq=0x1234, flags=2, other=9, length=2, data=b"ab"))
+    assert checked.parse(buffer).other == 9
+    # the checksum over "length" has no static offset
+    assert raises(cst.patch_field, checked, buffer, "length", 2) == cs.SizeofError
+    assert raises(cst.patch_field, checked, buffer, "crc", 0) == cs.ConstructError
+
+
+def test_dataclass_struct_zerocopy() -> None:
+    @dataclasses.dataclass
+    class Frame(DataclassMixin):
+        length: int = csfield(cs.Int8ub)
+        header: bytes = csfield(cs.Bytes(cs.this.length), doc="header bytes")
+        payload: bytes = csfield(cs.GreedyBytes)
+
+    format = DataclassStruct(Frame, zerocopy=True)
+    buffer = bytearray(b"\x02abpayload")
+    obj = format.parse(buffer)
+    assert isinstance(obj.header, memoryview)
+    assert isinstance(obj.payload, memoryview)
+    assert obj.header == b"ab"
+    assert obj.payload == b"payload"
+    assert format.subcon.subcons[1].docs == "header bytes"
+
+    # the parsed slices reference the input buffer
+    buffer[1:3] = b"xy"
+    assert obj.header == b"xy"
+
+    # building from memoryview slices
+    assert format.build(obj) == b"\x02xypayload"
+    assert raises(format.build, Frame(length=3, header=b"ab", payload=b"")) == cs.StreamError
+
+    # detach copies the slices into bytes
+    assert cst.detach(obj) is obj
+    assert type(obj.header) is bytes and type(obj.payload) is bytes
+    buffer[1:3] = b"ab"
+    assert obj == Frame(length=2, header=b"xy", payload=b"payload")
+
+    # other streams and the default behave like the normal Bytes
+    assert type(format.parse_stream(io.BytesIO(b"\x01ab")).header) is bytes
+    assert type(DataclassStruct(Frame).parse(b"\x01ab").header) is bytes
+    assert cst.to_dict(format.parse(b"\x01ab")) == {"length": 1, "header": b"a", "payload": b"b"}
+
+    # BufferStream
+    stream = cst.BufferStream(b"abcdef")
+    assert stream.read(2) == b"ab"
+    assert stream.readview(2) == b"cd"
+    assert stream.seek(-1, io.SEEK_END) == 5
+    assert stream.read() == b"f"
+    assert stream.tell() == 6
+
+
+def test_csfield_lazy() -> None:
+    import gc
+    import weakref
+
+    from construct_typed.lazy import LazyValue
+
+    decoded: t.List[int] = []
+
+    @dataclasses.dataclass
+    class Inner(DataclassMixin):
+        a: int = csfield(cs.Int8ub)
+        b: int = csfield(cs.Int8ub, parsed=lambda obj, ctx: decoded.append(obj))
+
+    @dataclasses.dataclass
+    class Outer(DataclassMixin):
+        length: int = csfield(cs.Int8ub)
+        inner: Inner = csfield(DataclassStruct(Inner), lazy=True)
+        text: str = csfield(cs.PaddedString(cs.this.length, "ascii"), lazy=True)
+        dynamic: str = csfield(cs.PascalString(cs.Int8ub, "ascii"), lazy=True)
+        tail: int = csfield(cs.Int8ub)
+
+    format = DataclassStruct(Outer)
+    data = b"\x03\x01\x02abc\x02xy\x09"
+    obj = format.parse(data)
+    assert decoded == []
+    assert obj.tail == 9
+    assert isinstance(obj.__dict__["dynamic"], LazyValue)  # size from the length prefix
+    assert obj.__dict__["dynamic"].raw == b"\x02xy"
+    assert obj.dynamic == "xy"
+
+    # untouched lazy fields are built from the raw bytes
+    assert format.build(obj) == data
+    assert decoded == []
+
+    # decoded on first access, then cached
+    assert obj.inner == Inner(a=1, b=2)
+    count = len(decoded)
+    assert count > 0
+    assert obj.inner is obj.inner
+    assert len(decoded) == count
+    assert obj.text == "abc"
+
+    obj.inner.a = 5
+    assert format.build(obj) == b"\x03\x05\x02abc\x02xy\x09"
+    assert format.build(Outer(length=1, inner=Inner(1, 2), text="z", dynamic="", tail=0)) == (
+        b"\x01\x01\x02z\x00\x00"
+    )
+    assert format.parse(data) == Outer(length=3, inner=Inner(1, 2), text="abc", dynamic="xy", tail=9)
+
+    # lazy fields with zero-copy parsing
+    zerocopy = DataclassStruct(Outer, zerocopy=True)
+    buffer = bytearray(data)
+    obj = zerocopy.parse(buffer)
+    assert cst.detach(obj) is obj
+    assert isinstance(obj.__dict__["inner"].raw, bytes)
+    gc.collect()  # the context of "Struct" references itself ("_root")
+    buffer.extend(b"\x00")  # the input buffer is not exported anymore, not even by the contexts of the lazy fields
+    assert obj.inner == Inner(a=1, b=2)
+    assert obj.text == "abc"
+
+    # undecoded lazy fields do not keep the input stream alive
+    @dataclasses.dataclass
+    class Header(DataclassMixin):
+        kind: int = csfield(cs.Int8ub)
+
+    @dataclasses.dataclass
+    class Record(DataclassMixin):
+        header: Header = csfield(DataclassStruct(Header))
+        inner: Inner = csfield(DataclassStruct(Inner), lazy=True)
+        payload: bytes = csfield(cs.Bytes(cs.this.header.kind), lazy=True)
+
+    stream = io.BytesIO(b"\x03\x01\x02abc")
+    ref = weakref.ref(stream)
+    record = DataclassStruct(Record).parse_stream(stream)
+    del stream
+    gc.collect()
+    assert ref() is None
+    assert "_io" not in record.__dict__["payload"].context
+    assert record.payload == b"abc"
+    assert record.inner == Inner(a=1, b=2)
+
+    # fields without a known size are parsed eagerly
+    @dataclasses.dataclass
+    class Unsized(DataclassMixin):
+        text: str = csfield(cs.CString("ascii"), lazy=True)
+        prefixed: bytes = csfield(cs.Prefixed(cs.Int8ub, cs.GreedyBytes, includelength=True), lazy=True)
+
+    with cst.count_slow_paths() as counts:
+        obj2 = DataclassStruct(Unsized).parse(b"ab\x00\x03xy")
+    assert counts == {"lazy_eager_parse": 1}
+    assert obj2.__dict__["text"] == "ab"
+    assert isinstance(obj2.__dict__["prefixed"], LazyValue)
+    assert obj2.prefixed == b"xy"
+
+
+def test_dataclass_switch() -> None:
+    class MsgType(cst.EnumBase):
+        Ping = 1
+        Data = 2
+        Close = 3
+
+    @dataclasses.dataclass
+    class Ping(DataclassMixin):
+        seq: int = csfield(cs.Int8ub)
+
+    @dataclasses.dataclass
+    class Data(DataclassMixin):
+        length: int = csfield(cs.Int8ub)
+        data: bytes = csfield(cs.Bytes(cs.this.length))
+
+    @dataclasses.dataclass
+    class SubPing(Ping):
+        pass
+
+    tag = cst.TEnum(cs.Int8ub, MsgType)
+    format: cst.DataclassSwitch[t.Union[Ping, Data]] = cst.DataclassSwitch(
+        tag, {MsgType.Ping: Ping, MsgType.Data: Data}
+    )
+    common(format, b"\x01\x07", Ping(seq=7))
+    common(format, b"\x02\x02ab", Data(length=2, data=b"ab"), cs.SizeofError)
+    assert format.build(SubPing(seq=1)) == b"\x01\x01"
+    assert raises(format.parse, b"\x03") == cs.SwitchError
+    assert raises(format.parse, b"\x09") == cs.SwitchError
+    assert raises(format.build, cst.UnknownCase(MsgType.Close, b"")) == cs.SwitchError
+    assert raises(format.build, Data) == cs.SwitchError
+
+    # with default for unknown tags
+    default = cst.DataclassSwitch(tag, {MsgType.Ping: Ping}, cs.GreedyBytes)
+    common(default, b"\x03xyz", cst.UnknownCase(MsgType.Close, b"xyz"), cs.SizeofError)
+    common(default, b"\x09", cst.UnknownCase(MsgType(9), b""), cs.SizeofError)
+    common(default, b"\x01\x07", Ping(seq=7), cs.SizeofError)
+
+    # within a compiled struct
+    @dataclasses.dataclass
+    class Frame(DataclassMixin):
+        crc: int = csfield(cs.Int8ub)
+        msg: t.Union[Ping, Data, cst.UnknownCase] = csfield(default)
+
+    compiled = DataclassStruct(Frame).compile()
+    assert compiled.parse(b"\xff\x01\x07") == Frame(crc=0xFF, msg=Ping(seq=7))
+    assert compiled.parse(b"\x00\x05ab") == Frame(crc=0, msg=cst.UnknownCase(MsgType(5), b"ab"))
+    assert compiled.build(Frame(crc=0xFF, msg=Ping(seq=7))) == b"\xff\x01\x07"
+    assert compiled.build(Frame(crc=0, msg=cst.UnknownCase(MsgType(5), b"ab"))) == b"\x00\x05ab"
+
+    compiled_switch = default.compile()
+    assert "parse_dispatch_" in (t.cast(cs.Compiled, compiled_switch).source or "")
+    assert compiled_switch.parse(b"\x01\x07") == Ping(seq=7)
+    assert compiled_switch.parse(b"\x05ab") == cst.UnknownCase(MsgType(5), b"ab")
+    assert compiled_switch.build(Ping(seq=7)) == b"\x01\x07"
+    assert compiled_switch.build(SubPing(seq=7)) == b"\x01\x07"
+
+    assert raises(cst.DataclassSwitch, tag, {MsgType.Ping: Ping, MsgType.Data: Ping}) == ValueError
+
+
+def test_dataclass_select() -> None:
+    @dataclasses.dataclass
+    class Png(DataclassMixin):
+        magic: bytes = csfield(cs.Const(b"\x89PNG"))
+        version: int = csfield(cs.Int8ub)
+
+    @dataclasses.dataclass
+    class Gif(DataclassMixin):
+        magic: bytes = csfield(cs.Const(b"GIF"))
+        version: int = csfield(cs.Int8ub)
+
+    @dataclasses.dataclass
+    class Gif89(DataclassMixin):
+        magic: bytes = csfield(cs.Const(b"GIF"))
+        submagic: int = csfield(cs.Const(0x38, cs.Int8ub), doc="longer prefix")
+        version: int = csfield(cs.Int8ub)
+
+    format = cst.DataclassSelect[t.Union[Png, Gif, Gif89]](Png, Gif)
+    format.register(Gif89)
+    common(format, b"\x89PNG\x01", Png(version=1))
+    common(format, b"GIF\x01", Gif(version=1))
+    common(format, b"GIF\x38\x02", Gif89(version=2))
+    assert format.recognize(b"GIF\x38") is Gif89
+    assert format.recognize(b"GI") is None
+    assert raises(format.parse, b"BM\x00\x00\x00") == cs.SelectError
+    assert raises(format.parse, b"") == cs.SelectError
+    assert raises(format.build, Gif89) == cs.SelectError
+
+    # the stream position is restored after looking up the prefix
+    nested = cs.Sequence(cs.Byte, format, cs.Byte)
+    assert nested.parse(b"\x00GIF\x05\x07") == [0, Gif(version=5), 7]
+
+    assert raises(format.register, Gif) == ValueError
+
+    @dataclasses.dataclass
+    class NoMagic(DataclassMixin):
+        version: int = csfield(cs.Int8ub)
+
+    assert raises(cst.DataclassSelect, NoMagic) == ValueError
+
+
+def test_compile_cached(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    class Kind(cst.EnumBase):
+        A = 1
+        B = 2
+
+    @dataclasses.dataclass
+    class Item(DataclassMixin):
+        x: int = csfield(cs.Int16ub)
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+
+    @dataclasses.dataclass
+    class Frame(DataclassMixin):
+        magic: bytes = csfield(cs.Const(b"FR"))
+        count: int = csfield(cs.Int8ub)
+        items: t.List[Item] = csfield(cs.Array(cs.this.count, DataclassStruct(Item)))
+        data: bytes = csfield(cs.GreedyBytes)
+
+    data = b"FR\x02\x00\x01\x01\x00\x02\x02xyz"
+    obj = Frame(count=2, items=[Item(1, Kind.A), Item(2, Kind.B)], data=b"xyz")
+    format = DataclassStruct(Frame)
+
+    fingerprint = cst.schema_fingerprint(format)
+    assert fingerprint is not None
+    assert cst.schema_fingerprint(DataclassStruct(Frame)) == fingerprint
+    assert cst.schema_fingerprint(DataclassStruct(Frame, reverse=True)) != fingerprint
+
+    compiled = cst.compile_cached(format, str(tmp_path))
+    assert [p.name for p in tmp_path.iterdir()] == [f"{fingerprint}.marshal"]
+    assert compiled.parse(data) == obj
+    assert compiled.build(obj) == data
+
+    # the same instance is compiled only once per process
+    assert cst.compile_cached(format, str(tmp_path)) is compiled
+    assert format.compile() is compiled
+
+    # the compilation of a later process (with new instances) is loaded from the cache
+    cst.clear_schema_cache()
+    cached = cst.compile_cached(DataclassStruct(Frame), str(tmp_path))
+    assert t.cast(t.Any, cached).module.__name__ == f"construct_typed_compiled_{fingerprint}"
+    assert cached.parse(data) == obj
+    assert cached.build(obj) == data
+    assert raises(cached.build, Item(1, Kind.A)) == TypeError
+
+    # the loaded compilation is kept, so the cache is not read again
+    def no_open(*args: t.Any, **kwargs: t.Any) -> t.NoReturn:
+        raise AssertionError("the cache is read again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("builtins.open", no_open)
+        assert cst.compile_cached(DataclassStruct(Frame), str(tmp_path)) is cached
+        assert DataclassStruct(Frame).compile() is cached
+
+    # invalid cache entries are replaced
+    (tmp_path / f"{fingerprint}.marshal").write_bytes(b"invalid")
+    for _ in range(2):
+        cst.clear_schema_cache()
+        assert cst.compile_cached(DataclassStruct(Frame), str(tmp_path)).parse(data) == obj
+
+    # schemas without a stable fingerprint are compiled without cache
+    marker = object()
+    unstable: "cs.Computed[int]" = cs.Computed(lambda ctx: id(marker))
+    assert cst.schema_fingerprint(unstable) is None
+
+    # adapters of the user are linked as a whole, because they may override "_parse"/"_build"
+    class Doubled(cst.Adapter[int, int, int, int]):
+        def _decode(self, obj: int, context: t.Any, path: t.Any) -> int:
+            return obj * 2
+
+        def _encode(self, obj: int, context: t.Any, path: t.Any) -> int:
+            return obj // 2
+
+        def _parse(self, stream: t.Any, context: t.Any, path: t.Any) -> int:
+            return super()._parse(stream, context, path) + 1
+
+    @dataclasses.dataclass
+    class Custom(DataclassMixin):
+        value: int = csfield(Doubled(cs.Int8ub))
+
+    custom_dir = tmp_path / "custom"
+    customs = [DataclassStruct(Custom).compile()]
+    for _ in range(2):
+        cst.clear_schema_cache()
+        customs.append(cst.compile_cached(DataclassStruct(Custom), str(custom_dir)))
+    for custom in customs:
+        assert custom.parse(b"\x03") == Custom(7)
+        assert custom.build(Custom(6)) == b"\x03"
+    assert len(list(custom_dir.iterdir())) == 1
+
+
+def test_lazy_import() -> None:
+    import subprocess
+    import sys
+
+    code = textwrap.dedent(
+        """
+        import sys
+        import construct_typed
+        assert "construct" not in sys.modules
+        assert "construct_typed.dataclass_struct" not in sys.modules
+        construct_typed.DataclassStruct
+        assert "construct_typed.dataclass_struct" in sys.modules
+        assert "construct_typed.compile_cache" not in sys.modules
+
+        # the modules of the optional features are not imported by a plain DataclassStruct
+        import dataclasses
+        import construct as cs
+        @dataclasses.dataclass
+        class Image(construct_typed.DataclassMixin):
+            width: int = construct_typed.csfield(cs.Int8ub)
+        format = construct_typed.DataclassStruct(Image)
+        assert format.build(format.parse(b"\\x01")) == b"\\x01"
+        for name in ("bitfields", "checksum", "expressions", "lazy", "metrics", "tenum", "zerocopy"):
+            assert f"construct_typed.{name}" not in sys.modules, name
+        """
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert raises(getattr, cst, "unknown") == AttributeError
+    assert set(cst.__all__) <= set(dir(cst))
+
+    # every public name resolves, and the imports for type checkers match the lazy names
+    assert all(getattr(cst, name) is not None for name in cst.__all__)
+    tree = ast.parse(pathlib.Path(cst.__file__).read_text())
+    imports = {
+        alias.name: t.cast(str, node.module)
+        for node in ast.walk(tree)
+        if isinstance(node, ast.ImportFrom) and node.level == 1
+        for alias in node.names
+    }
+    assert imports == t.cast(t.Dict[str, str], getattr(cst, "_lazy_names"))
+
+
+def test_dataclass_struct_shared() -> None:
+    import copy
+    import gc
+    import weakref
+
+    @dataclasses.dataclass
+    class Image(DataclassMixin):
+        width: int = csfield(cs.Int8ub)
+        height: int = csfield(cs.Int8ub)
+
+    format = DataclassStruct(Image)
+    assert DataclassStruct(Image) is format
+    assert DataclassStruct(Image, reverse=True) is not format
+    assert DataclassStruct(Image, reverse=True) is DataclassStruct(Image, reverse=True)
+    assert DataclassBitStruct(Image) is DataclassBitStruct(Image)
+    assert copy.copy(format) is format
+    assert copy.deepcopy(format) is format
+    assert format.compile() is format.compile()
+    assert raises(setattr, format, "reverse", True) == AttributeError
+
+    # derived dataclasses have their own instances
+    @dataclasses.dataclass
+    class Image3D(Image):
+        depth: int = csfield(cs.Int8ub)
+
+    assert DataclassStruct(Image3D).parse(b"\x01\x02\x03") == Image3D(1, 2, 3)
+
+    cst.clear_schema_cache()
+    assert DataclassStruct(Image) is not format
+    assert format.parse(b"\x01\x02") == Image(1, 2)
+
+    # the shared instances do not keep the dataclasses alive
+    ref = weakref.ref(Image)
+    del Image, Image3D, format
+    gc.collect()
+    assert ref() is None
+
+
+def test_dataclass_struct_subclass() -> None:
+    @dataclasses.dataclass
+    class Image(DataclassMixin):
+        width: int = csfield(cs.Int8ub)
+        height: int = csfield(cs.Int8ub)
+
+    # subclasses with an own "__init__" get its arguments
+    class Named(DataclassStruct[Image]):
+        def __init__(self, dc_type: t.Type[Image], label: str, *, big: bool = False) -> None:
+            self.label = label
+            self.big = big
+            super().__init__(dc_type)
+
+    named = Named(Image, "image", big=True)
+    assert (named.label, named.big, named.dc_type) == ("image", True, Image)
+    assert named.parse(b"\x01\x02") == Image(1, 2)
+
+
+def test_array_primitive() -> None:
+    import array
+
+    # bulk path for primitive elements, same results as the element wise path
+    samples: t.List[t.Tuple["cs.Construct[t.Any, t.Any]", bytes, t.List[t.Any]]] = [
+        (cs.Int16ul, b"\x01\x00\x02\x00\x03\x00", [1, 2, 3]),
+        (cs.Int32sb, b"\xff\xff\xff\xfe\x00\x00\x00\x01\x00\x00\x00\x02", [-2, 1, 2]),
+        (cs.Float32l, b"\x00\x00\x80\x3f\x00\x00\x00\x40\x00\x00\x00\x00", [1.0, 2.0, 0.0]),
+    ]
+    for subcon, data, values in samples:
+        format = cst.Array(3, subcon)
+        assert format._primitive is not None  # type: ignore
+        common(format, data, values, len(data))
+        assert format.parse(data) == cs.Array(3, subcon).parse(data)
+        assert format.compile().parse(data) == values
+        assert format.compile().build(values) == data
+    d = cst.Array(cs.this.n, cs.Int16ub)
+    assert d.parse(b"\x00\x01\x00\x02", n=2) == [1, 2]
+    assert raises(d.parse, b"\x00\x01", n=2) == cs.StreamError
+    assert raises(d.parse, b"", n=-1) == cs.RangeError
+    assert raises(d.build, [1], n=2) == cs.RangeError
+    assert raises(d.build, [1, 70000], n=2) == cs.FormatFieldError
+    assert cst.Array(2, cs.Int24ul)._primitive is None  # type: ignore
+    assert cst.Array(2, cs.Int16ul, discard=True).parse(b"\x01\x00\x02\x00") == []
+
+    # array.array output
+    numeric = cst.NumericArray(3, cs.Int16ub)
+    assert numeric.parse(b"\x00\x01\x00\x02\x00\x03") == array.array("H", [1, 2, 3])
+    assert numeric.build(array.array("H", [1, 2, 3])) == b"\x00\x01\x00\x02\x00\x03"
+    assert numeric.build([1, 2, 3]) == b"\x00\x01\x00\x02\x00\x03"
+    assert numeric.sizeof() == 6
+    floats = cst.NumericArray(2, cs.Float64l)
+    assert floats.parse(floats.build([0.5, -1.0])) == array.array("d", [0.5, -1.0])
+    assert cst.NumericArray(1, cs.Int64sl).parse(b"\xff" * 8) == array.array("q", [-1])
+    assert raises(numeric.build, [1, 2]) == cs.RangeError
+    assert raises(numeric.build, [1, 2, -3]) == cs.FormatFieldError
+    assert raises(cst.NumericArray, 3, cs.Int24ul) == ValueError
+    assert raises(cst.NumericArray, 3, cs.Float16l) == ValueError
+
+    @dataclasses.dataclass
+    class Waveform(DataclassMixin):
+        count: int = csfield(cs.Int16ul)
+        samples: "array.array[int]" = csfield(cst.NumericArray(cs.this.count, cs.Int16sl))
+
+    format_wave = DataclassStruct(Waveform)
+    wave = Waveform(count=2, samples=array.array("h", [-1, 1]))
+    assert format_wave.parse(format_wave.build(wave)) == wave
+
+
+def test_numeric_array_numpy() -> None:
+    import numpy as np
+
+    d = cst.NumericArray(3, cs.Int16sb, output="numpy")
+    data = b"\xff\xff\x00\x01\x00\x02"
+    obj = d.parse(data)
+    assert obj.dtype == np.dtype(">i2")
+    assert obj.tolist() == [-1, 1, 2]
+    assert d.build(obj) == data
+    assert d.build(np.array([-1, 1, 2], dtype="<i4")) == data
+    assert d.build([-1, 1, 2]) == data
+    assert d.sizeof() == 6
+    assert raises(d.build, [1, 2]) == cs.RangeError
+    assert raises(d.build, ["x", 1, 2]) == cs.FormatFieldError
+    # values are not truncated or wrapped around
+    assert raises(d.build, [1.5, 1, 2]) == cs.FormatFieldError
+    assert raises(d.build, np.array([-1, 1, 40000], dtype="<i4")) == cs.FormatFieldError
+    assert cst.NumericArray(2, cs.Float32l, output="numpy").build([1, 2.5]) == b"\x00\x00\x80?\x00\x00 @"
+
+    # zero-copy: the ndarray references the input buffer
+    buffer = bytearray(data)
+    view = d.parse(buffer)
+    buffer[1] = 0
+    assert view.tolist() == [-256, 1, 2]
+    assert cst.NumericArray(1, cs.Float16l, output="numpy").parse(b"\x00\x3c").tolist() == [1.0]
+
+    # greedy: the count is computed from the remaining bytes
+    greedy = cst.NumericArray(None, cs.Int32ul, output="numpy")
+    assert greedy.parse(bytes(9)).tolist() == [0, 0]
+    assert raises(greedy.sizeof) == cs.SizeofError
+    assert cst.NumericArray(None, cs.Int8ub).parse(b"\x01\x02") == cst.NumericArray(2, cs.Int8ub).parse(b"\x01\x02")
+
+    @dataclasses.dataclass
+    class Waveform(DataclassMixin):
+        rate: int = csfield(cs.Int16ul)
+        samples: "np.ndarray[t.Any, t.Any]" = csfield(cst.NumericArray(None, cs.Float32l, output="numpy"))
+
+    format = DataclassStruct(Waveform, zerocopy=True)
+    wave = format.parse(format.build(Waveform(rate=8000, samples=np.array([0.5, 1.5], dtype="<f4"))))
+    assert wave.rate == 8000 and wave.samples.tolist() == [0.5, 1.5]
+
+    # GreedyRange of primitive elements
+    greedy_range = cst.GreedyRange(cs.Int16ul)
+    assert greedy_range._primitive is not None  # type: ignore
+    stream = io.BytesIO(b"\x01\x00\x02\x00\x03")
+    assert greedy_range.parse_stream(stream) == [1, 2]
+    assert stream.tell() == 4
+    assert greedy_range.build([1, 2]) == b"\x01\x00\x02\x00"
+    assert greedy_range.parse(b"\x01\x00\x02\x00\x03") == cs.GreedyRange(cs.Int16ul).parse(b"\x01\x00\x02\x00\x03")
+    assert raises(greedy_range.build, [-1]) == cs.FormatFieldError
+
+
+def test_dataclass_bitstruct_fields() -> None:
+    class Kind(cst.EnumBase):
+        Data = 1
+        Ack = 2
+
+    @dataclasses.dataclass
+    class Header(DataclassMixin):
+        version: int = csfield(cs.BitsInteger(3))
+        urgent: bool = csfield(cs.Flag)
+        kind: Kind = csfield(cst.TEnum(cs.Nibble, Kind))
+        offset: int = csfield(cs.BitsInteger(12, signed=True))
+        reserved: None = csfield(cs.Padding(2))
+        length: int = csfield(cs.BitsInteger(10))
+
+    format = DataclassBitStruct(Header)
+    assert isinstance(format, cst.BitFieldStruct)
+    bitwise = cs.Bitwise(DataclassStruct(Header))
+    header = Header(version=5, urgent=True, kind=Kind.Ack, offset=-3, length=1000)
+    data = bitwise.build(header)
+    common(format, data, header, 4)
+    for sample in [bytes(4), b"\xff\xfc\xff\xff", b"\x12\x34\x56\x78"]:
+        assert format.parse(sample) == bitwise.parse(sample)
+    assert raises(format.build, dataclasses.replace(header, length=1024)) == cs.IntegerError
+    assert raises(format.build, dataclasses.replace(header, length=-1)) == cs.IntegerError
+    assert raises(format.build, dataclasses.replace(header, offset=2048)) == cs.IntegerError
+    assert raises(format.parse, b"\x00") == cs.StreamError
+
+    layout = cst.bit_layout(DataclassStruct(Header))
+    assert layout is not None
+    assert [(f.name, f.offset, f.width, f.kind) for f in layout] == [
+        ("version", 0, 3, "int"),
+        ("urgent", 3, 1, "flag"),
+        ("kind", 4, 4, "int"),
+        ("offset", 8, 12, "int"),
+        ("reserved", 20, 2, "padding"),
+        ("length", 22, 10, "int"),
+    ]
+
+    # reversed fields
+    format_reverse = DataclassBitStruct(Header, reverse=True)
+    assert isinstance(format_reverse, cst.BitFieldStruct)
+    data = cs.Bitwise(DataclassStruct(Header, reverse=True)).build(header)
+    assert format_reverse.build(header) == data
+    assert format_reverse.parse(data) == header
+
+    # fields without a static bit layout use Bitwise
+    @dataclasses.dataclass
+    class Dynamic(DataclassMixin):
+        n: int = csfield(cs.Nibble)
+        value: int = csfield(cs.BitsInteger(cs.this.n * 0 + 4))
+
+    @dataclasses.dataclass
+    class Unaligned(DataclassMixin):
+        a: int = csfield(cs.BitsInteger(3))
+
+    assert cst.bit_layout(DataclassStruct(Dynamic)) is None
+    assert cst.bit_layout(DataclassStruct(Unaligned)) is None
+    assert not isinstance(DataclassBitStruct(Dynamic), cst.BitFieldStruct)
+    assert DataclassBitStruct(Dynamic).parse(b"\x12") == Dynamic(n=1, value=2)
+
+    # adapters and validators, which need the context, use Bitwise
+    def add_a(obj: int, ctx: t.Any) -> int:
+        return obj + int(ctx.a)
+
+    def sub_a(obj: int, ctx: t.Any) -> int:
+        return obj - int(ctx.a)
+
+    def above_a(obj: int, ctx: t.Any) -> bool:
+        return obj > int(ctx.a)
+
+    @dataclasses.dataclass
+    class Adapted(DataclassMixin):
+        a: int = csfield(cs.Nibble)
+        b: int = csfield(cs.ExprAdapter(cs.Nibble, add_a, sub_a))
+
+    @dataclasses.dataclass
+    class Validated(DataclassMixin):
+        a: int = csfield(cs.Nibble)
+        b: int = csfield(cs.ExprValidator(cs.Nibble, above_a))
+
+    assert cst.bit_layout(DataclassStruct(Adapted)) is None
+    assert cst.bit_layout(DataclassStruct(Validated)) is None
+    assert DataclassBitStruct(Adapted).parse(b"\x12") == Adapted(a=1, b=3)
+    assert DataclassBitStruct(Adapted).build(Adapted(a=1, b=3)) == b"\x12"
+    assert DataclassBitStruct(Validated).parse(b"\x12") == Validated(a=1, b=2)
+    assert raises(DataclassBitStruct(Validated).parse, b"\x21") == cs.ValidationError
+
+    # adapters, which override "_parse", use Bitwise
+    class Inverted(cst.Adapter[int, int, int, int]):
+        def _parse(self, stream: t.Any, context: t.Any, path: t.Any) -> int:
+            return 15 - super()._parse(stream, context, path)
+
+        def _decode(self, obj: int, context: t.Any, path: t.Any) -> int:
+            return obj
+
+        def _encode(self, obj: int, context: t.Any, path: t.Any) -> int:
+            return 15 - obj
+
+    @dataclasses.dataclass
+    class Overridden(DataclassMixin):
+        a: int = csfield(Inverted(cs.Nibble))
+        b: int = csfield(cs.Nibble)
+
+    assert cst.bit_layout(DataclassStruct(Overridden)) is None
+    assert DataclassBitStruct(Overridden).parse(b"\x12") == Overridden(a=14, b=2)
+
+
+def test_unpack_bit_records() -> None:
+    import random
+
+    @dataclasses.dataclass
+    class Header(DataclassMixin):
+        version: int = csfield(cs.BitsInteger(3))
+        urgent: bool = csfield(cs.Flag)
+        reserved: None = csfield(cs.Padding(2))
+        offset: int = csfield(cs.BitsInteger(13, signed=True))
+        length: int = csfield(cs.BitsInteger(29))
+
+    rng = random.Random(0)
+    data = bytes(rng.randrange(256) for _ in range(6 * 100))
+    format = DataclassStruct(Header)
+    expected = cs.Array(100, DataclassBitStruct(Header)).parse(data)
+
+    columns = cst.unpack_bit_records(format, data)
+    assert list(columns) == ["version", "urgent", "offset", "length"]
+    assert columns["version"].dtype == "u1"
+    assert columns["offset"].dtype == "i2"
+    assert columns["length"].dtype == "u4"
+    for name in columns:
+        assert columns[name].tolist() == [getattr(h, name) for h in expected]
+
+    structured = cst.unpack_bit_records(format, data, count=2, output="structured")
+    assert structured.shape == (2,)
+    assert structured["offset"].tolist() == [h.offset for h in expected[:2]]
+
+    assert raises(cst.unpack_bit_records, format, data[:-1]) == ValueError
+
+    @dataclasses.dataclass
+    class Dynamic(DataclassMixin):
+        value: int = csfield(cs.BitsInteger(cs.this._.n))
+
+    assert raises(cst.unpack_bit_records, DataclassStruct(Dynamic), data) == ValueError
+
+
+def test_trace_hooks() -> None:
+    class Kind(cst.EnumBase):
+        a = 1
+        b = 2
+
+    @dataclasses.dataclass
+    class Inner(DataclassMixin):
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+
+    @dataclasses.dataclass
+    class Outer(DataclassMixin):
+        length: int = csfield(cs.Int16ub)
+        inner: Inner = csfield(DataclassStruct(Inner))
+
+    outer_format = DataclassStruct(Outer)
+    originals = (getattr(DataclassStruct, "_parse"), getattr(cst.TEnum, "_build"))
+    events: t.List[cst.TraceEvent] = []
+    selected: t.List[cst.TraceEvent] = []
+    cst.add_trace_hook(events.append)
+    cst.add_trace_hook(selected.append, DataclassStruct(Inner))
+    try:
+        assert outer_format.parse(b"\x00\x05\x02") == Outer(length=5, inner=Inner(kind=Kind.b))
+        assert [(e.phase, e.schema, e.offset, e.size) for e in events] == [
+            ("start", "Outer", 0, None),
+            ("start", "Inner", 2, None),
+            ("start", "Kind", 2, None),
+            ("end", "Kind", 2, 1),
+            ("end", "Inner", 2, 1),
+            ("end", "Outer", 0, 3),
+        ]
+        assert all(e.operation == "parse" for e in events)
+        assert all(e.duration is not None for e in events if e.phase == "end")
+        assert [(e.phase, e.schema) for e in selected] == [("start", "Inner"), ("end", "Inner")]
+        assert "inner" in selected[0].path
+
+        events.clear()
+        assert outer_format.build(Outer(length=5, inner=Inner(kind=Kind.a))) == b"\x00\x05\x01"
+        assert [(e.phase, e.operation, e.schema) for e in events][:2] == [
+            ("start", "build", "Outer"),
+            ("start", "build", "Inner"),
+        ]
+
+        events.clear()
+        assert raises(outer_format.parse, b"\x00\x05") == cs.StreamError
+        assert events[-1].phase == "end"
+        assert isinstance(events[-1].error, cs.StreamError)
+        assert events[-1].size is None
+    finally:
+        cst.remove_trace_hook(events.append)
+        cst.remove_trace_hook(selected.append, DataclassStruct(Inner))
+
+    # without hooks the original methods are used again
+    assert (getattr(DataclassStruct, "_parse"), getattr(cst.TEnum, "_build")) == originals
+    assert raises(cst.remove_trace_hook, events.append) == ValueError
+
+
+def test_allocation_report() -> None:
+    import tracemalloc
+
+    class Kind(cst.EnumBase):
+        a = 1
+
+    @dataclasses.dataclass
+    class Inner(DataclassMixin):
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+
+    @dataclasses.dataclass
+    class Outer(DataclassMixin):
+        n: int = csfield(cs.Int8ub)
+        items: t.List[int] = csfield(cs.Array(cs.this.n, cs.Int8ub))
+        inner: Inner = csfield(DataclassStruct(Inner))
+
+    samples = [bytes([2, 1, 2, kind]) for kind in range(1, 6)]
+    report = cst.allocation_report(DataclassStruct(Outer), samples)
+    assert report.schema == "Outer"
+    assert report.records == 5
+    assert list(report.fields) == ["n", "items", "inner", "(record)"]
+    assert "lists" in report.fields["items"]
+    assert "paths" in report.fields["n"]
+    assert {"dataclasses", "enums"} <= set(report.fields["inner"])
+    assert "contexts" not in report.fields["inner"]  # Inner does not need a context
+    assert "contexts" in report.fields["(record)"]
+    assert 0 < report.retained.bytes < report.allocated.bytes
+    assert report.field_total("inner").objects > report.field_total("n").objects
+    assert "(record)" in str(report)
+
+    assert raises(cst.allocation_report, DataclassStruct(Outer), []) == ValueError
+    tracemalloc.start()
+    try:
+        assert raises(cst.allocation_report, DataclassStruct(Outer), samples) == RuntimeError
+    finally:
+        tracemalloc.stop()
+    assert t.cast(t.Any, cs.Construct)._parsereport.__module__ == "construct.core"
+
+
+def test_slow_path_counts() -> None:
+    class State(cst.EnumBase):
+        idle = 1
+
+    class Option(cst.FlagsEnumBase):
+        one = 1
+        two = 2
+
+    @dataclasses.dataclass
+    class Ping(DataclassMixin):
+        magic: bytes = csfield(cs.Const(b"P"))
+
+    @dataclasses.dataclass
+    class Frame(DataclassMixin):
+        state: State = csfield(cst.TEnum(cs.Int8ub, State))
+        check: int = csfield(cs.Checksum(cs.Int8ub, lambda state: int(state), cs.this.state))
+        payload: bytes = csfield(cs.GreedyBytes)
+
+    @dataclasses.dataclass
+    class Dynamic(DataclassMixin):
+        n: int = csfield(cs.Nibble)
+        value: int = csfield(cs.BitsInteger(cs.this.n))
+
+    with cst.count_slow_paths() as counts:
+        assert State(5) == 5
+        assert State(5) == 5  # the pseudo member is created only once
+        assert Option(3) == 3
+        switch = cst.DataclassSwitch(cs.Int8ub, {1: Ping}, cs.GreedyBytes)
+        assert isinstance(switch.parse(b"\x02xy"), cst.UnknownCase)
+        assert raises(cst.DataclassSwitch(cs.Int8ub, {1: Ping}).parse, b"\x02") == cs.SwitchError
+        assert raises(cst.DataclassSelect(Ping).parse, b"X") == cs.SelectError
+        compiled = DataclassStruct(Frame).compile()
+        assert compiled.parse(b"\x05\x05ab").payload == b"ab"
+        zerocopy = DataclassStruct(Frame, zerocopy=True)
+        obj = zerocopy.parse_stream(io.BytesIO(b"\x01\x01ab"))
+        assert cst.detach(zerocopy.parse(b"\x01\x01ab")).payload == obj.payload
+        DataclassBitStruct(Dynamic)
+    assert counts == {
+        "enum_pseudo_member": 1,
+        "flags_enum_pseudo_member": 1,
+        "switch_default": 1,
+        "switch_error": 1,
+        "select_error": 1,
+        "compile_fallback_parse": 1,
+        "zerocopy_stream_copy": 1,
+        "detach_copy": 1,
+        "bitstruct_restream": 1,
+    }
+    assert cst.slow_path_counts()["switch_default"] >= 1
+    cst.reset_slow_path_counts()
+    assert cst.slow_path_counts() == {}
+
+
+def test_dataclass_struct_paths() -> None:
+    @dataclasses.dataclass
+    class Inner(DataclassMixin):
+        value: int = csfield(cs.Int16ub)
+
+    @dataclasses.dataclass
+    class Outer(DataclassMixin):
+        kind: int = csfield(cs.Int8ub)
+        inner: Inner = csfield(DataclassStruct(Inner))
+
+    format = DataclassStruct(Outer)
+    errors: t.List[cs.ConstructError] = []
+    for _ in range(2):
+        try:
+            format.parse(b"\x01\x02")
+        except cs.StreamError as e:
+            errors.append(e)
+    assert [e.path for e in errors] == ["(parsing) -> inner -> value"] * 2
+    assert "Error in path (parsing) -> inner -> value" in str(errors[0])
+    # the paths are created once and then reused
+    assert errors[0].path is errors[1].path
+
+    try:
+        format.build(Outer(kind=1, inner=Inner(value=-1)))
+    except cs.FormatFieldError as e:
+        errors.append(e)
+    assert errors[-1].path == "(building) -> inner -> value"
+    assert format.sizeof() == 3
+    assert cst.schema_fingerprint(format) == cst.schema_fingerprint(DataclassStruct(Outer))
+
+
+def test_dataclass_struct_context_free() -> None:
+    class Kind(cst.EnumBase):
+        a = 1
+
+    @dataclasses.dataclass
+    class Flags(DataclassMixin):
+        a: bool = csfield(cs.Flag)
+        b: int = csfield(cs.BitsInteger(7))
+
+    @dataclasses.dataclass
+    class Record(DataclassMixin):
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+        value: int = csfield(cs.Int16ub)
+        data: bytes = csfield(cs.Bytes(2))
+        items: t.List[int] = csfield(cst.Array(2, cs.Int8ub))
+        flags: Flags = csfield(DataclassBitStruct(Flags))
+        magic: bytes = csfield(cs.Const(b"M"))
+
+    @dataclasses.dataclass
+    class Outer(DataclassMixin):
+        record: Record = csfield(DataclassStruct(Record))
+        bits: t.Any = csfield(cs.BitStruct("x" / cs.Nibble, "y" / cs.Nibble))
+
+    format = DataclassStruct(Outer)
+    assert DataclassStruct(Record).context_free
+    assert format.context_free
+    data = b"\x01\x00\x02ab\x03\x04\x85M\x12"
+    obj = format.parse(data)
+    assert obj.record == Record(
+        kind=Kind.a, value=2, data=b"ab", items=[3, 4], flags=Flags(a=True, b=5)
+    )
+    assert obj.bits == cs.Container(x=1, y=2)
+    assert format.build(obj) == data
+    assert format.compile().parse(data) == obj
+
+    # the parent context is passed to the fields
+    @dataclasses.dataclass
+    class Child(DataclassMixin):
+        value: int = csfield(cs.Int8ub)
+
+    @dataclasses.dataclass
+    class Parent(DataclassMixin):
+        n: int = csfield(cs.Int8ub)
+        children: t.List[Child] = csfield(cs.Array(cs.this.n, DataclassStruct(Child)))
+
+    assert DataclassStruct(Child).context_free
+    assert not DataclassStruct(Parent).context_free
+    assert DataclassStruct(Parent).parse(b"\x02\x05\x06") == Parent(n=2, children=[Child(5), Child(6)])
+    assert DataclassStruct(Parent).build(Parent(n=2, children=[Child(5), Child(6)])) == b"\x02\x05\x06"
+
+    class Double(cs.Adapter):  # type: ignore
+        def _decode(self, obj: int, context: t.Any, path: t.Any) -> int:
+            return obj * 2
+
+        def _encode(self, obj: int, context: t.Any, path: t.Any) -> int:
+            return obj // 2
+
+    # everything, that may access the context of the struct
+    needs_context: t.List[t.Any] = [
+        csfield(cs.Bytes(cs.this._.n)),
+        csfield(cs.Int8ub, parsed=lambda obj, ctx: None),
+        csfield(cs.Computed(lambda ctx: 1)),  # type: ignore
+        csfield(cs.Array(2, DataclassStruct(Child))),
+        csfield(cs.Index),
+        csfield(Double(cs.Int8ub)),
+        csfield(DataclassStruct(Parent)),
+    ]
+    for field in needs_context:
+        dc_type = dataclasses.make_dataclass("Dynamic", [("value", t.Any, field)], bases=(DataclassMixin,))
+        assert not DataclassStruct(dc_type).context_free
+
+
+def test_compile_expression() -> None:
+    this = cs.this
+    context = cs.Container(a=5, b=2, items=[1, 3], _=cs.Container(c=9))
+
+    def context_b(ctx: "cs.Container[t.Any]") -> t.Any:
+        return ctx.b
+
+    expressions: t.List[t.Any] = [
+        this.a + this.b,
+        this.a - 1,
+        10 - this.a,
+        this.a * this.b,
+        this.a / this.b,
+        this.a // this.b,
+        this.a % this.b,
+        this.a ** this.b,
+        this.a ^ this.b,
+        this.a << this.b,
+        this.a >> 1,
+        this.a & this.b,
+        this.a | this.b,
+        this.a > this.b,
+        this.a >= this.b,
+        this.a < this.b,
+        this.a <= this.b,
+        this.a == 5,
+        this.a != 5,
+        -this.a,
+        +this.a,
+        ~this.a,
+        this.items.__contains__(3),
+        this._.c * 2,
+        cs.len_(this.items),
+        cs.sum_(this.items),
+        cs.max_(this.items),
+        this.a + context_b,
+    ]
+    for expr in expressions:
+        func = cst.compile_expression(expr)
+        assert func is not None
+        assert func(context) == expr(context)
+
+    # expressions, which are not called with the context
+    assert cst.compile_expression(cs.obj_ + 1) is None
+    assert cst.compile_expression(cs.list_[-1] == 0) is None
+    assert cst.compile_expression(cs.len_) is None
+
+    # the expressions of the csfields are compiled in a copy, "compile()" uses the original expressions
+    @dataclasses.dataclass
+    class Image(DataclassMixin):
+        width: int = csfield(cs.Int8ub)
+        height: int = csfield(cs.Int8ub)
+        count: int = csfield(cs.Rebuild(cs.Int8ub, cs.len_(this.items)))
+        items: t.List[int] = csfield(cs.Array(this.count, cs.Int8ub))
+        pixels: bytes = csfield(cs.Bytes(this.width * this.height))
+        extra: t.Optional[int] = csfield(cs.If(this.width > 1, cs.Int8ub))
+
+    format = DataclassStruct(Image)
+    pixels: t.Any = format.subcon.subcons[4]
+    assert isinstance(pixels.subcon.length, construct.expr.BinExpr)
+    assert not isinstance(pixels.evaluated.length, construct.expr.ExprMixin)
+    data = b"\x02\x03\x02\x07\x08abcdef\x05"
+    obj = Image(width=2, height=3, items=[7, 8], pixels=b"abcdef", extra=5)
+    obj.count = 2
+    assert format.parse(data) == obj
+    assert format.build(obj) == data
+    assert format.compile().parse(data) == obj
+    assert pixels.sizeof(width=1, height=4) == 4
+    assert raises(format.parse, b"\x02\x03\x00abc") == cs.StreamError
+
+
+def test_dataclass_struct_build_many() -> None:
+    class Kind(cst.EnumBase):
+        a = 1
+        b = 2
+
+    @dataclasses.dataclass
+    class Header(DataclassMixin):
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+        size: int = csfield(cs.Int16ub)
+
+    @dataclasses.dataclass
+    class Record(DataclassMixin):
+        header: Header = csfield(DataclassStruct(Header))
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+        data: bytes = csfield(cs.Bytes(2))
+
+    @dataclasses.dataclass
+    class Sized(DataclassMixin):
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+        length: int = csfield(cs.Rebuild(cs.Int8ub, cs.len_(cs.this.data)))
+        data: bytes = csfield(cs.Bytes(cs.this.length))
+
+    records = [Record(Header(Kind.a, i), Kind.b, b"xy") for i in range(5)]
+    sized = [Sized(Kind.a, data=b"x" * i) for i in range(5)]
+    cases: t.List[t.Tuple[t.Any, t.List[t.Any]]] = [(DataclassStruct(Record), records), (DataclassStruct(Sized), sized)]
+    for format, objs in cases:
+        expected = b"".join(format.build(obj) for obj in objs)
+        assert format.build_many(objs) == expected
+        assert format.build_many(objs, validate="first") == expected
+        assert format.build_many(iter(objs), validate="first") == expected
+        assert format.build_many([]) == b""
+        assert format.build_many([], validate="first") == b""
+        assert raises(format.build_many, objs, validate="none") == ValueError
+
+    # the types are only checked for the first object (or for all objects for debugging)
+    record_format = DataclassStruct(Record)
+    invalid = records + [Record(Header(1, 0), 2, b"xy")]  # type: ignore
+    assert raises(record_format.build_many, invalid) == TypeError
+    assert record_format.build_many(invalid, validate="first") == record_format.build_many(records) + b"\x01\x00\x00\x02xy"
+    assert raises(record_format.build_many, invalid[::-1], validate="first") == TypeError
+    # the values are still checked by the subcons
+    out_of_range = records + [Record(Header(Kind.a, -1), Kind.b, b"xy")]
+    assert raises(record_format.build_many, out_of_range, validate="first") == cs.FormatFieldError
+
+
+def test_field_checksum(tmp_path: pathlib.Path) -> None:
+    import hashlib
+    import zlib
+
+    @dataclasses.dataclass
+    class Frame(DataclassMixin):
+        length: int = csfield(cs.Int8ub)
+        payload: bytes = csfield(cs.Bytes(cs.this.length))
+        crc: int = csfield(cst.FieldChecksum(cs.Int32ub, zlib.crc32, "length", "payload"))
+        digest: bytes = csfield(cst.FieldChecksum(cs.Bytes(32), hashlib.sha256, "payload"))
+
+    format = DataclassStruct(Frame)
+    data = format.build(Frame(length=3, payload=b"abc"))
+    crc = zlib.crc32(b"\x03abc")
+    assert data == b"\x03abc" + crc.to_bytes(4, "big") + hashlib.sha256(b"abc").digest()
+    obj = format.parse(data)
+    assert (obj.length, obj.payload, obj.crc, obj.digest) == (3, b"abc", crc, hashlib.sha256(b"abc").digest())
+    assert format.compile().parse(data) == obj
+    assert format.compile().build(Frame(length=3, payload=b"abc")) == data
+    # the first compilation is stored in the cache, the second one (with new instances) is loaded from it
+    compilations: t.List[t.Any] = []
+    for _ in range(2):
+        cst.clear_schema_cache()
+        compilations.append(cst.compile_cached(DataclassStruct(Frame), str(tmp_path)))
+    for compiled in compilations:
+        assert compiled.parse(data) == obj
+        assert compiled.build(Frame(length=3, payload=b"abc")) == data
+    assert compilations[-1].module.__name__.startswith("construct_typed_compiled_")
+    assert raises(format.parse, data[:2] + b"x" + data[3:]) == cs.ChecksumError
+    assert raises(format.parse, data[:-1] + b"x") == cs.ChecksumError
+
+    # zero-copy buffers and streams without a buffer, which are read again
+    assert DataclassStruct(Frame, zerocopy=True).parse(data) == obj
+    with cst.count_slow_paths() as counts:
+        assert format.parse_stream(io.BufferedReader(io.BytesIO(data))) == obj  # type: ignore
+    assert counts == {"checksum_reread": 2}
+
+    # the range has to be defined before the checksum
+    for start, end in (("crc", "crc"), ("payload", "length"), ("missing", "payload")):
+        dc_type = dataclasses.make_dataclass(
+            "Invalid",
+            [
+                ("length", int, csfield(cs.Int8ub)),
+                ("payload", bytes, csfield(cs.Bytes(2))),
+                ("crc", int, csfield(cst.FieldChecksum(cs.Int32ub, zlib.crc32, start, end))),
+            ],
+            bases=(DataclassMixin,),
+        )
+        assert raises(DataclassStruct, dc_type) == ValueError
+    assert raises(cst.FieldChecksum(cs.Int8ub, zlib.crc32, "a").parse, b"\x00") == cs.ConstructError
+
+
+def test_streaming_compressed() -> None:
+    @dataclasses.dataclass
+    class Record(DataclassMixin):
+        index: int = csfield(cs.Int32ub)
+        name: bytes = csfield(cs.Bytes(3))
+
+    @dataclasses.dataclass
+    class Block(DataclassMixin):
+        magic: bytes = csfield(cs.Const(b"BLK"))
+        records: t.Iterable[Record] = csfield(
+            cst.StreamingCompressed(DataclassStruct(Record), "zlib", lengthfield=cs.Int32ub)
+        )
+        end: int = csfield(cs.Int8ub)
+
+    records = [Record(i, b"abc") for i in range(5000)]
+    for encoding in ("zlib", "gzip", "bzip2", "lzma", "lz4"):
+        format = cst.StreamingCompressed(DataclassStruct(Record), encoding)  # type: ignore
+        data = format.build(records)
+        parsed = format.parse(data)
+        assert isinstance(parsed, cst.CompressedRecords)
+        assert list(parsed) == records
+        assert list(parsed) == records  # every iteration starts from the beginning
+        # same format as "Compressed" and "CompressedLZ4"
+        if encoding == "lz4":
+            compressed: t.Any = cs.CompressedLZ4(cs.GreedyRange(DataclassStruct(Record)))
+        else:
+            compressed = cs.Compressed(cs.GreedyRange(DataclassStruct(Record)), encoding)
+        assert compressed.parse(data) == records
+        assert list(format.parse(compressed.build(records))) == records
+        assert raises(list, format.parse(data[:-10])) == cs.StreamError
+
+    # records are parsed only as far as they are iterated
+    parsed = cst.StreamingCompressed(DataclassStruct(Record), "zlib").parse(
+        cs.Compressed(cs.GreedyBytes, "zlib").build(bytes(8) + b"\xff")
+    )
+    assert next(iter(parsed)) == Record(0, bytes(3))
+    assert raises(list, parsed) == cs.StreamError
+
+    # inside of a DataclassStruct, zero-copy from the input buffer
+    block = Block(records=records, end=7)
+    records_data = b"".join(DataclassStruct(Record).build(record) for record in records)
+    data = DataclassStruct(Block).build(block)
+    for zerocopy in (False, True):
+        obj = DataclassStruct(Block, zerocopy=zerocopy).parse(data)
+        assert list(obj.records) == records
+        assert obj.end == 7
+    assert data == b"BLK" + cs.Prefixed(cs.Int32ub, cs.Compressed(cs.GreedyBytes, "zlib")).build(records_data) + b"\x07"
+    assert isinstance(DataclassStruct(Block, zerocopy=True).parse(data).records.data, memoryview)  # type: ignore
+    assert raises(cst.StreamingCompressed, cs.Int8ub, "zstd") == ValueError
+
+    # records, which tell or seek, have the offsets of the decompressed data (like "Compressed")
+    import zlib
+
+    @dataclasses.dataclass
+    class Located(DataclassMixin):
+        offset: int = csfield(cs.Tell)
+        length: int = csfield(cs.Int8ub)
+        payload: bytes = csfield(cs.Bytes(cs.this.length))
+        crc: int = csfield(cst.FieldChecksum(cs.Int32ub, zlib.crc32, "length", "payload"))
+        first: int = csfield(cs.Pointer(0, cs.Int8ub))
+
+    payloads = [bytes([i % 256]) * 200 for i in range(500)]
+    data = zlib.compress(b"".join(b"\xc8" + p + zlib.crc32(b"\xc8" + p).to_bytes(4, "big") for p in payloads))
+    located_format = cst.StreamingCompressed(DataclassStruct(Located), "zlib")
+    expected = cs.Compressed(cs.GreedyRange(DataclassStruct(Located)), "zlib").parse(data)
+    with cst.count_slow_paths() as counts:
+        assert list(located_format.parse(data)) == expected
+    assert [(record.offset, record.first) for record in expected[:3]] == [(0, 200), (205, 200), (410, 200)]
+    assert [record.payload for record in expected] == payloads
+    assert counts["compressed_rewind"] > 0  # the pointer seeks back to the start of the data
+    assert raises(cst.StreamingCompressed(cs.Int8ub, "zlib").sizeof) == cs.SizeofError
+
+
+def test_thread_safety() -> None:
+    import concurrent.futures
+    import sys
+    import threading
+
+    class Kind(cst.EnumBase):
+        Data = 1
+
+    class Flags(cst.FlagsEnumBase):
+        A = 1
+        B = 2
+
+    @dataclasses.dataclass
+    class Inner(DataclassMixin):
+        values: t.List[int] = csfield(cs.Array(64, cs.Int8ub))
+
+    @dataclasses.dataclass
+    class Record(DataclassMixin):
+        kind: Kind = csfield(cst.TEnum(cs.Int8ub, Kind))
+        flags: Flags = csfield(cst.TFlagsEnum(cs.Int8ub, Flags))
+        length: int = csfield(cs.Int8ub)
+        payload: bytes = csfield(cs.Bytes(cs.this.length))
+        inner: Inner = csfield(DataclassStruct(Inner))
+
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def run(func: t.Callable[[int], t.Any]) -> t.List[t.Any]:
+        def task(i: int) -> t.Any:
+            barrier.wait()
+            return func(i)
+
+        with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+            return list(executor.map(task, range(threads)))
+
+    switchinterval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible to provoke races
+    try:
+        # every pseudo member is created (and counted) only once
+        with cst.count_slow_paths() as counts:
+            kinds = run(lambda i: [Kind(value) for value in range(10, 60)])
+            flags = run(lambda i: [Flags(value) for value in range(4, 64, 4)])
+        assert all(all(a is b for a, b in zip(kinds[0], other)) for other in kinds)
+        assert all(all(a is b for a, b in zip(flags[0], other)) for other in flags)
+        assert counts == {"enum_pseudo_member": 50, "flags_enum_pseudo_member": 15}
+
+        # the shared instance and its plans are created once, although they are requested in all threads
+        cst.clear_schema_cache()
+        formats = run(lambda i: DataclassStruct(Record))
+        compiled = run(lambda i: formats[i].compile())
+        assert all(format is DataclassStruct(Record) for format in formats)
+        assert all(c is compiled[0] for c in compiled)
+
+        # parsing, building and printing of the same objects in all threads at the same time
+        records = [Record(Kind(i % 3), Flags(i % 4), 3, b"abc", Inner(list(range(64)))) for i in range(200)]
+        data = [DataclassStruct(Record).build(record) for record in records]
+        parsed = run(lambda i: [(compiled[i] if i % 2 else formats[i]).parse(d) for d in data])
+        built = run(lambda i: [formats[i].build(record) for record in records])
+        texts = run(lambda i: [str(record) for record in records[:20]])
+        assert all(p == records for p in parsed)
+        assert all(b == data for b in built)
+        assert all(text == texts[0] for text in texts)
+        assert not any("<recursion detected>" in text for text in texts[0])
+
+        # trace hooks can be added and removed while other threads parse
+        original_parse = DataclassStruct._parse  # type: ignore
+
+        def trace(i: int) -> None:
+            events: t.List[cst.TraceEvent] = []
+            for _ in range(20):
+                cst.add_trace_hook(events.append)
+                formats[i].parse(data[0])
+                cst.remove_trace_hook(events.append)
+
+        run(trace)
+        assert DataclassStruct._parse is original_parse  # type: ignore  # the tracing wrappers are removed again
+    finally:
+        sys.setswitchinterval(switchinterval)